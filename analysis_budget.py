@@ -0,0 +1,73 @@
+"""Per-APK time and memory budgets for the analysis stages."""
+
+import contextlib
+import os
+import signal
+import sys
+import threading
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, memory budgets are not enforced there
+    resource = None
+
+
+class BudgetExceeded(Exception):
+    """Raised when the analysis of an APK exceeds its time or memory budget."""
+
+
+@contextlib.contextmanager
+def time_budget(seconds):
+    """
+    Raises BudgetExceeded inside the block once it has run for the given
+    seconds, and turns a MemoryError into BudgetExceeded as well. The timer
+    is a SIGALRM, so it only applies in the main thread of a process, as in
+    the pool workers. None or 0 disables the time budget.
+    """
+    timed = bool(seconds) and hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+    if timed:
+        def expired(signum, frame):
+            raise BudgetExceeded(f"exceeded the time budget of {seconds}s")
+
+        previous = signal.signal(signal.SIGALRM, expired)
+        signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    except MemoryError:
+        raise BudgetExceeded("exceeded the memory budget")
+    finally:
+        if timed:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+
+def limit_memory(megabytes):
+    """
+    Caps the address space of the calling process, allocations beyond it
+    raise MemoryError. Used as the initializer of the worker processes and
+    by memory_limited_command. None or 0 leaves it unlimited.
+    """
+    if not megabytes or resource is None:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = megabytes * 1024 * 1024
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def memory_limited_command(command, megabytes):
+    """
+    Prefixes a child process command with this module run as a script, which
+    caps its own address space and then execs the command, see limit_memory.
+    Unlike a preexec_fn this is safe when other threads are running.
+    """
+    if not megabytes or resource is None:
+        return command
+    return [sys.executable, os.path.abspath(__file__), str(megabytes)] + list(command)
+
+
+if __name__ == "__main__":
+    limit_memory(int(sys.argv[1]))
+    os.execvp(sys.argv[2], sys.argv[2:])
@@ -0,0 +1,141 @@
+"""Reads the manifest and dex members of an apk straight from its memory-mapped zip."""
+
+import hashlib
+import mmap
+import re
+import struct
+import zipfile
+
+# The dex files the runtime loads: classes.dex, classes2.dex, ... in the apk root
+DEX_NAME = re.compile(r"^classes(\d*)\.dex$")
+
+# Every apk starts with the local header of its first member
+ZIP_MAGIC = b"PK\x03\x04"
+# Local file header, ending with the lengths of the name and extra field that precede the member data
+LOCAL_HEADER = struct.Struct("<4s5H3I2H")
+
+
+def is_zip(filepath):
+    """Tells whether a file starts like a zip archive, without opening it as one."""
+    try:
+        with open(filepath, "rb") as input_file:
+            return input_file.read(len(ZIP_MAGIC)) == ZIP_MAGIC
+    except OSError:
+        return False
+
+
+class ApkError(Exception):
+    """Raised when an apk cannot be opened or lacks a required member."""
+
+
+class _MappedFile:
+    """
+    Minimal file object over an mmap. zipfile needs seekable(), which mmap
+    objects only have from Python 3.13 on.
+    """
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+
+    def read(self, size=-1):
+        return self.buffer.read(size)
+
+    def seek(self, offset, whence=0):
+        # A file raises OSError for a position before its start, which zipfile expects from a short file
+        try:
+            self.buffer.seek(offset, whence)
+        except ValueError as e:
+            raise OSError(str(e))
+        return self.buffer.tell()
+
+    def tell(self):
+        return self.buffer.tell()
+
+    def seekable(self):
+        return True
+
+
+class ApkReader:
+    """
+    Opens an APK once, memory-mapped, and serves its members from the
+    mapping. Nothing is extracted to disk and every member is inflated at
+    most once, so all feature stages can share one reader.
+
+    Use it as a context manager, the mapping is released on close().
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self._manifest = None
+        try:
+            with open(filepath, "rb") as input_file:
+                self.buffer = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise ApkError(f"Could not open {filepath}: {e}")
+        try:
+            self.zip = zipfile.ZipFile(_MappedFile(self.buffer))
+        except (zipfile.BadZipFile, OSError) as e:
+            self.buffer.close()
+            raise ApkError(f"{filepath} is not a zip archive: {e}")
+
+    def sha256(self):
+        """Returns the hex SHA-256 of the whole apk."""
+        return hashlib.sha256(self.buffer).hexdigest()
+
+    def read(self, name):
+        try:
+            return self.zip.read(name)
+        except (KeyError, zipfile.BadZipFile, OSError, NotImplementedError, RuntimeError) as e:
+            raise ApkError(f"Could not read {name} from {self.filepath}: {e}")
+
+    def manifest(self):
+        """Returns the binary AndroidManifest.xml."""
+        if self._manifest is None:
+            self._manifest = self.read("AndroidManifest.xml")
+        return self._manifest
+
+    def dex_names(self):
+        """Returns the names of the dex members in archive order, as androguard loads them."""
+        return [name for name in self.zip.namelist() if DEX_NAME.match(name)]
+
+    def dex_size(self):
+        """Returns the uncompressed size of all dex members in bytes."""
+        return sum(info.file_size for info in self.zip.infolist() if DEX_NAME.match(info.filename))
+
+    def member_digest(self, name):
+        """
+        Returns a hex SHA-256 identifying the content of a member without
+        inflating it: over its compression method, CRC-32 and size from the
+        central directory and its stored, still compressed bytes. The same
+        content compressed differently gets another digest.
+        """
+        try:
+            info = self.zip.getinfo(name)
+        except KeyError as e:
+            raise ApkError(f"Could not read {name} from {self.filepath}: {e}")
+        header = self.buffer[info.header_offset:info.header_offset + LOCAL_HEADER.size]
+        if len(header) < LOCAL_HEADER.size or header[:4] != ZIP_MAGIC:
+            raise ApkError(f"Bad local header of {name} in {self.filepath}")
+        name_length, extra_length = LOCAL_HEADER.unpack(header)[-2:]
+        start = info.header_offset + LOCAL_HEADER.size + name_length + extra_length
+        if start + info.compress_size > len(self.buffer):
+            raise ApkError(f"{name} runs past the end of {self.filepath}")
+        digest = hashlib.sha256(b"%d:%d:%d:" % (info.compress_type, info.CRC, info.file_size))
+        with memoryview(self.buffer) as view:
+            digest.update(view[start:start + info.compress_size])
+        return digest.hexdigest()
+
+    def dex_members(self):
+        """Yields the name and content of every dex member, one at a time."""
+        for name in self.dex_names():
+            yield name, self.read(name)
+
+    def close(self):
+        self.zip.close()
+        self.buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,225 @@
+"""Decodes the binary AndroidManifest.xml of an apk without apktool."""
+
+import struct
+import xml.etree.ElementTree as ET
+from apk_reader import ApkReader, ApkError
+
+ANDROID_NAMESPACE = "http://schemas.android.com/apk/res/android"
+
+# Chunk types of the binary XML format (frameworks/base/libs/androidfw/ResourceTypes.h)
+RES_STRING_POOL_TYPE = 0x0001
+RES_XML_TYPE = 0x0003
+RES_XML_START_NAMESPACE_TYPE = 0x0100
+RES_XML_END_NAMESPACE_TYPE = 0x0101
+RES_XML_START_ELEMENT_TYPE = 0x0102
+RES_XML_END_ELEMENT_TYPE = 0x0103
+RES_XML_CDATA_TYPE = 0x0104
+RES_XML_RESOURCE_MAP_TYPE = 0x0180
+
+UTF8_FLAG = 0x100
+NO_ENTRY = 0xFFFFFFFF
+
+# Typed attribute values
+TYPE_REFERENCE = 0x01
+TYPE_ATTRIBUTE = 0x02
+TYPE_STRING = 0x03
+TYPE_FLOAT = 0x04
+TYPE_INT_DEC = 0x10
+TYPE_INT_HEX = 0x11
+TYPE_INT_BOOLEAN = 0x12
+
+# Android resolves attributes by resource id, so obfuscated manifests often carry
+# junk attribute names. These are the ids of the attributes the features rely on.
+ANDROID_ATTRIBUTE_IDS = {
+    0x01010001: "label",
+    0x01010002: "icon",
+    0x01010003: "name",
+    0x01010006: "permission",
+    0x01010010: "exported",
+    0x0101000e: "enabled",
+    0x0101020c: "minSdkVersion",
+    0x01010270: "targetSdkVersion",
+    0x01010271: "maxSdkVersion",
+    0x0101021b: "versionCode",
+    0x0101021c: "versionName",
+    0x0101001c: "priority",
+    0x0101001e: "screenOrientation",
+}
+
+
+class AXMLError(Exception):
+    """Raised when a binary XML document is malformed."""
+
+
+def _read_string_pool(data, offset, header_size, chunk_size):
+    string_count, style_count, flags, strings_start, styles_start = struct.unpack_from("<5I", data, offset + 8)
+    if offset + header_size + 4 * string_count > offset + chunk_size:
+        raise AXMLError("String pool offsets run past the chunk")
+
+    offsets = struct.unpack_from(f"<{string_count}I", data, offset + header_size)
+    base = offset + strings_start
+    end = offset + chunk_size
+    utf8 = flags & UTF8_FLAG
+
+    strings = []
+    for string_offset in offsets:
+        position = base + string_offset
+        if position >= end:
+            raise AXMLError("String offset runs past the chunk")
+        if utf8:
+            # UTF-16 length first, then the UTF-8 byte length, each one or two bytes long
+            if data[position] & 0x80:
+                position += 2
+            else:
+                position += 1
+            length = data[position]
+            if length & 0x80:
+                length = ((length & 0x7F) << 8) | data[position + 1]
+                position += 2
+            else:
+                position += 1
+            strings.append(data[position:position + length].decode("utf-8", errors="replace"))
+        else:
+            length = struct.unpack_from("<H", data, position)[0]
+            if length & 0x8000:
+                length = ((length & 0x7FFF) << 16) | struct.unpack_from("<H", data, position + 2)[0]
+                position += 4
+            else:
+                position += 2
+            strings.append(data[position:position + 2 * length].decode("utf-16-le", errors="replace"))
+    return strings
+
+
+def _format_value(strings, raw_value, data_type, value):
+    if raw_value != NO_ENTRY and raw_value < len(strings):
+        return strings[raw_value]
+    if data_type == TYPE_STRING:
+        return strings[value] if value < len(strings) else ""
+    if data_type == TYPE_INT_BOOLEAN:
+        return "true" if value else "false"
+    if data_type == TYPE_INT_DEC:
+        return str(struct.unpack("<i", struct.pack("<I", value))[0])
+    if data_type == TYPE_INT_HEX:
+        return f"0x{value:08x}"
+    if data_type == TYPE_FLOAT:
+        return str(struct.unpack("<f", struct.pack("<I", value))[0])
+    if data_type == TYPE_REFERENCE:
+        return f"@{value:08X}"
+    if data_type == TYPE_ATTRIBUTE:
+        return f"?{value:08X}"
+    return str(value)
+
+
+def parse_axml(data):
+    """
+    Decodes a binary (compiled) Android XML document into an element tree.
+
+    Attribute names are qualified the same way ET.parse qualifies the
+    apktool-decoded manifest, e.g. '{http://schemas.android.com/apk/res/android}name'.
+
+    Returns:
+        Element: The root element of the document.
+    """
+    if len(data) < 8:
+        raise AXMLError("Document is too short")
+    chunk_type, header_size, size = struct.unpack_from("<HHI", data, 0)
+    if chunk_type != RES_XML_TYPE:
+        raise AXMLError(f"Not a binary XML document (type 0x{chunk_type:04x})")
+
+    strings = []
+    resource_ids = []
+    builder = ET.TreeBuilder()
+    depth = 0
+    seen_root = False
+
+    def string(index):
+        if index == NO_ENTRY or index >= len(strings):
+            return ""
+        return strings[index]
+
+    offset = header_size
+    end = min(size, len(data))
+    while offset + 8 <= end:
+        chunk_type, header_size, chunk_size = struct.unpack_from("<HHI", data, offset)
+        if chunk_size < 8 or offset + chunk_size > end:
+            raise AXMLError(f"Invalid chunk size {chunk_size} at offset {offset}")
+
+        if chunk_type == RES_STRING_POOL_TYPE:
+            strings = _read_string_pool(data, offset, header_size, chunk_size)
+
+        elif chunk_type == RES_XML_RESOURCE_MAP_TYPE:
+            resource_ids = struct.unpack_from(f"<{(chunk_size - header_size) // 4}I", data, offset + header_size)
+
+        elif chunk_type == RES_XML_START_ELEMENT_TYPE:
+            ns, name, attribute_start, attribute_size, attribute_count = \
+                struct.unpack_from("<IIHHH", data, offset + header_size)
+            attributes = {}
+            position = offset + header_size + attribute_start
+            for _ in range(attribute_count):
+                if position + 20 > offset + chunk_size:
+                    raise AXMLError("Attribute runs past the chunk")
+                attribute_ns, attribute_name, raw_value, _, _, data_type, value = \
+                    struct.unpack_from("<IIIHBBI", data, position)
+                position += attribute_size or 20
+
+                local_name = string(attribute_name)
+                uri = string(attribute_ns)
+                if attribute_name < len(resource_ids) and resource_ids[attribute_name] in ANDROID_ATTRIBUTE_IDS:
+                    local_name = ANDROID_ATTRIBUTE_IDS[resource_ids[attribute_name]]
+                    uri = ANDROID_NAMESPACE
+                if not local_name:
+                    continue
+                key = f"{{{uri}}}{local_name}" if uri else local_name
+                attributes[key] = _format_value(strings, raw_value, data_type, value)
+
+            tag = string(name)
+            if string(ns):
+                tag = f"{{{string(ns)}}}{tag}"
+            if depth == 0 and seen_root:
+                raise AXMLError("Document has more than one root element")
+            builder.start(tag, attributes)
+            depth += 1
+            seen_root = True
+
+        elif chunk_type == RES_XML_END_ELEMENT_TYPE:
+            if depth == 0:
+                raise AXMLError("Unbalanced end element")
+            ns, name = struct.unpack_from("<II", data, offset + header_size)
+            tag = string(name)
+            if string(ns):
+                tag = f"{{{string(ns)}}}{tag}"
+            builder.end(tag)
+            depth -= 1
+
+        elif chunk_type == RES_XML_CDATA_TYPE:
+            if depth:
+                builder.data(string(struct.unpack_from("<I", data, offset + header_size)[0]))
+
+        # Namespace chunks need no handling, attributes carry their full uri
+        offset += chunk_size
+
+    if not seen_root or depth != 0:
+        raise AXMLError("Document has no complete root element")
+    return builder.close()
+
+
+def read_manifest(filepath, reader=None):
+    """
+    Reads AndroidManifest.xml straight out of the apk zip and decodes it in
+    memory. An open ApkReader of the apk is used instead of reopening it.
+
+    Returns:
+        Element: The root <manifest> element.
+    """
+    try:
+        if reader is not None:
+            data = reader.manifest()
+        else:
+            with ApkReader(filepath) as apk:
+                data = apk.manifest()
+    except ApkError as e:
+        raise AXMLError(f"Could not read AndroidManifest.xml from {filepath}: {e}")
+    try:
+        return parse_axml(data)
+    except (struct.error, IndexError) as e:
+        raise AXMLError(f"Truncated AndroidManifest.xml in {filepath}: {e}")
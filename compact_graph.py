@@ -0,0 +1,262 @@
+"""Compact array backed callgraph, a streaming GML loader and a binary format for it."""
+
+import argparse
+import html
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+
+# A GML token is a quoted string, a bracket, or a bare key / number
+GML_TOKEN = re.compile(r'"[^"]*"|\[|\]|[^\s\[\]"]+')
+
+
+class CompactGraph:
+    """
+    Callgraph stored in compressed sparse row form, indexed by callee.
+
+    The callers of node v are callers[offsets[v]:offsets[v + 1]] and its
+    method signature is labels[v]. offsets and callers are int32 arrays and
+    the labels are interned strings, so a graph with millions of edges needs
+    a few bytes per edge instead of the dict-of-dicts of a networkx graph.
+    """
+
+    def __init__(self, labels, offsets, callers):
+        self.labels = labels
+        self.offsets = offsets
+        self.callers = callers
+
+    def __len__(self):
+        return len(self.labels)
+
+    def number_of_edges(self):
+        return len(self.callers)
+
+    def callers_of(self, node):
+        return self.callers[self.offsets[node]:self.offsets[node + 1]]
+
+    @classmethod
+    def from_edges(cls, labels, sources, targets):
+        """
+        Builds the graph from parallel arrays of caller and callee node indexes.
+        """
+        offsets = array('i', bytes(4 * (len(labels) + 1)))
+        for target in targets:
+            offsets[target + 1] += 1
+        for node in range(len(labels)):
+            offsets[node + 1] += offsets[node]
+
+        callers = array('i', bytes(4 * len(targets)))
+        position = array('i', offsets[:-1])
+        for source, target in zip(sources, targets):
+            callers[position[target]] = source
+            position[target] += 1
+        return cls(labels, offsets, callers)
+
+
+def _tokens(input_file):
+    for line in input_file:
+        for token in GML_TOKEN.findall(line):
+            yield token
+
+
+def read_gml(path):
+    """
+    Streams a GML callgraph as written by 'androguard cg' into a CompactGraph.
+
+    Only the node ids and labels and the edge endpoints are kept, all other
+    attributes are skipped while reading.
+
+    Returns:
+        CompactGraph: The callgraph.
+    """
+    labels = []
+    node_index = {}
+    sources = array('q')
+    targets = array('q')
+
+    # Stack of the keys of the open lists, e.g. ['graph', 'node']
+    stack = []
+    key = None
+    node_id = node_label = None
+    edge_source = edge_target = None
+
+    with open(path, "r", encoding="utf-8") as input_file:
+        for token in _tokens(input_file):
+            if key is None:
+                if token == ']':
+                    closed = stack.pop()
+                    if stack == ['graph']:
+                        if closed == 'node' and node_id is not None:
+                            label = node_label if node_label is not None else str(node_id)
+                            node_index[node_id] = len(labels)
+                            labels.append(sys.intern(label))
+                        elif closed == 'edge' and edge_source is not None and edge_target is not None:
+                            sources.append(edge_source)
+                            targets.append(edge_target)
+                        node_id = node_label = edge_source = edge_target = None
+                else:
+                    key = token
+                continue
+
+            if token == '[':
+                stack.append(key)
+            elif len(stack) == 2:
+                if stack[1] == 'node':
+                    if key == 'id':
+                        node_id = int(token)
+                    elif key == 'label':
+                        node_label = html.unescape(token[1:-1]) if '&' in token else token[1:-1]
+                elif stack[1] == 'edge':
+                    if key == 'source':
+                        edge_source = int(token)
+                    elif key == 'target':
+                        edge_target = int(token)
+            key = None
+
+    if stack:
+        raise ValueError(f"Unbalanced brackets in GML file {path}")
+
+    try:
+        sources = array('i', (node_index[source] for source in sources))
+        targets = array('i', (node_index[target] for target in targets))
+    except KeyError as e:
+        raise ValueError(f"Edge to unknown node {e} in GML file {path}")
+    return CompactGraph.from_edges(labels, sources, targets)
+
+
+# Binary callgraph layout, little endian, every section 4 byte aligned:
+#   magic "CGB1", node count, edge count, label byte count (uint32 each)
+#   offsets        int32[node count + 1]
+#   callers        int32[edge count]
+#   label offsets  int32[node count + 1]
+#   labels         UTF-8 bytes
+CGB_MAGIC = b"CGB1"
+CGB_HEADER = struct.Struct("<4sIII")
+
+
+class LabelTable:
+    """
+    Read-only sequence of the labels of a memory-mapped callgraph. A label
+    is only decoded when it is accessed.
+    """
+
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, node):
+        if node < 0:
+            node += len(self)
+        if not 0 <= node < len(self):
+            raise IndexError("label index out of range")
+        return str(self.data[self.offsets[node]:self.offsets[node + 1]], "utf-8")
+
+
+def write_cgb(graph, path):
+    """
+    Writes a CompactGraph in the binary callgraph format.
+    """
+    encoded = [label.encode("utf-8") for label in graph.labels]
+    label_offsets = array('i', [0])
+    for label in encoded:
+        label_offsets.append(label_offsets[-1] + len(label))
+
+    offsets = array('i', graph.offsets)
+    callers = array('i', graph.callers)
+    if sys.byteorder != "little":
+        for section in (offsets, callers, label_offsets):
+            section.byteswap()
+
+    with open(path, "wb") as output_file:
+        output_file.write(CGB_HEADER.pack(CGB_MAGIC, len(graph), len(callers), sum(map(len, encoded))))
+        offsets.tofile(output_file)
+        callers.tofile(output_file)
+        label_offsets.tofile(output_file)
+        output_file.write(b"".join(encoded))
+
+
+def open_cgb(path):
+    """
+    Memory-maps a binary callgraph. The arrays of the returned CompactGraph
+    are views into the mapped file, nothing is parsed or copied up front.
+
+    Returns:
+        CompactGraph: The callgraph.
+    """
+    with open(path, "rb") as input_file:
+        buffer = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, node_count, edge_count, label_bytes = CGB_HEADER.unpack_from(buffer, 0)
+    if magic != CGB_MAGIC:
+        raise ValueError(f"{path} is not a binary callgraph")
+    expected = CGB_HEADER.size + 4 * (2 * node_count + 2 + edge_count) + label_bytes
+    if len(buffer) != expected:
+        raise ValueError(f"{path} is truncated: {len(buffer)} bytes instead of {expected}")
+
+    def section(start, count):
+        view = memoryview(buffer)[start:start + 4 * count]
+        if sys.byteorder == "little":
+            return view.cast('i')
+        swapped = array('i', bytes(view))
+        swapped.byteswap()
+        return swapped
+
+    position = CGB_HEADER.size
+    offsets = section(position, node_count + 1)
+    position += 4 * (node_count + 1)
+    callers = section(position, edge_count)
+    position += 4 * edge_count
+    label_offsets = section(position, node_count + 1)
+    position += 4 * (node_count + 1)
+    labels = LabelTable(label_offsets, memoryview(buffer)[position:])
+    return CompactGraph(labels, offsets, callers)
+
+
+def read_callgraph(path):
+    """
+    Loads a callgraph from a GML or a binary (.cgb) file.
+    """
+    if path.endswith(".cgb"):
+        return open_cgb(path)
+    return read_gml(path)
+
+
+def convert_gml_archive(directory, delete=False):
+    """
+    Converts every GML callgraph in the directory to the binary format,
+    next to the original. With delete the GML files are removed afterwards.
+    """
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith(".gml"):
+            continue
+        gml_path = os.path.join(directory, filename)
+        cgb_path = gml_path[:-len(".gml")] + ".cgb"
+        try:
+            graph = read_gml(gml_path)
+        except (ValueError, OSError, UnicodeDecodeError) as e:
+            print(f"Error converting {gml_path}: {e}")
+            continue
+        write_cgb(graph, cgb_path)
+        print(f"Converted {gml_path} to {cgb_path} ({os.path.getsize(gml_path)} -> {os.path.getsize(cgb_path)} bytes)")
+        if delete:
+            os.remove(gml_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Converts GML callgraphs to the binary callgraph format")
+    parser.add_argument("directory", nargs="?", default="./callgraphs/",
+                        help="directory with the *_callgraph.gml files (default: ./callgraphs/)")
+    parser.add_argument("--delete", action="store_true", help="remove every GML file once it is converted")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.directory):
+        print(f"Invalid callgraph directory path: {args.directory}")
+        sys.exit(1)
+
+    convert_gml_archive(args.directory, args.delete)
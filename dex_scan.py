@@ -0,0 +1,417 @@
+"""Lists the methods a dex file references, the classes invoking them and its bundled libraries."""
+
+import hashlib
+import re
+import struct
+import sys
+from array import array
+
+DEX_MAGIC = b"dex\n"
+ENDIAN_CONSTANT = 0x12345678
+
+# string_ids, type_ids, proto_ids, field_ids, method_ids and class_defs (size, offset) pairs of the header
+DEX_ID_SECTIONS = struct.Struct("<12I")
+DEX_ID_SECTIONS_OFFSET = 56
+DEX_ENDIAN_TAG_OFFSET = 40
+NO_INDEX = 0xFFFFFFFF
+
+# code_item header: registers_size, ins_size, outs_size, tries_size, debug_info_off, insns_size
+CODE_ITEM_HEADER = struct.Struct("<4HII")
+
+# invoke-kind (0x6e-0x72) and invoke-kind/range (0x74-0x78), the method index is the second code unit
+INVOKE_OPCODES = rb"[\x6e-\x72\x74-\x78]"
+
+
+def _instruction_formats():
+    """
+    Returns the width in code units of every opcode and the (byte offset,
+    size, kind) of the index operands of the opcodes that have one, after
+    the format table of the Dalvik bytecode reference.
+    """
+    widths = bytearray([1]) * 256
+    operands = {}
+
+    def opcodes(first, last, width, *index_operands):
+        for opcode in range(first, last + 1):
+            widths[opcode] = width
+            if index_operands:
+                operands[opcode] = index_operands
+
+    opcodes(0x02, 0x02, 2)
+    opcodes(0x03, 0x03, 3)
+    opcodes(0x05, 0x05, 2)
+    opcodes(0x06, 0x06, 3)
+    opcodes(0x08, 0x08, 2)
+    opcodes(0x09, 0x09, 3)
+    opcodes(0x13, 0x13, 2)
+    opcodes(0x14, 0x14, 3)
+    opcodes(0x15, 0x16, 2)
+    opcodes(0x17, 0x17, 3)
+    opcodes(0x18, 0x18, 5)
+    opcodes(0x19, 0x19, 2)
+    opcodes(0x1a, 0x1a, 2, (2, 2, "string"))
+    opcodes(0x1b, 0x1b, 3, (2, 4, "string"))
+    opcodes(0x1c, 0x1c, 2, (2, 2, "type"))
+    opcodes(0x1f, 0x20, 2, (2, 2, "type"))
+    opcodes(0x22, 0x23, 2, (2, 2, "type"))
+    opcodes(0x24, 0x25, 3, (2, 2, "type"))
+    opcodes(0x26, 0x26, 3)
+    opcodes(0x29, 0x29, 2)
+    opcodes(0x2a, 0x2c, 3)
+    opcodes(0x2d, 0x3d, 2)
+    opcodes(0x44, 0x51, 2)
+    opcodes(0x52, 0x6d, 2, (2, 2, "field"))
+    opcodes(0x6e, 0x72, 3, (2, 2, "method"))
+    opcodes(0x74, 0x78, 3, (2, 2, "method"))
+    opcodes(0x90, 0xaf, 2)
+    opcodes(0xd0, 0xe2, 2)
+    opcodes(0xfa, 0xfb, 4, (2, 2, "method"), (6, 2, "proto"))
+    # call_site and method_handle indexes are left out, they only exist in the dex file at hand
+    opcodes(0xfc, 0xfd, 3, (2, 2, None))
+    opcodes(0xfe, 0xfe, 2, (2, 2, None))
+    opcodes(0xff, 0xff, 2, (2, 2, "proto"))
+    return widths, operands
+
+
+INSTRUCTION_WIDTHS, INDEX_OPERANDS = _instruction_formats()
+
+# Identifiers of the packed-switch, sparse-switch and fill-array-data payloads, which start with a nop opcode
+PACKED_SWITCH_PAYLOAD, SPARSE_SWITCH_PAYLOAD, FILL_ARRAY_DATA_PAYLOAD = 1, 2, 3
+
+
+class DexError(Exception):
+    """Raised when a dex file is malformed."""
+
+
+def _section(data, offset, count, item_size, typecode):
+    """
+    Returns the count items of item_size bytes at offset as one array of
+    typecode values, decoded in a single copy instead of item by item.
+    """
+    end = offset + count * item_size
+    if end > len(data):
+        raise DexError(f"Section at offset {offset} runs past the end of the file")
+    values = array(typecode)
+    values.frombytes(data[offset:end])
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+def _string_bytes(data, offset):
+    """
+    Returns the raw MUTF-8 bytes of the string_data_item at offset: a
+    ULEB128 UTF-16 length followed by the bytes up to a NUL.
+    """
+    try:
+        while data[offset] & 0x80:
+            offset += 1
+    except IndexError:
+        raise DexError(f"String length at offset {offset} runs past the end of the file")
+    end = data.find(b"\0", offset + 1)
+    if end < 0:
+        raise DexError(f"String at offset {offset} is not terminated")
+    return data[offset + 1:end]
+
+
+def _uleb128(data, offset):
+    """Decodes the ULEB128 value at offset, returns it and the offset after it."""
+    result = shift = 0
+    try:
+        while True:
+            byte = data[offset]
+            offset += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result, offset
+            shift += 7
+    except IndexError:
+        raise DexError(f"ULEB128 value at offset {offset} runs past the end of the file")
+
+
+class DexTables:
+    """
+    The id tables of a dex file, each decoded with one array copy. Strings
+    are only decoded when they are looked up.
+
+    method_ids holds four ushorts per method_id_item: class_idx, proto_idx
+    and the low and high half of name_idx, field_ids the same with the
+    type_idx in place of the proto_idx. class_defs holds eight uints per
+    class_def_item, the first is the class_idx.
+    """
+
+    def __init__(self, data):
+        if len(data) < DEX_ID_SECTIONS_OFFSET + DEX_ID_SECTIONS.size or data[:4] != DEX_MAGIC:
+            raise DexError("Not a dex file")
+        if struct.unpack_from("<I", data, DEX_ENDIAN_TAG_OFFSET)[0] != ENDIAN_CONSTANT:
+            raise DexError("Unsupported byte order")
+        string_count, string_offset, type_count, type_offset, proto_count, proto_offset, field_count, field_offset, \
+            method_count, method_offset, class_count, class_offset = \
+            DEX_ID_SECTIONS.unpack_from(data, DEX_ID_SECTIONS_OFFSET)
+
+        self.data = data
+        self.string_ids = _section(data, string_offset, string_count, 4, 'I')
+        self.type_ids = _section(data, type_offset, type_count, 4, 'I')
+        # proto_id_item: shorty_idx, return_type_idx, parameters_off
+        self.proto_ids = _section(data, proto_offset, proto_count, 12, 'I')
+        self.field_ids = _section(data, field_offset, field_count, 8, 'H')
+        self.method_ids = _section(data, method_offset, method_count, 8, 'H')
+        self.class_defs = _section(data, class_offset, class_count, 32, 'I')
+
+    def string(self, index):
+        if index >= len(self.string_ids):
+            raise DexError(f"String index {index} out of range")
+        return _string_bytes(self.data, self.string_ids[index])
+
+    def type_descriptor(self, index):
+        if index >= len(self.type_ids):
+            raise DexError(f"Type index {index} out of range")
+        return self.string(self.type_ids[index])
+
+    def methods(self, classes):
+        """
+        Yields the class index, name and shorty of every method_id_item whose
+        class is one of the given type indexes, in table order.
+        """
+        method_ids = self.method_ids
+        class_indexes, proto_indexes = method_ids[0::4], method_ids[1::4]
+        name_low, name_high = method_ids[2::4], method_ids[3::4]
+        for position, class_index in enumerate(class_indexes):
+            if class_index in classes:
+                name = self.string(name_low[position] | name_high[position] << 16)
+                proto_index = proto_indexes[position]
+                if proto_index >= len(self.proto_ids) // 3:
+                    raise DexError(f"Proto index {proto_index} out of range")
+                yield class_index, name, self.string(self.proto_ids[3 * proto_index])
+
+    def proto(self, index):
+        """Returns the descriptor of the proto_id_item at index, e.g. '(I[B)V'."""
+        if index >= len(self.proto_ids) // 3:
+            raise DexError(f"Proto index {index} out of range")
+        parameters = b""
+        offset = self.proto_ids[3 * index + 2]
+        if offset:
+            if offset + 4 > len(self.data):
+                raise DexError(f"Type list at offset {offset} runs past the end of the file")
+            count = struct.unpack_from("<I", self.data, offset)[0]
+            parameters = b"".join(self.type_descriptor(type_index)
+                                  for type_index in _section(self.data, offset + 4, count, 2, 'H'))
+        return b"(" + parameters + b")" + self.type_descriptor(self.proto_ids[3 * index + 1])
+
+    def field(self, index):
+        """Returns the reference of the field_id_item at index, e.g. 'La/B;->c:I'."""
+        if index >= len(self.field_ids) // 4:
+            raise DexError(f"Field index {index} out of range")
+        class_index, type_index, name_low, name_high = self.field_ids[4 * index:4 * index + 4]
+        return self.type_descriptor(class_index) + b"->" + self.string(name_low | name_high << 16) + \
+            b":" + self.type_descriptor(type_index)
+
+    def method(self, index):
+        """Returns the reference of the method_id_item at index, e.g. 'La/B;->c(I)V'."""
+        if index >= len(self.method_ids) // 4:
+            raise DexError(f"Method index {index} out of range")
+        class_index, proto_index, name_low, name_high = self.method_ids[4 * index:4 * index + 4]
+        return self.type_descriptor(class_index) + b"->" + self.string(name_low | name_high << 16) + \
+            self.proto(proto_index)
+
+    def class_data(self, position):
+        """
+        Decodes the class_data_item of the class_def_item at position.
+
+        Returns:
+            tuple: The (field index, access flags) of its fields and the
+                   (method index, access flags, start, end) of its methods,
+                   start and end being the byte range of the instructions,
+                   both None for a method without code.
+        """
+        fields, methods = [], []
+        offset = self.class_defs[8 * position + 6]
+        if not offset:
+            return fields, methods
+        data = self.data
+        counts = []
+        for _ in range(4):
+            count, offset = _uleb128(data, offset)
+            counts.append(count)
+        for count in counts[:2]:
+            field_index = 0
+            for _ in range(count):
+                field_index_diff, offset = _uleb128(data, offset)
+                access_flags, offset = _uleb128(data, offset)
+                field_index += field_index_diff
+                fields.append((field_index, access_flags))
+        for count in counts[2:]:
+            method_index = 0
+            for _ in range(count):
+                method_index_diff, offset = _uleb128(data, offset)
+                access_flags, offset = _uleb128(data, offset)
+                code_offset, offset = _uleb128(data, offset)
+                method_index += method_index_diff
+                start = end = None
+                if code_offset:
+                    if code_offset + CODE_ITEM_HEADER.size > len(data):
+                        raise DexError(f"Code item at offset {code_offset} runs past the end of the file")
+                    start = code_offset + CODE_ITEM_HEADER.size
+                    end = start + 2 * CODE_ITEM_HEADER.unpack_from(data, code_offset)[5]
+                    if end > len(data):
+                        raise DexError(f"Code item at offset {code_offset} runs past the end of the file")
+                methods.append((method_index, access_flags, start, end))
+        return fields, methods
+
+    def code_items(self, position):
+        """
+        Yields the method index and the (start, end) byte range of the
+        instructions of every method with code of the class_def_item at
+        position, from its class_data_item.
+        """
+        for method_index, _, start, end in self.class_data(position)[1]:
+            if start is not None:
+                yield method_index, start, end
+
+    def normalized_code(self, start, end):
+        """
+        Returns the instructions between start and end with every string,
+        type, field, method and proto index replaced by what it refers to, so
+        the same code gives the same bytes in any dex file it is merged into.
+        """
+        data = self.data
+        resolve = {"string": self.string, "type": self.type_descriptor, "field": self.field,
+                   "method": self.method, "proto": self.proto, None: lambda index: b""}
+        pieces = []
+        position = start
+        while position < end:
+            opcode = data[position]
+            if opcode == 0 and data[position + 1]:
+                payload = data[position + 1]
+                if position + 8 > end:
+                    raise DexError(f"Payload at offset {position} runs past its code item")
+                size = struct.unpack_from("<H", data, position + 2)[0]
+                if payload == PACKED_SWITCH_PAYLOAD:
+                    width = 2 * size + 4
+                elif payload == SPARSE_SWITCH_PAYLOAD:
+                    width = 4 * size + 2
+                elif payload == FILL_ARRAY_DATA_PAYLOAD:
+                    width = (struct.unpack_from("<I", data, position + 4)[0] * size + 1) // 2 + 4
+                else:
+                    raise DexError(f"Unknown payload {payload} at offset {position}")
+            else:
+                width = INSTRUCTION_WIDTHS[opcode]
+            following = position + 2 * width
+            if following > end:
+                raise DexError(f"Instruction at offset {position} runs past its code item")
+            # Payloads and the instructions without an index operand are kept as they are
+            offset = position
+            for operand_offset, size, kind in INDEX_OPERANDS.get(opcode, ()):
+                index = int.from_bytes(data[position + operand_offset:position + operand_offset + size], "little")
+                pieces.append(data[offset:position + operand_offset])
+                pieces.append(b"\0" + resolve[kind](index) + b"\0")
+                offset = position + operand_offset + size
+            pieces.append(data[offset:following])
+            position = following
+        return b"".join(pieces)
+
+
+def method_references(data, class_descriptors):
+    """
+    Scans the method_ids table of a dex file for the methods of the given
+    classes, e.g. 'Landroid/telephony/TelephonyManager;'. Every method a dex
+    file calls, defined in it or not, has an entry in the table, so this finds
+    the framework methods an app references without disassembling any code.
+
+    Only the type descriptors and the names of the matching methods are
+    decoded, the rest of the string table is never touched.
+
+    Returns:
+        set: The qualified signatures of the referenced methods, e.g.
+             'Landroid/telephony/TelephonyManager;->getDeviceId'.
+    """
+    tables = DexTables(data)
+    wanted = {descriptor.encode("utf-8") for descriptor in class_descriptors}
+    classes = {}
+    for type_index in range(len(tables.type_ids)):
+        descriptor = tables.type_descriptor(type_index)
+        if descriptor in wanted:
+            classes[type_index] = descriptor.decode("utf-8")
+    if not classes:
+        return set()
+
+    return {f"{classes[class_index]}->{name.decode('utf-8', errors='replace')}"
+            for class_index, name, _ in tables.methods(classes)}
+
+
+def invoking_classes(data, is_target):
+    """
+    Finds the classes a dex file defines whose code invokes a method of a
+    target class, where is_target tells from a class descriptor, e.g.
+    'Landroid/telephony/TelephonyManager;', whether it is one. These are
+    the classes whose cross-references lead to a target method, the others
+    can be left out of the cross-reference pass of an analysis.
+
+    The instructions are searched for the invoke opcodes followed by the
+    index of a target method instead of being disassembled. Array data and
+    switch tables can look like such an invoke, so an extra class may be
+    found, but no class that does invoke a target method is missed.
+
+    Returns:
+        set: The descriptors of the invoking classes.
+    """
+    tables = DexTables(data)
+    target_types = set()
+    for type_index in range(len(tables.type_ids)):
+        descriptor = tables.type_descriptor(type_index).lstrip(b"[")
+        if is_target(descriptor.decode("utf-8", errors="replace")):
+            target_types.add(type_index)
+    targets = {position for position, class_index in enumerate(tables.method_ids[0::4]) if class_index in target_types}
+    if not targets:
+        return set()
+
+    high_bytes = b"".join(re.escape(bytes([value])) for value in sorted({target >> 8 for target in targets}))
+    invoke = re.compile(b"(?=" + INVOKE_OPCODES + b".." + b"[" + high_bytes + b"])", re.DOTALL)
+    found = set()
+    for position in range(len(tables.class_defs) // 8):
+        for _, start, end in tables.code_items(position):
+            if any((match.start() - start) % 2 == 0 and
+                   struct.unpack_from("<H", data, match.start() + 2)[0] in targets
+                   for match in invoke.finditer(data, start, end)):
+                found.add(tables.type_descriptor(tables.class_defs[8 * position]).decode("utf-8", errors="replace"))
+                break
+    return found
+
+
+def package_fingerprints(data, prefixes):
+    """
+    Fingerprints the classes a dex file defines under each of the given
+    package prefixes, e.g. 'Lcom/google/android/gms/'. The fingerprint is
+    the SHA-256 over the sorted class descriptors, their superclasses and
+    their class data: the fields and methods with their access flags and the
+    instructions of the methods, see DexTables.normalized_code. It
+    identifies a library version by its code, independently of where the
+    classes ended up in the dex file.
+
+    Returns:
+        dict: For every prefix with classes in the dex file, its hex
+              fingerprint and the set of its class descriptors.
+    """
+    tables = DexTables(data)
+    encoded = tuple(prefix.encode("utf-8") for prefix in prefixes)
+    descriptors = {}
+    lines = {}
+    class_defs = tables.class_defs
+    for position in range(len(class_defs) // 8):
+        descriptor = tables.type_descriptor(class_defs[8 * position])
+        prefix = next((prefix for prefix in encoded if descriptor.startswith(prefix)), None)
+        if prefix is None:
+            continue
+        descriptors.setdefault(prefix, set()).add(descriptor.decode("utf-8", errors="replace"))
+        superclass = class_defs[8 * position + 2]
+        class_lines = lines.setdefault(prefix, [])
+        class_lines.append(descriptor + b" " + (b"" if superclass == NO_INDEX else tables.type_descriptor(superclass)))
+        fields, methods = tables.class_data(position)
+        for field_index, access_flags in fields:
+            class_lines.append(b"%s %x" % (tables.field(field_index), access_flags))
+        for method_index, access_flags, start, end in methods:
+            code = b"" if start is None else tables.normalized_code(start, end)
+            class_lines.append(b"%s %x %s" % (tables.method(method_index), access_flags, code.hex().encode()))
+
+    return {prefix.decode("utf-8"): (hashlib.sha256(b"\n".join(sorted(lines[prefix]))).hexdigest(), descriptors[prefix])
+            for prefix in lines}
@@ -0,0 +1,103 @@
+"""Content addressed on-disk cache of the extracted feature vectors."""
+
+import hashlib
+import json
+import os
+import tempfile
+
+
+def file_sha256(filepath):
+    """
+    Returns the hex SHA-256 of a file's content.
+    """
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as input_file:
+        for block in iter(lambda: input_file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def vocabulary_fingerprint(*vocabularies):
+    """
+    Returns a short hash over the given vocabularies (any JSON serializable
+    values, e.g. the lists of feature names). Cache entries written with a
+    different vocabulary never match.
+    """
+    digest = hashlib.sha256(json.dumps(vocabularies, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class ExtractionCache:
+    """
+    Stores one JSON entry per APK content hash and vocabulary fingerprint
+    under <directory>/<first two hex digits>/<sha256>-<fingerprint>.json.
+
+    Every hit refreshes the entry's modification time, and evict() removes
+    the least recently used entries until the cache fits in max_bytes.
+    Entries are written through a temp file and a rename, so concurrent
+    workers never see a partial entry.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, sha256, fingerprint):
+        return os.path.join(self.directory, sha256[:2], f"{sha256}-{fingerprint}.json")
+
+    def get(self, sha256, fingerprint):
+        path = self._path(sha256, fingerprint)
+        try:
+            with open(path, "r", encoding="utf-8") as input_file:
+                entry = json.load(input_file)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def put(self, sha256, fingerprint, entry):
+        path = self._path(sha256, fingerprint)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as output_file:
+                json.dump(entry, output_file)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the cache fits in its size cap.
+
+        Returns:
+            int: The number of removed entries.
+        """
+        entries = []
+        total = 0
+        for subdir in os.scandir(self.directory):
+            if not subdir.is_dir():
+                continue
+            for entry in os.scandir(subdir.path):
+                if entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
@@ -8,21 +8,1234 @@
 # Copyright   : © 2025 Gautam Kakadiya. All rights reserved.
 ##########################################################################################
 
-import multiprocessing
+import argparse
+import concurrent.futures
+import functools
+import queue
 import sys
+import tempfile
+import threading
+import time
 import shutil
 import subprocess
 import xml.etree.ElementTree as ET
+from array import array
 import networkx as nx
-import re
+import analysis_budget
+import apk_reader
+import axml
+import compact_graph
+import dex_scan
+import extraction_cache
+import library_index
+import progress_journal
+import worker_pool
 import os
 
 
-# test
+permissions = {
+    "ACCEPT_HANDOVER": 0,
+    "ACCESS_BACKGROUND_LOCATION": 0,
+    "ACCESS_BLOBS_ACROSS_USERS": 0,
+    "ACCESS_CHECKIN_PROPERTIES": 0,
+    "ACCESS_COARSE_LOCATION": 0,
+    "ACCESS_FINE_LOCATION": 0,
+    "ACCESS_HIDDEN_PROFILES": 0,
+    "ACCESS_LOCATION_EXTRA_COMMANDS": 0,
+    "ACCESS_MEDIA_LOCATION": 0,
+    "ACCESS_NETWORK_STATE": 0,
+    "ACCESS_NOTIFICATION_POLICY": 0,
+    "ACCESS_WIFI_STATE": 0,
+    "ACCOUNT_MANAGER": 0,
+    "ACTIVITY_RECOGNITION": 0,
+    "ADD_VOICEMAIL": 0,
+    "ANSWER_PHONE_CALLS": 0,
+    "APPLY_PICTURE_PROFILE": 0,
+    "BATTERY_STATS": 0,
+    "BIND_ACCESSIBILITY_SERVICE": 0,
+    "BIND_APPWIDGET": 0,
+    "BIND_APP_FUNCTION_SERVICE": 0,
+    "BIND_AUTOFILL_SERVICE": 0,
+    "BIND_CALL_REDIRECTION_SERVICE": 0,
+    "BIND_CARRIER_MESSAGING_CLIENT_SERVICE": 0,
+    "BIND_CARRIER_MESSAGING_SERVICE": 0,
+    "BIND_CARRIER_SERVICES": 0,
+    "BIND_CHOOSER_TARGET_SERVICE": 0,
+    "BIND_COMPANION_DEVICE_SERVICE": 0,
+    "BIND_CONDITION_PROVIDER_SERVICE": 0,
+    "BIND_CONTROLS": 0,
+    "BIND_CREDENTIAL_PROVIDER_SERVICE": 0,
+    "BIND_DEVICE_ADMIN": 0,
+    "BIND_DREAM_SERVICE": 0,
+    "BIND_INCALL_SERVICE": 0,
+    "BIND_INPUT_METHOD": 0,
+    "BIND_MIDI_DEVICE_SERVICE": 0,
+    "BIND_NFC_SERVICE": 0,
+    "BIND_NOTIFICATION_LISTENER_SERVICE": 0,
+    "BIND_PRINT_SERVICE": 0,
+    "BIND_QUICK_ACCESS_WALLET_SERVICE": 0,
+    "BIND_QUICK_SETTINGS_TILE": 0,
+    "BIND_REMOTEVIEWS": 0,
+    "BIND_SCREENING_SERVICE": 0,
+    "BIND_TELECOM_CONNECTION_SERVICE": 0,
+    "BIND_TEXT_SERVICE": 0,
+    "BIND_TV_AD_SERVICE": 0,
+    "BIND_TV_INPUT": 0,
+    "BIND_TV_INTERACTIVE_APP": 0,
+    "BIND_VISUAL_VOICEMAIL_SERVICE": 0,
+    "BIND_VOICE_INTERACTION": 0,
+    "BIND_VPN_SERVICE": 0,
+    "BIND_VR_LISTENER_SERVICE": 0,
+    "BIND_WALLPAPER": 0,
+    "BLUETOOTH": 0,
+    "BLUETOOTH_ADMIN": 0,
+    "BLUETOOTH_ADVERTISE": 0,
+    "BLUETOOTH_CONNECT": 0,
+    "BLUETOOTH_PRIVILEGED": 0,
+    "BLUETOOTH_SCAN": 0,
+    "BODY_SENSORS": 0,
+    "BODY_SENSORS_BACKGROUND": 0,
+    "BROADCAST_PACKAGE_REMOVED": 0,
+    "BROADCAST_SMS": 0,
+    "BROADCAST_STICKY": 0,
+    "BROADCAST_WAP_PUSH": 0,
+    "CALL_COMPANION_APP": 0,
+    "CALL_PHONE": 0,
+    "CALL_PRIVILEGED": 0,
+    "CAMERA": 0,
+    "CAPTURE_AUDIO_OUTPUT": 0,
+    "CHANGE_COMPONENT_ENABLED_STATE": 0,
+    "CHANGE_CONFIGURATION": 0,
+    "CHANGE_NETWORK_STATE": 0,
+    "CHANGE_WIFI_MULTICAST_STATE": 0,
+    "CHANGE_WIFI_STATE": 0,
+    "CLEAR_APP_CACHE": 0,
+    "CONFIGURE_WIFI_DISPLAY": 0,
+    "CONTROL_LOCATION_UPDATES": 0,
+    "CREDENTIAL_MANAGER_QUERY_CANDIDATE_CREDENTIALS": 0,
+    "CREDENTIAL_MANAGER_SET_ALLOWED_PROVIDERS": 0,
+    "CREDENTIAL_MANAGER_SET_ORIGIN": 0,
+    "DELETE_CACHE_FILES": 0,
+    "DELETE_PACKAGES": 0,
+    "DELIVER_COMPANION_MESSAGES": 0,
+    "DETECT_SCREEN_CAPTURE": 0,
+    "DETECT_SCREEN_RECORDING": 0,
+    "DIAGNOSTIC": 0,
+    "DISABLE_KEYGUARD": 0,
+    "DUMP": 0,
+    "ENFORCE_UPDATE_OWNERSHIP": 0,
+    "EXECUTE_APP_ACTION": 0,
+    "EXECUTE_APP_FUNCTIONS": 0,
+    "EXPAND_STATUS_BAR": 0,
+    "FACTORY_TEST": 0,
+    "FOREGROUND_SERVICE": 0,
+    "FOREGROUND_SERVICE_CAMERA": 0,
+    "FOREGROUND_SERVICE_CONNECTED_DEVICE": 0,
+    "FOREGROUND_SERVICE_DATA_SYNC": 0,
+    "FOREGROUND_SERVICE_HEALTH": 0,
+    "FOREGROUND_SERVICE_LOCATION": 0,
+    "FOREGROUND_SERVICE_MEDIA_PLAYBACK": 0,
+    "FOREGROUND_SERVICE_MEDIA_PROCESSING": 0,
+    "FOREGROUND_SERVICE_MEDIA_PROJECTION": 0,
+    "FOREGROUND_SERVICE_MICROPHONE": 0,
+    "FOREGROUND_SERVICE_PHONE_CALL": 0,
+    "FOREGROUND_SERVICE_REMOTE_MESSAGING": 0,
+    "FOREGROUND_SERVICE_SPECIAL_USE": 0,
+    "FOREGROUND_SERVICE_SYSTEM_EXEMPTED": 0,
+    "GET_ACCOUNTS": 0,
+    "GET_ACCOUNTS_PRIVILEGED": 0,
+    "GET_PACKAGE_SIZE": 0,
+    "GET_TASKS": 0,
+    "GLOBAL_SEARCH": 0,
+    "HIDE_OVERLAY_WINDOWS": 0,
+    "HIGH_SAMPLING_RATE_SENSORS": 0,
+    "INSTALL_LOCATION_PROVIDER": 0,
+    "INSTALL_PACKAGES": 0,
+    "INSTALL_SHORTCUT": 0,
+    "INSTANT_APP_FOREGROUND_SERVICE": 0,
+    "INTERACT_ACROSS_PROFILES": 0,
+    "INTERNET": 0,
+    "KILL_BACKGROUND_PROCESSES": 0,
+    "LAUNCH_CAPTURE_CONTENT_ACTIVITY_FOR_NOTE": 0,
+    "LAUNCH_MULTI_PANE_SETTINGS_DEEP_LINK": 0,
+    "LOADER_USAGE_STATS": 0,
+    "LOCATION_HARDWARE": 0,
+    "MANAGE_DEVICE_LOCK_STATE": 0,
+    "MANAGE_DEVICE_POLICY_ACCESSIBILITY": 0,
+    "MANAGE_DEVICE_POLICY_ACCOUNT_MANAGEMENT": 0,
+    "MANAGE_DEVICE_POLICY_ACROSS_USERS": 0,
+    "MANAGE_DEVICE_POLICY_ACROSS_USERS_FULL": 0,
+    "MANAGE_DEVICE_POLICY_ACROSS_USERS_SECURITY_CRITICAL": 0,
+    "MANAGE_DEVICE_POLICY_AIRPLANE_MODE": 0,
+    "MANAGE_DEVICE_POLICY_APPS_CONTROL": 0,
+    "MANAGE_DEVICE_POLICY_APP_FUNCTIONS": 0,
+    "MANAGE_DEVICE_POLICY_APP_RESTRICTIONS": 0,
+    "MANAGE_DEVICE_POLICY_APP_USER_DATA": 0,
+    "MANAGE_DEVICE_POLICY_ASSIST_CONTENT": 0,
+    "MANAGE_DEVICE_POLICY_AUDIO_OUTPUT": 0,
+    "MANAGE_DEVICE_POLICY_AUTOFILL": 0,
+    "MANAGE_DEVICE_POLICY_BACKUP_SERVICE": 0,
+    "MANAGE_DEVICE_POLICY_BLOCK_UNINSTALL": 0,
+    "MANAGE_DEVICE_POLICY_BLUETOOTH": 0,
+    "MANAGE_DEVICE_POLICY_BUGREPORT": 0,
+    "MANAGE_DEVICE_POLICY_CALLS": 0,
+    "MANAGE_DEVICE_POLICY_CAMERA": 0,
+    "MANAGE_DEVICE_POLICY_CAMERA_TOGGLE": 0,
+    "MANAGE_DEVICE_POLICY_CERTIFICATES": 0,
+    "MANAGE_DEVICE_POLICY_COMMON_CRITERIA_MODE": 0,
+    "MANAGE_DEVICE_POLICY_CONTENT_PROTECTION": 0,
+    "MANAGE_DEVICE_POLICY_DEBUGGING_FEATURES": 0,
+    "MANAGE_DEVICE_POLICY_DEFAULT_SMS": 0,
+    "MANAGE_DEVICE_POLICY_DEVICE_IDENTIFIERS": 0,
+    "MANAGE_DEVICE_POLICY_DISPLAY": 0,
+    "MANAGE_DEVICE_POLICY_FACTORY_RESET": 0,
+    "MANAGE_DEVICE_POLICY_FUN": 0,
+    "MANAGE_DEVICE_POLICY_INPUT_METHODS": 0,
+    "MANAGE_DEVICE_POLICY_INSTALL_UNKNOWN_SOURCES": 0,
+    "MANAGE_DEVICE_POLICY_KEEP_UNINSTALLED_PACKAGES": 0,
+    "MANAGE_DEVICE_POLICY_KEYGUARD": 0,
+    "MANAGE_DEVICE_POLICY_LOCALE": 0,
+    "MANAGE_DEVICE_POLICY_LOCATION": 0,
+    "MANAGE_DEVICE_POLICY_LOCK": 0,
+    "MANAGE_DEVICE_POLICY_LOCK_CREDENTIALS": 0,
+    "MANAGE_DEVICE_POLICY_LOCK_TASK": 0,
+    "MANAGE_DEVICE_POLICY_MANAGED_SUBSCRIPTIONS": 0,
+    "MANAGE_DEVICE_POLICY_METERED_DATA": 0,
+    "MANAGE_DEVICE_POLICY_MICROPHONE": 0,
+    "MANAGE_DEVICE_POLICY_MICROPHONE_TOGGLE": 0,
+    "MANAGE_DEVICE_POLICY_MOBILE_NETWORK": 0,
+    "MANAGE_DEVICE_POLICY_MODIFY_USERS": 0,
+    "MANAGE_DEVICE_POLICY_MTE": 0,
+    "MANAGE_DEVICE_POLICY_NEARBY_COMMUNICATION": 0,
+    "MANAGE_DEVICE_POLICY_NETWORK_LOGGING": 0,
+    "MANAGE_DEVICE_POLICY_ORGANIZATION_IDENTITY": 0,
+    "MANAGE_DEVICE_POLICY_OVERRIDE_APN": 0,
+    "MANAGE_DEVICE_POLICY_PACKAGE_STATE": 0,
+    "MANAGE_DEVICE_POLICY_PHYSICAL_MEDIA": 0,
+    "MANAGE_DEVICE_POLICY_PRINTING": 0,
+    "MANAGE_DEVICE_POLICY_PRIVATE_DNS": 0,
+    "MANAGE_DEVICE_POLICY_PROFILES": 0,
+    "MANAGE_DEVICE_POLICY_PROFILE_INTERACTION": 0,
+    "MANAGE_DEVICE_POLICY_PROXY": 0,
+    "MANAGE_DEVICE_POLICY_QUERY_SYSTEM_UPDATES": 0,
+    "MANAGE_DEVICE_POLICY_RESET_PASSWORD": 0,
+    "MANAGE_DEVICE_POLICY_RESTRICT_PRIVATE_DNS": 0,
+    "MANAGE_DEVICE_POLICY_RUNTIME_PERMISSIONS": 0,
+    "MANAGE_DEVICE_POLICY_RUN_IN_BACKGROUND": 0,
+    "MANAGE_DEVICE_POLICY_SAFE_BOOT": 0,
+    "MANAGE_DEVICE_POLICY_SCREEN_CAPTURE": 0,
+    "MANAGE_DEVICE_POLICY_SCREEN_CONTENT": 0,
+    "MANAGE_DEVICE_POLICY_SECURITY_LOGGING": 0,
+    "MANAGE_DEVICE_POLICY_SETTINGS": 0,
+    "MANAGE_DEVICE_POLICY_SMS": 0,
+    "MANAGE_DEVICE_POLICY_STATUS_BAR": 0,
+    "MANAGE_DEVICE_POLICY_SUPPORT_MESSAGE": 0,
+    "MANAGE_DEVICE_POLICY_SUSPEND_PERSONAL_APPS": 0,
+    "MANAGE_DEVICE_POLICY_SYSTEM_APPS": 0,
+    "MANAGE_DEVICE_POLICY_SYSTEM_DIALOGS": 0,
+    "MANAGE_DEVICE_POLICY_SYSTEM_UPDATES": 0,
+    "MANAGE_DEVICE_POLICY_THREAD_NETWORK": 0,
+    "MANAGE_DEVICE_POLICY_TIME": 0,
+    "MANAGE_DEVICE_POLICY_USB_DATA_SIGNALLING": 0,
+    "MANAGE_DEVICE_POLICY_USB_FILE_TRANSFER": 0,
+    "MANAGE_DEVICE_POLICY_USERS": 0,
+    "MANAGE_DEVICE_POLICY_VPN": 0,
+    "MANAGE_DEVICE_POLICY_WALLPAPER": 0,
+    "MANAGE_DEVICE_POLICY_WIFI": 0,
+    "MANAGE_DEVICE_POLICY_WINDOWS": 0,
+    "MANAGE_DEVICE_POLICY_WIPE_DATA": 0,
+    "MANAGE_DOCUMENTS": 0,
+    "MANAGE_EXTERNAL_STORAGE": 0,
+    "MANAGE_MEDIA": 0,
+    "MANAGE_ONGOING_CALLS": 0,
+    "MANAGE_OWN_CALLS": 0,
+    "MANAGE_WIFI_INTERFACES": 0,
+    "MANAGE_WIFI_NETWORK_SELECTION": 0,
+    "MASTER_CLEAR": 0,
+    "MEDIA_CONTENT_CONTROL": 0,
+    "MEDIA_ROUTING_CONTROL": 0,
+    "MODIFY_AUDIO_SETTINGS": 0,
+    "MODIFY_PHONE_STATE": 0,
+    "MOUNT_FORMAT_FILESYSTEMS": 0,
+    "MOUNT_UNMOUNT_FILESYSTEMS": 0,
+    "NEARBY_WIFI_DEVICES": 0,
+    "NFC": 0,
+    "NFC_PREFERRED_PAYMENT_INFO": 0,
+    "NFC_TRANSACTION_EVENT": 0,
+    "OVERRIDE_WIFI_CONFIG": 0,
+    "PACKAGE_USAGE_STATS": 0,
+    "PERSISTENT_ACTIVITY": 0,
+    "POST_NOTIFICATIONS": 0,
+    "PROCESS_OUTGOING_CALLS": 0,
+    "PROVIDE_OWN_AUTOFILL_SUGGESTIONS": 0,
+    "PROVIDE_REMOTE_CREDENTIALS": 0,
+    "QUERY_ADVANCED_PROTECTION_MODE": 0,
+    "QUERY_ALL_PACKAGES": 0,
+    "RANGING": 0,
+    "READ_ASSISTANT_APP_SEARCH_DATA": 0,
+    "READ_BASIC_PHONE_STATE": 0,
+    "READ_CALENDAR": 0,
+    "READ_CALL_LOG": 0,
+    "READ_COLOR_ZONES": 0,
+    "READ_CONTACTS": 0,
+    "READ_DROPBOX_DATA": 0,
+    "READ_EXTERNAL_STORAGE": 0,
+    "READ_HOME_APP_SEARCH_DATA": 0,
+    "READ_INPUT_STATE": 0,
+    "READ_LOGS": 0,
+    "READ_MEDIA_AUDIO": 0,
+    "READ_MEDIA_IMAGES": 0,
+    "READ_MEDIA_VIDEO": 0,
+    "READ_MEDIA_VISUAL_USER_SELECTED": 0,
+    "READ_NEARBY_STREAMING_POLICY": 0,
+    "READ_PHONE_NUMBERS": 0,
+    "READ_PHONE_STATE": 0,
+    "READ_PRECISE_PHONE_STATE": 0,
+    "READ_SMS": 0,
+    "READ_SYNC_SETTINGS": 0,
+    "READ_SYNC_STATS": 0,
+    "READ_SYSTEM_PREFERENCES": 0,
+    "READ_VOICEMAIL": 0,
+    "REBOOT": 0,
+    "RECEIVE_BOOT_COMPLETED": 0,
+    "RECEIVE_MMS": 0,
+    "RECEIVE_SMS": 0,
+    "RECEIVE_WAP_PUSH": 0,
+    "RECORD_AUDIO": 0,
+    "REORDER_TASKS": 0,
+    "REQUEST_COMPANION_PROFILE_APP_STREAMING": 0,
+    "REQUEST_COMPANION_PROFILE_AUTOMOTIVE_PROJECTION": 0,
+    "REQUEST_COMPANION_PROFILE_COMPUTER": 0,
+    "REQUEST_COMPANION_PROFILE_GLASSES": 0,
+    "REQUEST_COMPANION_PROFILE_NEARBY_DEVICE_STREAMING": 0,
+    "REQUEST_COMPANION_PROFILE_WATCH": 0,
+    "REQUEST_COMPANION_RUN_IN_BACKGROUND": 0,
+    "REQUEST_COMPANION_SELF_MANAGED": 0,
+    "REQUEST_COMPANION_START_FOREGROUND_SERVICES_FROM_BACKGROUND": 0,
+    "REQUEST_COMPANION_USE_DATA_IN_BACKGROUND": 0,
+    "REQUEST_DELETE_PACKAGES": 0,
+    "REQUEST_IGNORE_BATTERY_OPTIMIZATIONS": 0,
+    "REQUEST_INSTALL_PACKAGES": 0,
+    "REQUEST_OBSERVE_COMPANION_DEVICE_PRESENCE": 0,
+    "REQUEST_OBSERVE_DEVICE_UUID_PRESENCE": 0,
+    "REQUEST_PASSWORD_COMPLEXITY": 0,
+    "RESTART_PACKAGES": 0,
+    "RUN_USER_INITIATED_JOBS": 0,
+    "SCHEDULE_EXACT_ALARM": 0,
+    "SEND_RESPOND_VIA_MESSAGE": 0,
+    "SEND_SMS": 0,
+    "SET_ALARM": 0,
+    "SET_ALWAYS_FINISH": 0,
+    "SET_ANIMATION_SCALE": 0,
+    "SET_BIOMETRIC_DIALOG_ADVANCED": 0,
+    "SET_DEBUG_APP": 0,
+    "SET_PREFERRED_APPLICATIONS": 0,
+    "SET_PROCESS_LIMIT": 0,
+    "SET_TIME": 0,
+    "SET_TIME_ZONE": 0,
+    "SET_WALLPAPER": 0,
+    "SET_WALLPAPER_HINTS": 0,
+    "SIGNAL_PERSISTENT_PROCESSES": 0,
+    "SMS_FINANCIAL_TRANSACTIONS": 0,
+    "START_FOREGROUND_SERVICES_FROM_BACKGROUND": 0,
+    "START_VIEW_APP_FEATURES": 0,
+    "START_VIEW_PERMISSION_USAGE": 0,
+    "STATUS_BAR": 0,
+    "SUBSCRIBE_TO_KEYGUARD_LOCKED_STATE": 0,
+    "SYSTEM_ALERT_WINDOW": 0,
+    "TRANSMIT_IR": 0,
+    "TURN_SCREEN_ON": 0,
+    "TV_IMPLICIT_ENTER_PIP": 0,
+    "UNINSTALL_SHORTCUT": 0,
+    "UPDATE_DEVICE_STATS": 0,
+    "UPDATE_PACKAGES_WITHOUT_USER_ACTION": 0,
+    "USE_BIOMETRIC": 0,
+    "USE_EXACT_ALARM": 0,
+    "USE_FINGERPRINT": 0,
+    "WRITE_VOICEMAIL": 0,
+    "USE_FULL_SCREEN_INTENT": 0,
+    "USE_ICC_AUTH_WITH_DEVICE_IDENTIFIER": 0,
+    "USE_SIP": 0,
+    "UWB_RANGING": 0,
+    "VIBRATE": 0,
+    "WAKE_LOCK": 0,
+    "WRITE_APN_SETTINGS": 0,
+    "WRITE_CALENDAR": 0,
+    "WRITE_CALL_LOG": 0,
+    "WRITE_CONTACTS": 0,
+    "WRITE_EXTERNAL_STORAGE": 0,
+    "WRITE_GSERVICES": 0,
+    "WRITE_SECURE_SETTINGS": 0,
+    "WRITE_SETTINGS": 0,
+    "WRITE_SYNC_SETTINGS": 0,
+    "WRITE_SYSTEM_PREFERENCES": 0
+}
 
-def extract_manifests(directory):
-    os.makedirs("./manifests/", exist_ok=True)
-    for filename in os.listdir(directory):
+all_intent_actions = {
+    "android.intent.action.MAIN": 0,
+    "android.intent.action.VIEW": 0,
+    "android.intent.action.DIAL": 0,
+    "android.intent.action.CALL": 0,
+    "android.intent.action.SENDTO": 0,
+    "android.intent.action.SEND": 0,
+    "android.intent.action.SEND_MULTIPLE": 0,
+    "android.intent.action.INSERT": 0,
+    "android.intent.action.DELETE": 0,
+    "android.intent.action.EDIT": 0,
+    "android.intent.action.PICK": 0,
+    "android.intent.action.GET_CONTENT": 0,
+    "android.intent.action.OPEN_DOCUMENT": 0,
+    "android.intent.action.CREATE_DOCUMENT": 0,
+    "android.intent.action.CHOOSER": 0,
+    "android.intent.action.SEARCH": 0,
+    "android.intent.action.WEB_SEARCH": 0,
+    "android.intent.action.SYNC": 0,
+    "android.intent.action.SET_WALLPAPER": 0,
+    "android.intent.action.INSTALL_PACKAGE": 0,
+    "android.intent.action.UNINSTALL_PACKAGE": 0,
+    "android.intent.action.BOOT_COMPLETED": 0,
+    "android.intent.action.MEDIA_MOUNTED": 0,
+    "android.intent.action.MEDIA_UNMOUNTED": 0,
+    "android.intent.action.ACTION_POWER_CONNECTED": 0,
+    "android.intent.action.ACTION_POWER_DISCONNECTED": 0,
+    "android.intent.action.BATTERY_LOW": 0,
+    "android.intent.action.BATTERY_OKAY": 0,
+    "android.intent.action.DEVICE_STORAGE_LOW": 0,
+    "android.intent.action.DEVICE_STORAGE_OK": 0,
+    "android.intent.action.MANAGE_NETWORK_STORAGE": 0,
+    "android.intent.action.LOCALE_CHANGED": 0,
+    "android.intent.action.TIME_SET": 0,
+    "android.intent.action.TIMEZONE_CHANGED": 0,
+    "android.intent.action.REBOOT": 0,
+    "android.intent.action.SHUTDOWN": 0,
+    "android.intent.action.CONFIGURATION_CHANGED": 0,
+    "android.intent.action.CONTENT_CHANGED": 0,
+    "android.intent.action.EXTERNAL_APPLICATIONS_AVAILABLE": 0,
+    "android.intent.action.EXTERNAL_APPLICATIONS_UNAVAILABLE": 0,
+    "android.intent.action.PACKAGE_ADDED": 0,
+    "android.intent.action.PACKAGE_CHANGED": 0,
+    "android.intent.action.PACKAGE_REMOVED": 0,
+    "android.intent.action.PACKAGE_REPLACED": 0,
+    "android.intent.action.PACKAGE_RESTARTED": 0,
+    "android.intent.action.MY_PACKAGE_REPLACED": 0,
+    "android.intent.action.UID_REMOVED": 0,
+    "android.intent.action.USER_PRESENT": 0,
+    "android.intent.action.QUICK_VIEW": 0,
+    "android.intent.action.ASSIST": 0,
+    "android.intent.action.BUG_REPORT": 0,
+    "android.intent.action.PROCESS_TEXT": 0,
+    "android.intent.action.SHOW_APP_INFO": 0,
+    "android.intent.action.VOICE_COMMAND": 0,
+    "android.intent.action.CREATE_SHORTCUT": 0,
+    "android.intent.action.OPEN_DOCUMENT_TREE": 0,
+    "android.intent.action.OPEN_EXTERNAL_DIRECTORY": 0,
+    "android.intent.action.ADVANCED_SETTINGS": 0,
+    "android.intent.action.APPLICATION_DETAILS_SETTINGS": 0,
+    "android.intent.action.MANAGE_APPLICATIONS_SETTINGS": 0,
+    "android.intent.action.MANAGE_ALL_APPLICATIONS_ACCESS_PERMISSION": 0,
+    "android.intent.action.NOTIFICATION_POLICY_ACCESS_SETTINGS": 0,
+    "android.intent.action.ACTION_SEARCH_SETTINGS": 0,
+    "android.intent.action.SHOW_INPUT_METHOD_PICKER": 0,
+    "android.intent.action.SHOW_KEYBOARD_SHORTCUTS": 0,
+    "android.intent.action.ACTION_SHOW_WORK_POLICY": 0,
+    "android.intent.action.ACTION_SYSTEM_LOCALE_CHANGED": 0,
+    "android.intent.action.UPGRADE_ASSISTANT": 0,
+    "android.intent.action.AUTO_FILL_SET_SERVICE": 0,
+    "android.intent.action.RESOLVE_ACTIVITY": 0,
+    "android.intent.action.NEXT": 0,
+    "android.intent.action.PREVIOUS": 0,
+    "android.intent.action.CLOSE_SYSTEM_DIALOGS": 0,
+    "android.intent.action.ALL_APPS": 0,
+    "android.intent.action.STK_INVOKE": 0,
+    "android.intent.action.STK_CC_OPEN": 0,
+    "android.intent.action.STK_CMD": 0,
+    "android.intent.action.STK_EVENT": 0,
+    "android.intent.action.DEVICE_LOCKED_CHANGED": 0,
+    "android.intent.action.PROFILE_PROVISIONING_COMPLETE": 0,
+    "android.intent.action.PROFILE_PROVISIONING_ERROR": 0,
+    "android.intent.action.PROVISIONING_REQUIRED": 0,
+    "android.intent.action.ACTION_SESSION_DETAILS": 0,
+    "android.intent.action.VIEW_INSTANT_APP": 0,
+    "android.intent.action.START_ACTIVITY_FROM_RECENTS": 0,
+    "android.intent.action.SHOW_RECENT_APPS": 0,
+    "android.intent.action.GLOBAL_BUTTON": 0,
+    "android.intent.action.KEYBOARD_RESOURCE_MAPPING": 0,
+    "android.intent.action.MEDIA_BUTTON": 0,
+    "android.intent.action.PRE_BOOT_COMPLETED": 0,
+    "android.intent.action.UMS_CONNECTED": 0,
+    "android.intent.action.UMS_DISCONNECTED": 0,
+    "android.intent.action.USER_INITIALIZE": 0,
+    "android.intent.action.USER_ADDED": 0,
+    "android.intent.action.USER_REMOVED": 0,
+    "android.intent.action.USER_STARTED": 0,
+    "android.intent.action.USER_STOPPED": 0,
+    "android.intent.action.USER_UNLOCKED": 0,
+    "android.intent.action.USER_BACKGROUND": 0,
+    "android.intent.action.USER_FOREGROUND": 0,
+    "android.intent.action.LOCKED_BOOT_COMPLETED": 0,
+    "android.intent.action.ACTION_PREFERRED_ACTIVITY_CHANGED": 0,
+    "android.intent.action.PACKAGE_DATA_CLEARED": 0,
+    "android.intent.action.PACKAGE_FULLY_SUSPENDED": 0,
+    "android.intent.action.PACKAGE_UNSUSPENDED": 0,
+    "android.intent.action.START_INSTRUMENTATION": 0,
+    "android.intent.action.FINISH_INSTRUMENTATION": 0,
+    "android.intent.action.GET_PREFERRED_APPLICATIONS": 0,
+    "android.intent.action.CLEAR_PREFERRED_APPLICATIONS": 0,
+    "android.intent.action.CHANGE_COMPONENT_ENABLED_STATE": 0,
+    "android.intent.action.SHOW_SUSPENDED_APP_DETAILS": 0,
+    "android.intent.action.REQUEST_OMNIFOCUS": 0,
+    "android.intent.action.DISMISS_KEYBOARD": 0,
+    "android.intent.action.SHOW_VOICE_INPUT_PICKER": 0,
+    "android.intent.action.PROCESS_WIDGETS": 0,
+    "android.intent.action.GET_CONTENT_WITH_PERMISSION": 0,
+    "android.intent.action.REVIEW_VOICE_INTERACTIONS": 0,
+    "android.intent.action.GET_RESTRICTION_ENTRIES": 0,
+    "android.intent.action.START_CAPTURE": 0,
+    "android.intent.action.STOP_CAPTURE": 0,
+    "android.intent.action.SHOW_APP_PREFERENCES": 0,
+    "android.intent.action.ENTER_CAR_MODE": 0,
+    "android.intent.action.EXIT_CAR_MODE": 0,
+    "android.intent.action.SET_MEDIA_PLAYBACK": 0,
+    "android.intent.action.PLAY_FROM_SEARCH": 0,
+    "android.intent.action.MEDIA_PLAY_FROM_SEARCH": 0,
+    "android.intent.action.MEDIA_PAUSE": 0,
+    "android.intent.action.MEDIA_PLAY": 0,
+    "android.intent.action.MEDIA_PLAY_FROM_URI": 0,
+    "android.intent.action.MEDIA_PREPARE": 0,
+    "android.intent.action.MEDIA_RECORD": 0,
+    "android.intent.action.MEDIA_STOP": 0,
+    "android.intent.action.MEDIA_STEP_BACKWARD": 0,
+    "android.intent.action.MEDIA_STEP_FORWARD": 0,
+    "android.intent.action.MEDIA_STEP_INTO": 0,
+    "android.intent.action.MEDIA_STEP_OUT": 0,
+    "android.intent.action.ACTION_PLAY_FROM_ID": 0,
+    "android.intent.action.ACTION_PLAY_FROM_INDEX": 0,
+    "android.intent.action.ACTION_CHANGE_VOLUME": 0,
+    "android.intent.action.ACTION_SET_PLAYBACK_SPEED": 0,
+    "android.intent.action.ACTION_SET_REPEAT_MODE": 0,
+    "android.intent.action.ACTION_HANDLE_MEDIA_KEY": 0,
+    "android.intent.action.ACTION_NOTIFY_SESSION_STATE_CHANGED": 0,
+    "android.intent.action.ACTION_SET_RINGTONE": 0,
+    "android.intent.action.RINGTONE_PICKER": 0,
+    "android.intent.action.ACTION_GET_SAMPLE_DATA": 0,
+    "android.intent.action.OPEN_DOCUMENT_SETTINGS": 0,
+    "android.intent.action.PRINT": 0,
+    "android.intent.action.PRINT_DOCUMENT": 0,
+    "android.intent.action.PRINT_WRITE": 0,
+    "android.intent.action.PRINT_JOB_QUEUED": 0,
+    "android.intent.action.PRINT_JOB_STATE_CHANGED": 0,
+    "android.intent.action.PRINT_SPOOLER_STARTED": 0,
+    "android.intent.action.PRINT_SPOOLER_STOPPED": 0,
+    "android.intent.action.VIEW_DOWNLOADS": 0,
+    "android.intent.action.DOWNLOAD_COMPLETE": 0,
+    "android.intent.action.DOWNLOAD_NOTIFICATION_CLICKED": 0,
+    "android.intent.action.RESTART_DOWNLOAD": 0,
+    "android.intent.action.ENQUEUE": 0,
+    "android.intent.action.PAUSE": 0,
+    "android.intent.action.PAUSE_ALL": 0,
+    "android.intent.action.RESUME": 0,
+    "android.intent.action.RESUME_ALL": 0,
+    "android.intent.action.CANCEL": 0,
+    "android.intent.action.HIDE": 0,
+    "android.intent.action.SHOW": 0,
+    "android.intent.action.MIME_TYPE_CHANGED": 0,
+    "android.intent.action.SYNC_STATUS_CHANGED": 0,
+    "android.intent.action.AUTHENTICATE": 0,
+    "android.intent.action.ACCOUNT_REMOVED": 0,
+    "android.intent.action.ADD_ACCOUNT": 0,
+    "android.intent.action.REQUEST_SYNC": 0,
+    "android.intent.action.SEND_MULTIPLE_SYNC": 0,
+    "android.intent.action.SEND_SYNC": 0,
+    "android.intent.action.SYNC_ERROR": 0,
+    "android.intent.action.DISCOVER": 0,
+    "android.intent.action.CREATE_ACTION": 0,
+    "android.intent.action.RECOGNIZE_SPEECH": 0,
+    "android.intent.action.GET_LANGUAGE_DETAILS": 0,
+    "android.intent.action.TRANSLATE": 0,
+    "android.intent.action.TRANSLATION_SERVICE": 0,
+    "android.intent.action.PROVIDE_DEFAULT_VOICE_INTERACTION_SERVICE": 0,
+    "android.intent.action.VOICE_ASSIST": 0,
+    "android.intent.action.LAUNCH_VOICE_SEARCH": 0,
+    "android.intent.action.REPORT_TEXT": 0,
+    "android.intent.action.SELECT_TEXT": 0,
+    "android.intent.action.SHOW_OR_HIDE_INPUT_METHOD": 0,
+    "android.intent.action.TOGGLE_INPUT_METHOD": 0,
+    "android.intent.action.PICK_KEYBOARD_LAYOUT": 0,
+    "android.intent.action.TOGGLE_INPUT": 0,
+    "android.intent.action.CLEAR_APP_CACHE": 0,
+    "android.intent.action.CLEAR_APP_DATA": 0,
+    "android.intent.action.CLEAR_APP_PREFERRED_SETTINGS": 0,
+    "android.intent.action.MANAGE_SPACE": 0,
+    "android.intent.action.MANAGE_SPACE_INTERNAL": 0,
+    "android.intent.action.MANAGE_APP_PERMISSIONS": 0,
+    "android.intent.action.MANAGE_DEFAULT_APPS_SETTINGS": 0,
+    "android.intent.action.MANAGE_ROLE_ACCESS": 0,
+    "android.intent.action.REQUEST_INSTALL_PACKAGES": 0,
+    "android.intent.action.VIEW_APP_DETAILS": 0,
+    "android.intent.action.REQUEST_DELETE_PACKAGES": 0,
+    "android.intent.action.REQUEST_SCAN_FILE": 0,
+    "android.intent.action.RESPOND_VIA_MESSAGE": 0,
+    "android.intent.action.SEND_MESSAGE": 0,
+    "android.intent.action.AUTO_SEND": 0,
+    "android.intent.action.ECM_CHANGED": 0,
+    "android.intent.action.ACTION_SHOW_CURRENT_PERMISSION_GRANTS": 0,
+    "android.intent.action.ACTION_VOICE_SESSION": 0,
+    "android.intent.action.DIAL_EMERGENCY": 0,
+    "android.intent.action.CALL_EMERGENCY": 0,
+    "android.intent.action.CONFIGURE_VOICEMAIL": 0,
+    "android.intent.action.CHECK_VOICEMAIL": 0,
+    "android.intent.action.ADD_VOICEMAIL": 0,
+    "android.intent.action.ACTION_ ক্যারি_ON_SUBSCRIPTION": 0,
+    "android.intent.action.ACTION_CONFIGURE_PHONE_ACCOUNT": 0,
+    "android.intent.action.ACTION_CHANGE_PHONE_ACCOUNT": 0,
+    "android.intent.action.ACTION_DISABLE_SELF_CALL": 0,
+    "android.intent.action.ACTION_SHOW_SUBSCRIPTION_SETTING": 0,
+    "android.intent.action.ACTION_MANAGE_SUBSCRIPTION_PLANS": 0,
+    "android.intent.action.ACTION_PERFORM_VOICE_CALL": 0,
+    "android.intent.action.ACTION_PERFORM_VIDEO_CALL": 0,
+    "android.intent.action.ACTION_PERFORM_IMS_CALL": 0,
+    "android.intent.action.ACTION_PERFORM_RTT_CALL": 0,
+    "android.intent.action.ACTION_SHOW_CALL_SCREEN": 0,
+    "android.intent.action.ACTION_SHOW_CALL_HISTORY": 0,
+    "android.intent.action.ACTION_ADD_CALL": 0,
+    "android.intent.action.ACTION_ANSWER": 0,
+    "android.intent.action.ACTION_ANSWER_VIDEO": 0,
+    "android.intent.action.ACTION_DECLINE": 0,
+    "android.intent.action.ACTION_HANG_UP": 0,
+    "android.intent.action.ACTION_CHANGE_DEFAULT": 0,
+    "android.intent.action.ACTION_CHANGE_DEFAULT_DIALER": 0,
+    "android.intent.action.ACTION_GET_DEFAULT_SUBSCRIPTION_ID": 0,
+    "android.intent.action.ACTION_SHOW_MISSED_CALLS": 0,
+    "android.intent.action.ACTION_PLUG_IN_MANAGED_PROFILE": 0,
+    "android.intent.action.ACTION_PROVISION_MANAGED_PROFILE": 0,
+    "android.intent.action.ACTION_INSTALL_PACKAGE_SESSION": 0,
+    "android.intent.action.ACTION_COMMIT_SESSION": 0,
+    "android.intent.action.ACTION_ABANDON_SESSION": 0,
+    "android.intent.action.ACTION_OPEN_APP_PERMISSION_SETTINGS": 0,
+    "android.intent.action.ACTION_REVIEW_PERMISSIONS": 0,
+    "android.intent.action.ACTION_APPLICATION_PREFERENCES": 0,
+    "android.intent.action.VIEW_CONTENT": 0,
+    "android.intent.action.EDIT_CONTENT": 0,
+    "android.intent.action.PICK_ACTIVITY": 0,
+    "android.intent.action.BROWSE": 0,
+    "android.intent.action.INSERT_CALENDAR_EVENT": 0,
+    "android.intent.action.INSERT_CONTACT": 0,
+    "android.intent.action.ADD_TO_HOME_SCREEN": 0,
+    "android.intent.action.INSTALL_SHORTCUT": 0,
+    "android.intent.action.UNINSTALL_SHORTCUT": 0,
+    "android.intent.action.DREAMING_STARTED": 0,
+    "android.intent.action.DREAMING_STOPPED": 0,
+    "android.intent.action.SCREEN_OFF": 0,
+    "android.intent.action.SCREEN_ON": 0,
+    "android.intent.action.ACTION_DOCK_EVENT": 0,
+    "android.intent.action.ACTION_HEADSET_PLUG": 0,
+    "android.intent.action.ACTION_NEW_OUTGOING_CALL": 0,
+    "android.intent.action.PHONE_STATE": 0,
+    "android.intent.action.ACTION_EXTERNAL_STORAGE_MOUNTED": 0,
+    "android.intent.action.ACTION_EXTERNAL_STORAGE_UNMOUNTED": 0,
+    "android.intent.action.ACTION_GTALK_SERVICE_CONNECTED": 0,
+    "android.intent.action.ACTION_GTALK_SERVICE_DISCONNECTED": 0,
+    "android.intent.action.INPUT_METHOD_CHANGED": 0,
+    "android.intent.action.NEW_PICTURE": 0,
+    "android.intent.action.NEW_VIDEO": 0,
+    "android.intent.action.PROVIDER_CHANGED": 0,
+    "android.intent.action.PROXY_CHANGE": 0,
+    "android.intent.action.REBOOT_REQUIRED": 0,
+    "android.intent.action.SEARCH_LONG_PRESS": 0
+}
+
+sentitive_apis_map = {
+    "getInputStream": 0,
+    "canChangeDtmfToneLength": 0,
+    "clearSignalStrengthUpdateRequest": 0,
+    "createForPhoneAccountHandle": 0,
+    "createForSubscriptionId": 0,
+    "doesSwitchMultiSimConfigTriggerReboot": 0,
+    "switchMultiSimConfig": 0,
+    "getActiveModemCount": 0,
+    "getAllCellInfo": 0,
+    "getAllowedNetworkTypesForReason": 0,
+    "getCallComposerStatus": 0,
+    "getCallState": 0,
+    "getCallStateForSubscription": 0,
+    "isInCall": 0,
+    "getCardIdForDefaultEuicc": 0,
+    "getCarrierConfig": 0,
+    "getCarrierIdFromSimMccMnc": 0,
+    "getSimOperator": 0,
+    "getCarrierRestrictionStatus": 0,
+    "getCellLocation": 0,
+    "getDataActivity": 0,
+    "getDataNetworkType": 0,
+    "getDataState": 0,
+    "getDeviceId": 0,
+    "getImei": 0,
+    "getMeid": 0,
+    "getDeviceSoftwareVersion": 0,
+    "getEmergencyNumberList": 0,
+    "getEquivalentHomePlmns": 0,
+    "getForbiddenPlmns": 0,
+    "getGroupIdLevel": 0,
+    "getIccAuthentication": 0,
+    "getLine": 0,
+    "getPhoneNumber": 0,
+    "getManualNetworkSelectionPlmn": 0,
+    "getManufacturerCode": 0,
+    "getMaximumCallComposerPictureSize": 0,
+    "getMmsUAProfUrl": 0,
+    "getMmsUserAgent": 0,
+    "getNai": 0,
+    "getNetworkCountryIso": 0,
+    "getNetworkOperator": 0,
+    "getNetworkOperatorName": 0,
+    "getNetworkSelectionMode": 0,
+    "getNetworkSlicingConfiguration": 0,
+    "getNetworkSpecifier": 0,
+    "getNetworkType": 0,
+    "getPhoneAccountHandle": 0,
+    "getPhoneCount": 0,
+    "getPhoneType": 0,
+    "getPreferredOpportunisticDataSubscription": 0,
+    "hasCarrierPrivileges": 0,
+    "getPrimaryImei": 0,
+    "getServiceState": 0,
+    "getSignalStrength": 0,
+    "getSimCarrierId": 0,
+    "getSimCarrierIdName": 0,
+    "getSimCountryIso": 0,
+    "getSimOperatorName": 0,
+    "getSimSerialNumber": 0,
+    "getSimSpecificCarrierId": 0,
+    "getSimSpecificCarrierIdName": 0,
+    "getSimState": 0,
+    "getSubscriberId": 0,
+    "getSubscriptionId": 0,
+    "getSupportedModemCount": 0,
+    "getSupportedRadioAccessFamily": 0,
+    "hasSystemFeature": 0,
+    "getTypeAllocationCode": 0,
+    "getUiccCardsInfo": 0,
+    "getVisualVoicemailPackageName": 0,
+    "getVoiceMailAlphaTag": 0,
+    "getVoiceMailNumber": 0,
+    "getVoiceNetworkType": 0,
+    "getVoicemailRingtoneUri": 0,
+    "hasIccCard": 0,
+    "iccCloseLogicalChannel": 0,
+    "iccExchangeSimIO": 0,
+    "iccOpenLogicalChannel": 0,
+    "iccTransmitApduBasicChannel": 0,
+    "iccTransmitApduLogicalChannel": 0,
+    "isConcurrentVoiceAndDataSupported": 0,
+    "isDataCapable": 0,
+    "isDataConnectionAllowed": 0,
+    "isDataEnabled": 0,
+    "isDataEnabledForReason": 0,
+    "isDataRoamingEnabled": 0,
+    "isDeviceSmsCapable": 0,
+    "isDeviceVoiceCapable": 0,
+    "isEmergencyNumber": 0,
+    "isHearingAidCompatibilitySupported": 0,
+    "isManualNetworkSelectionAllowed": 0,
+    "isModemEnabledForSlot": 0,
+    "isMultiSimSupported": 0,
+    "isNetworkRoaming": 0,
+    "isPremiumCapabilityAvailableForPurchase": 0,
+    "isRadioInterfaceCapabilitySupported": 0,
+    "isRttSupported": 0,
+    "isSmsCapable": 0,
+    "isTtyModeSupported": 0,
+    "isTtySupported": 0,
+    "isVoiceCapable": 0,
+    "isVoicemailVibrationEnabled": 0,
+    "isWorldPhone": 0,
+    "listen": 0,
+    "registerTelephonyCallback": 0,
+    "purchasePremiumCapability": 0,
+    "rebootModem": 0,
+    "requestCellInfoUpdate": 0,
+    "requestNetworkScan": 0,
+    "sendDialerSpecialCode": 0,
+    "sendEnvelopeWithStatus": 0,
+    "sendUssdRequest": 0,
+    "sendVisualVoicemailSms": 0,
+    "setAllowedNetworkTypesForReason": 0,
+    "setCallComposerStatus": 0,
+    "setDataEnabled": 0,
+    "setDataEnabledForReason": 0,
+    "setForbiddenPlmns": 0,
+    "setLine": 0,
+    "setCarrierPhoneNumber": 0,
+    "setNetworkSelectionModeAutomatic": 0,
+    "setNetworkSelectionModeManual": 0,
+    "setOperatorBrandOverride": 0,
+    "setPreferredNetworkTypeToGlobal": 0,
+    "setPreferredOpportunisticDataSubscription": 0,
+    "setSignalStrengthUpdateRequest": 0,
+    "setVisualVoicemailSmsFilterSettings": 0,
+    "setVoiceMailNumber": 0,
+    "setVoicemailRingtoneUri": 0,
+    "setVoicemailVibrationEnabled": 0,
+    "unregisterTelephonyCallback": 0,
+    "updateAvailableNetworks": 0,
+    "uploadCallComposerPicture": 0,
+    "createAppSpecificSmsToken": 0,
+    "createAppSpecificSmsTokenWithPackageInfo": 0,
+    "divideMessage": 0,
+    "downloadMultimediaMessage": 0,
+    "getDefault": 0,
+    "getCarrierConfigValues": 0,
+    "getSystemService": 0,
+    "getDefaultSmsSubscriptionId": 0,
+    "getSmsCapacityOnIcc": 0,
+    "getSmsManagerForSubscriptionId": 0,
+    "getSmsMessagesForFinancialApp": 0,
+    "getSmscAddress": 0,
+    "injectSmsPdu": 0,
+    "sendDataMessage": 0,
+    "sendMultimediaMessage": 0,
+    "sendMultipartTextMessage": 0,
+    "sendTextMessage": 0,
+    "sendTextMessageWithoutPersisting": 0,
+    "setSmscAddress": 0,
+    "addGpsStatusListener": 0,
+    "addNmeaListener": 0,
+    "addProximityAlert": 0,
+    "addTestProvider": 0,
+    "clearTestProviderEnabled": 0,
+    "clearTestProviderLocation": 0,
+    "clearTestProviderStatus": 0,
+    "getAllProviders": 0,
+    "getBestProvider": 0,
+    "getCurrentLocation": 0,
+    "getGnssAntennaInfos": 0,
+    "getGnssCapabilities": 0,
+    "getGnssHardwareModelName": 0,
+    "getGnssYearOfHardware": 0,
+    "getGpsStatus": 0,
+    "getLastKnownLocation": 0,
+    "getProvider": 0,
+    "getProviderProperties": 0,
+    "getProviders": 0,
+    "hasProvider": 0,
+    "isLocationEnabled": 0,
+    "isProviderEnabled": 0,
+    "registerAntennaInfoListener": 0,
+    "registerGnssMeasurementsCallback": 0,
+    "registerGnssNavigationMessageCallback": 0,
+    "registerGnssStatusCallback": 0,
+    "removeGpsStatusListener": 0,
+    "removeNmeaListener": 0,
+    "removeProximityAlert": 0,
+    "removeTestProvider": 0,
+    "removeUpdates": 0,
+    "requestFlush": 0,
+    "requestLocationUpdates": 0,
+    "requestSingleUpdate": 0,
+    "sendExtraCommand": 0,
+    "setTestProviderEnabled": 0,
+    "setTestProviderLocation": 0,
+    "setTestProviderStatus": 0,
+    "unregisterAntennaInfoListener": 0,
+    "unregisterGnssMeasurementsCallback": 0,
+    "unregisterGnssNavigationMessageCallback": 0,
+    "unregisterGnssStatusCallback": 0,
+    "abandonAudioFocus": 0,
+    "abandonAudioFocusRequest": 0,
+    "addOnActiveSessionsChangedListener": 0,
+    "addOnCommunicationDeviceChangedListener": 0,
+    "addOnModeChangedListener": 0,
+    "addOnPreferredMixerAttributesChangedListener": 0,
+    "adjustStreamVolume": 0,
+    "adjustSuggestedStreamVolume": 0,
+    "adjustVolume": 0,
+    "adjustVolumeGroupVolume": 0,
+    "clearCommunicationDevice": 0,
+    "clearPreferredMixerAttributes": 0,
+    "dispatchMediaKeyEvent": 0,
+    "generateAudioSessionId": 0,
+    "getActivePlaybackConfigurations": 0,
+    "getActiveRecordingConfigurations": 0,
+    "getAllowedCapturePolicy": 0,
+    "getAudioDevicesForAttributes": 0,
+    "getAudioHwSyncForSession": 0,
+    "getAvailableCommunicationDevices": 0,
+    "getCommunicationDevice": 0,
+    "getDevices": 0,
+    "getDirectPlaybackSupport": 0,
+    "getDirectProfilesForAttributes": 0,
+    "getEncodedSurroundMode": 0,
+    "getMicrophones": 0,
+    "getMode": 0,
+    "getParameters": 0,
+    "getPlaybackOffloadSupport": 0,
+    "getPreferredMixerAttributes": 0,
+    "getProperty": 0,
+    "getRingerMode": 0,
+    "getRouting": 0,
+    "getSpatializer": 0,
+    "getStreamMaxVolume": 0,
+    "getStreamMinVolume": 0,
+    "getStreamVolume": 0,
+    "getStreamVolumeDb": 0,
+    "getSupportedDeviceTypes": 0,
+    "getSupportedMixerAttributes": 0,
+    "getVibrateSetting": 0,
+    "getVolumeGroupIdForAttributes": 0,
+    "isBluetoothA": 0,
+    "isBluetoothScoAvailableOffCall": 0,
+    "isBluetoothScoOn": 0,
+    "isCallScreeningModeSupported": 0,
+    "isHapticPlaybackSupported": 0,
+    "isMicrophoneMute": 0,
+    "isMusicActive": 0,
+    "isOffloadedPlaybackSupported": 0,
+    "isRampingRingerEnabled": 0,
+    "isSpeakerphoneOn": 0,
+    "isStreamMute": 0,
+    "isSurroundFormatEnabled": 0,
+    "isVolumeFixed": 0,
+    "isVolumeGroupMuted": 0,
+    "isWiredHeadsetOn": 0,
+    "loadSoundEffects": 0,
+    "playSoundEffect": 0,
+    "registerAudioDeviceCallback": 0,
+    "registerAudioPlaybackCallback": 0,
+    "registerAudioRecordingCallback": 0,
+    "registerMediaButtonEventReceiver": 0,
+    "registerRemoteControlClient": 0,
+    "registerRemoteController": 0,
+    "removeOnCommunicationDeviceChangedListener": 0,
+    "removeOnModeChangedListener": 0,
+    "removeOnPreferredMixerAttributesChangedListener": 0,
+    "removeOnActiveSessionsChangedListener": 0,
+    "requestAudioFocus": 0,
+    "selectRoute": 0,
+    "setAllowedCapturePolicy": 0,
+    "setBluetoothA": 0,
+    "setBluetoothScoOn": 0,
+    "setCommunicationDevice": 0,
+    "setEncodedSurroundMode": 0,
+    "setMediaButtonReceiver": 0,
+    "setMicrophoneMute": 0,
+    "setMode": 0,
+    "setParameters": 0,
+    "setPreferredMixerAttributes": 0,
+    "setRingerMode": 0,
+    "setRouting": 0,
+    "setSpeakerphoneOn": 0,
+    "setStreamMute": 0,
+    "setStreamSolo": 0,
+    "setStreamVolume": 0,
+    "setSurroundFormatEnabled": 0,
+    "setVibrateSetting": 0,
+    "setWiredHeadsetOn": 0,
+    "shouldVibrate": 0,
+    "startBluetoothSco": 0,
+    "stopBluetoothSco": 0,
+    "unloadSoundEffects": 0,
+    "unregisterAudioDeviceCallback": 0,
+    "unregisterAudioPlaybackCallback": 0,
+    "unregisterAudioRecordingCallback": 0,
+    "unregisterMediaButtonEventReceiver": 0,
+    "unregisterRemoteControlClient": 0,
+    "unregisterRemoteController": 0,
+    "disconnect": 0,
+    "getErrorStream": 0,
+    "getFollowRedirects": 0,
+    "getHeaderField": 0,
+    "getHeaderFieldDate": 0,
+    "getHeaderFieldKey": 0,
+    "getInstanceFollowRedirects": 0,
+    "getPermission": 0,
+    "getRequestMethod": 0,
+    "getResponseCode": 0,
+    "getResponseMessage": 0,
+    "setChunkedStreamingMode": 0,
+    "setFixedLengthStreamingMode": 0,
+    "setFollowRedirects": 0,
+    "setInstanceFollowRedirects": 0,
+    "setRequestMethod": 0,
+    "usingProxy": 0,
+    "addDefaultNetworkActiveListener": 0,
+    "bindProcessToNetwork": 0,
+    "bindSocket": 0,
+    "createSocketKeepalive": 0,
+    "getActiveNetwork": 0,
+    "getActiveNetworkInfo": 0,
+    "getAllNetworkInfo": 0,
+    "getAllNetworks": 0,
+    "getBackgroundDataSetting": 0,
+    "getBoundNetworkForProcess": 0,
+    "getConnectionOwnerUid": 0,
+    "getDefaultProxy": 0,
+    "getLinkProperties": 0,
+    "getMultipathPreference": 0,
+    "getNetworkCapabilities": 0,
+    "getNetworkInfo": 0,
+    "getNetworkPreference": 0,
+    "getNetworkWatchlistConfigHash": 0,
+    "getProcessDefaultNetwork": 0,
+    "getRestrictBackgroundStatus": 0,
+    "isActiveNetworkMetered": 0,
+    "isDefaultNetworkActive": 0,
+    "isNetworkTypeValid": 0,
+    "openConnection": 0,
+    "registerBestMatchingNetworkCallback": 0,
+    "registerDefaultNetworkCallback": 0,
+    "registerNetworkCallback": 0,
+    "releaseNetworkRequest": 0,
+    "removeDefaultNetworkActiveListener": 0,
+    "reportBadNetwork": 0,
+    "reportNetworkConnectivity": 0,
+    "requestBandwidthUpdate": 0,
+    "requestNetwork": 0,
+    "reserveNetwork": 0,
+    "setIncludeOtherUidNetworks": 0,
+    "setNetworkPreference": 0,
+    "setProcessDefaultNetwork": 0,
+    "unregisterNetworkCallback": 0,
+    "abortBroadcast": 0,
+    "clearAbortBroadcast": 0,
+    "getAbortBroadcast": 0,
+    "getDebugUnregister": 0,
+    "getResultCode": 0,
+    "getResultData": 0,
+    "getResultExtras": 0,
+    "getSentFromPackage": 0,
+    "getSentFromUid": 0,
+    "goAsync": 0,
+    "isInitialStickyBroadcast": 0,
+    "isOrderedBroadcast": 0,
+    "onReceive": 0,
+    "peekService": 0,
+    "registerReceiver": 0,
+    "sendOrderedBroadcast": 0,
+    "setDebugUnregister": 0,
+    "setOrderedHint": 0,
+    "setResult": 0,
+    "setResultCode": 0,
+    "setResultData": 0,
+    "setResultExtras": 0,
+    "doFinal": 0,
+    "getAlgorithm": 0,
+    "getBlockSize": 0,
+    "getExemptionMechanism": 0,
+    "getIV": 0,
+    "getInstance": 0,
+    "getMaxAllowedKeyLength": 0,
+    "getMaxAllowedParameterSpec": 0,
+    "getOutputSize": 0,
+    "init": 0,
+    "unwrap": 0,
+    "update": 0,
+    "updateAAD": 0,
+    "wrap": 0,
+    "getAnnotation": 0,
+    "getAnnotations": 0,
+    "getAnnotationsByType": 0,
+    "getDeclaredAnnotation": 0,
+    "getDeclaredAnnotations": 0,
+    "getDeclaredAnnotationsByType": 0,
+    "isAccessible": 0,
+    "isAnnotationPresent": 0,
+    "setAccessible": 0,
+    "addPackageToPreferred": 0,
+    "resolveActivity": 0,
+    "queryIntentActivities": 0,
+    "addPermission": 0,
+    "addPermissionAsync": 0,
+    "addPreferredActivity": 0,
+    "addWhitelistedRestrictedPermission": 0,
+    "canPackageQuery": 0,
+    "canRequestPackageInstalls": 0,
+    "canonicalToCurrentPackageNames": 0,
+    "checkPermission": 0,
+    "checkSignatures": 0,
+    "clearInstantAppCookie": 0,
+    "clearPackagePreferredActivities": 0,
+    "currentToCanonicalPackageNames": 0,
+    "extendVerificationTimeout": 0,
+    "getActivityBanner": 0,
+    "getActivityIcon": 0,
+    "getActivityInfo": 0,
+    "getActivityLogo": 0,
+    "getAllPermissionGroups": 0,
+    "getApplicationBanner": 0,
+    "getApplicationEnabledSetting": 0,
+    "getApplicationIcon": 0,
+    "getApplicationInfo": 0,
+    "getApplicationLabel": 0,
+    "getApplicationLogo": 0,
+    "getArchivedPackage": 0,
+    "getBackgroundPermissionOptionLabel": 0,
+    "getChangedPackages": 0,
+    "getComponentEnabledSetting": 0,
+    "getDefaultActivityIcon": 0,
+    "getDrawable": 0,
+    "getGroupOfPlatformPermission": 0,
+    "getInstallSourceInfo": 0,
+    "getInstalledApplications": 0,
+    "getInstalledModules": 0,
+    "getInstalledPackages": 0,
+    "getInstallerPackageName": 0,
+    "getInstantAppCookie": 0,
+    "getInstantAppCookieMaxBytes": 0,
+    "getInstrumentationInfo": 0,
+    "getLaunchIntentForPackage": 0,
+    "getLaunchIntentSenderForPackage": 0,
+    "getLeanbackLaunchIntentForPackage": 0,
+    "getMimeGroup": 0,
+    "getModuleInfo": 0,
+    "getNameForUid": 0,
+    "getPackageArchiveInfo": 0,
+    "getPackageGids": 0,
+    "getPackageInfo": 0,
+    "getPackageInstaller": 0,
+    "getPackageUid": 0,
+    "getPackagesForUid": 0,
+    "getPackagesHoldingPermissions": 0,
+    "getPermissionGroupInfo": 0,
+    "getPermissionInfo": 0,
+    "getPlatformPermissionsForGroup": 0,
+    "getPreferredActivities": 0,
+    "getPreferredPackages": 0,
+    "getProviderInfo": 0,
+    "getReceiverInfo": 0,
+    "getResourcesForActivity": 0,
+    "getResourcesForApplication": 0,
+    "getServiceInfo": 0,
+    "getSharedLibraries": 0,
+    "getSuspendedPackageAppExtras": 0,
+    "getSyntheticAppDetailsActivityEnabled": 0,
+    "getSystemAvailableFeatures": 0,
+    "getSystemSharedLibraryNames": 0,
+    "getTargetSdkVersion": 0,
+    "getText": 0,
+    "getUserBadgedDrawableForDensity": 0,
+    "getUserBadgedIcon": 0,
+    "getUserBadgedLabel": 0,
+    "getVerifiedSigningInfo": 0,
+    "getWhitelistedRestrictedPermissions": 0,
+    "getXml": 0,
+    "hasSigningCertificate": 0,
+    "isAppArchivable": 0,
+    "isAutoRevokeWhitelisted": 0,
+    "isDefaultApplicationIcon": 0,
+    "isDeviceUpgrading": 0,
+    "isInstantApp": 0,
+    "isPackageStopped": 0,
+    "isPackageSuspended": 0,
+    "isPermissionRevokedByPolicy": 0,
+    "isSafeMode": 0,
+    "parseAndroidManifest": 0,
+    "queryActivityProperty": 0,
+    "queryApplicationProperty": 0,
+    "queryBroadcastReceivers": 0,
+    "queryContentProviders": 0,
+    "queryInstrumentation": 0,
+    "queryIntentActivityOptions": 0,
+    "queryIntentContentProviders": 0,
+    "queryIntentServices": 0,
+    "queryPermissionsByGroup": 0,
+    "queryProviderProperty": 0,
+    "queryReceiverProperty": 0,
+    "queryServiceProperty": 0,
+    "relinquishUpdateOwnership": 0,
+    "removePackageFromPreferred": 0,
+    "removePermission": 0,
+    "removeWhitelistedRestrictedPermission": 0,
+    "requestChecksums": 0,
+    "resolveContentProvider": 0,
+    "resolveService": 0,
+    "setApplicationCategoryHint": 0,
+    "setApplicationEnabledSetting": 0,
+    "setAutoRevokeWhitelisted": 0,
+    "setComponentEnabledSetting": 0,
+    "setComponentEnabledSettings": 0,
+    "setInstallerPackageName": 0,
+    "setMimeGroup": 0,
+    "updateInstantAppCookie": 0,
+    "verifyPendingInstall": 0,
+}
+
+# Full permission name -> column of the permission vector
+permission_index = {"android.permission." + key: key for key in permissions}
+
+permission_tags = {'uses-permission', 'uses-permission-sdk-23'}
+
+# Value of an intent action found in an <intent-filter> of each component type
+component_intent_codes = {'activity': 10, 'receiver': 11, 'service': 12}
+
+ANDROID_NAME = '{http://schemas.android.com/apk/res/android}name'
+
+# List containing the names of all the sensitive API classes.
+sensitive_api = ['TelephonyManager', 'SmsManager', 'LocationManager', 'AudioManager', 'HttpURLConnection',
+                 'ConnectivityManager', 'BroadcastReceiver', 'Cipher', 'AccessibleObject', 'PackageManager']
+
+sensitive_api_classes = set(sensitive_api)
+
+# sentitive_apis_map lists the methods class by class: the first method of every
+# class and the type descriptors the methods are called through.
+sensitive_api_class_groups = [
+    ("getInputStream", ["Ljava/net/HttpURLConnection;"]),
+    ("canChangeDtmfToneLength", ["Landroid/telephony/TelephonyManager;"]),
+    ("createAppSpecificSmsToken", ["Landroid/telephony/SmsManager;", "Landroid/telephony/gsm/SmsManager;"]),
+    ("addGpsStatusListener", ["Landroid/location/LocationManager;"]),
+    ("abandonAudioFocus", ["Landroid/media/AudioManager;"]),
+    ("disconnect", ["Ljava/net/HttpURLConnection;"]),
+    ("addDefaultNetworkActiveListener", ["Landroid/net/ConnectivityManager;"]),
+    ("abortBroadcast", ["Landroid/content/BroadcastReceiver;"]),
+    ("doFinal", ["Ljavax/crypto/Cipher;"]),
+    ("getAnnotation", ["Ljava/lang/reflect/AccessibleObject;"]),
+    ("addPackageToPreferred", ["Landroid/content/pm/PackageManager;"]),
+]
+
+# Vocabulary keys that stand for methods with a digit in their name
+sensitive_api_aliases = {
+    "getLine": ["getLine1Number", "getLine1AlphaTag"],
+    "setLine": ["setLine1NumberForDisplay"],
+    "getGroupIdLevel": ["getGroupIdLevel1"],
+    "isBluetoothA": ["isBluetoothA2dpOn"],
+    "setBluetoothA": ["setBluetoothA2dpOn"],
+}
+
+
+def build_sensitive_api_signatures():
+    """
+    Builds the lookup table from a qualified method signature, e.g.
+    'Landroid/telephony/TelephonyManager;->getDeviceId', to its key in sentitive_apis_map.
+    """
+    group_starts = dict(sensitive_api_class_groups)
+    signatures = {}
+    class_names = []
+    for key in sentitive_apis_map:
+        class_names = group_starts.get(key, class_names)
+        for class_name in class_names:
+            for method in [key] + sensitive_api_aliases.get(key, []):
+                signatures[f"{class_name}->{method}"] = key
+    # PackageManager.hasSystemFeature is listed among the TelephonyManager methods
+    signatures["Landroid/content/pm/PackageManager;->hasSystemFeature"] = "hasSystemFeature"
+    return signatures
+
+
+sensitive_api_signatures = build_sensitive_api_signatures()
+
+# Type descriptors of the classes in sensitive_api_signatures, e.g. 'Landroid/telephony/TelephonyManager;'
+sensitive_api_descriptors = {signature.split('->', 1)[0] for signature in sensitive_api_signatures}
+
+
+def extract_manifests(directory, filenames=None, workdir="./", timeout=None):
+    """
+    Runs apktool on the APKs of the directory and copies every decoded
+    AndroidManifest.xml to <workdir>/manifests/. A run that takes longer
+    than timeout seconds is killed.
+    """
+    manifests_dir = os.path.join(workdir, "manifests")
+    os.makedirs(manifests_dir, exist_ok=True)
+    if filenames is None:
+        filenames = os.listdir(directory)
+    for filename in filenames:
         # Get the full filepath for running the command
         filepath = os.path.join(directory, filename)
 
@@ -33,18 +1246,18 @@ def extract_manifests(directory):
             # Run the external command on the file
             try:
                 # Build up command to unpack APK
-                command = ['java', '-jar', './apktool.jar', 'd', '-o', "./apkd/" + filename, filepath]
+                output_dir = os.path.join(workdir, "apkd", filename)
+                command = ['java', '-jar', './apktool.jar', 'd', '-o', output_dir, filepath]
 
                 # Modify the command to run the process
-                result = subprocess.run(command, check=True, capture_output=True, text=True)
+                result = subprocess.run(command, check=True, capture_output=True, text=True, timeout=timeout or None)
 
                 # Optionally, you can handle the command's output here
                 print(f"Command output: {result.stdout}")
-                output_dir = "./apkd/" + filename
                 manifest_path = os.path.join(output_dir, 'AndroidManifest.xml')
                 if os.path.isfile(manifest_path):
                     # Define the destination path for the manifest file
-                    manifest_dest = os.path.join("./manifests/", f"{filename.replace('.apk', '')}_AndroidManifest.xml")
+                    manifest_dest = os.path.join(manifests_dir, f"{filename.replace('.apk', '')}_AndroidManifest.xml")
 
                     # Copy the manifest file to the manifests directory
                     shutil.copy(manifest_path, manifest_dest)
@@ -52,13 +1265,27 @@ def extract_manifests(directory):
                 else:
                     print(f"AndroidManifest.xml not found in: {output_dir}")
 
+            except subprocess.TimeoutExpired:
+                print(f"Killed the apktool decode of {filepath} after {timeout}s")
             except subprocess.CalledProcessError as e:
                 print(f"Error running command on {filepath}: {e.stderr}")
 
 
-def extract_callgraph(directory):
-    os.makedirs("./callgraphs/", exist_ok=True)
-    for filename in os.listdir(directory):
+def extract_callgraph(directory, filenames=None, workdir="./", timeout=None, memory_limit=None):
+    """
+    Runs 'androguard cg' on the APKs of the directory and copies every
+    callgraph.gml to <workdir>/callgraphs/. A run that takes longer than
+    timeout seconds is killed, memory_limit caps its address space in MB.
+
+    Returns:
+        list: The filenames whose run exceeded the time or memory budget.
+    """
+    callgraphs_dir = os.path.join(workdir, "callgraphs")
+    os.makedirs(callgraphs_dir, exist_ok=True)
+    if filenames is None:
+        filenames = os.listdir(directory)
+    exceeded = []
+    for filename in filenames:
         # Get the full filepath for running the command
         filepath = os.path.join(directory, filename)
 
@@ -69,17 +1296,18 @@ def extract_callgraph(directory):
             # Run the external command on the file
             try:
                 # Build up command to unpack APK
-                command = ['androguard', 'cg', filepath]
+                command = ['androguard', 'cg', os.path.abspath(filepath)]
 
-                # Modify the command to run the process
-                result = subprocess.run(command, check=True, capture_output=True, text=True)
+                # androguard always writes callgraph.gml into its working directory
+                result = subprocess.run(analysis_budget.memory_limited_command(command, memory_limit), check=True,
+                                        capture_output=True, text=True, cwd=workdir, timeout=timeout or None)
 
                 # Optionally, you can handle the command's output here
                 print(f"Command output: {result.stdout}")
-                callgraph_path = os.path.join("./", 'callgraph.gml')
+                callgraph_path = os.path.join(workdir, 'callgraph.gml')
                 if os.path.isfile(callgraph_path):
                     # Define the destination path for the manifest file
-                    callgraph_dest = os.path.join("./callgraphs/", f"{filename.replace('.apk', '')}_callgraph.gml")
+                    callgraph_dest = os.path.join(callgraphs_dir, f"{filename.replace('.apk', '')}_callgraph.gml")
 
                     # Copy the manifest file to the manifests directory
                     shutil.copy(callgraph_path, callgraph_dest)
@@ -87,1315 +1315,535 @@ def extract_callgraph(directory):
                 else:
                     print(f"callgraph.cg not found in: {directory}")
 
+            except subprocess.TimeoutExpired:
+                print(f"Killed the callgraph extraction of {filepath} after {timeout}s")
+                exceeded.append(filename)
             except subprocess.CalledProcessError as e:
                 print(f"Error running command on {filepath}: {e.stderr}")
+                if memory_limit and "MemoryError" in (e.stderr or ""):
+                    exceeded.append(filename)
+    return exceeded
 
 
-def extract_permissions():
-    """
-        Parses an AndroidManifest.xml file and returns a dictionary
-        indicating the presence of permissions.
-
-        Returns:
-            dict: A dictionary where keys are common intent action strings
-                  and values are 1 if the action is found in the manifest
-                  within an <intent-filter>, and 0 otherwise.
-    """
-    directory = './manifests/'
-    permissions = {
-        "ACCEPT_HANDOVER": 0,
-        "ACCESS_BACKGROUND_LOCATION": 0,
-        "ACCESS_BLOBS_ACROSS_USERS": 0,
-        "ACCESS_CHECKIN_PROPERTIES": 0,
-        "ACCESS_COARSE_LOCATION": 0,
-        "ACCESS_FINE_LOCATION": 0,
-        "ACCESS_HIDDEN_PROFILES": 0,
-        "ACCESS_LOCATION_EXTRA_COMMANDS": 0,
-        "ACCESS_MEDIA_LOCATION": 0,
-        "ACCESS_NETWORK_STATE": 0,
-        "ACCESS_NOTIFICATION_POLICY": 0,
-        "ACCESS_WIFI_STATE": 0,
-        "ACCOUNT_MANAGER": 0,
-        "ACTIVITY_RECOGNITION": 0,
-        "ADD_VOICEMAIL": 0,
-        "ANSWER_PHONE_CALLS": 0,
-        "APPLY_PICTURE_PROFILE": 0,
-        "BATTERY_STATS": 0,
-        "BIND_ACCESSIBILITY_SERVICE": 0,
-        "BIND_APPWIDGET": 0,
-        "BIND_APP_FUNCTION_SERVICE": 0,
-        "BIND_AUTOFILL_SERVICE": 0,
-        "BIND_CALL_REDIRECTION_SERVICE": 0,
-        "BIND_CARRIER_MESSAGING_CLIENT_SERVICE": 0,
-        "BIND_CARRIER_MESSAGING_SERVICE": 0,
-        "BIND_CARRIER_SERVICES": 0,
-        "BIND_CHOOSER_TARGET_SERVICE": 0,
-        "BIND_COMPANION_DEVICE_SERVICE": 0,
-        "BIND_CONDITION_PROVIDER_SERVICE": 0,
-        "BIND_CONTROLS": 0,
-        "BIND_CREDENTIAL_PROVIDER_SERVICE": 0,
-        "BIND_DEVICE_ADMIN": 0,
-        "BIND_DREAM_SERVICE": 0,
-        "BIND_INCALL_SERVICE": 0,
-        "BIND_INPUT_METHOD": 0,
-        "BIND_MIDI_DEVICE_SERVICE": 0,
-        "BIND_NFC_SERVICE": 0,
-        "BIND_NOTIFICATION_LISTENER_SERVICE": 0,
-        "BIND_PRINT_SERVICE": 0,
-        "BIND_QUICK_ACCESS_WALLET_SERVICE": 0,
-        "BIND_QUICK_SETTINGS_TILE": 0,
-        "BIND_REMOTEVIEWS": 0,
-        "BIND_SCREENING_SERVICE": 0,
-        "BIND_TELECOM_CONNECTION_SERVICE": 0,
-        "BIND_TEXT_SERVICE": 0,
-        "BIND_TV_AD_SERVICE": 0,
-        "BIND_TV_INPUT": 0,
-        "BIND_TV_INTERACTIVE_APP": 0,
-        "BIND_VISUAL_VOICEMAIL_SERVICE": 0,
-        "BIND_VOICE_INTERACTION": 0,
-        "BIND_VPN_SERVICE": 0,
-        "BIND_VR_LISTENER_SERVICE": 0,
-        "BIND_WALLPAPER": 0,
-        "BLUETOOTH": 0,
-        "BLUETOOTH_ADMIN": 0,
-        "BLUETOOTH_ADVERTISE": 0,
-        "BLUETOOTH_CONNECT": 0,
-        "BLUETOOTH_PRIVILEGED": 0,
-        "BLUETOOTH_SCAN": 0,
-        "BODY_SENSORS": 0,
-        "BODY_SENSORS_BACKGROUND": 0,
-        "BROADCAST_PACKAGE_REMOVED": 0,
-        "BROADCAST_SMS": 0,
-        "BROADCAST_STICKY": 0,
-        "BROADCAST_WAP_PUSH": 0,
-        "CALL_COMPANION_APP": 0,
-        "CALL_PHONE": 0,
-        "CALL_PRIVILEGED": 0,
-        "CAMERA": 0,
-        "CAPTURE_AUDIO_OUTPUT": 0,
-        "CHANGE_COMPONENT_ENABLED_STATE": 0,
-        "CHANGE_CONFIGURATION": 0,
-        "CHANGE_NETWORK_STATE": 0,
-        "CHANGE_WIFI_MULTICAST_STATE": 0,
-        "CHANGE_WIFI_STATE": 0,
-        "CLEAR_APP_CACHE": 0,
-        "CONFIGURE_WIFI_DISPLAY": 0,
-        "CONTROL_LOCATION_UPDATES": 0,
-        "CREDENTIAL_MANAGER_QUERY_CANDIDATE_CREDENTIALS": 0,
-        "CREDENTIAL_MANAGER_SET_ALLOWED_PROVIDERS": 0,
-        "CREDENTIAL_MANAGER_SET_ORIGIN": 0,
-        "DELETE_CACHE_FILES": 0,
-        "DELETE_PACKAGES": 0,
-        "DELIVER_COMPANION_MESSAGES": 0,
-        "DETECT_SCREEN_CAPTURE": 0,
-        "DETECT_SCREEN_RECORDING": 0,
-        "DIAGNOSTIC": 0,
-        "DISABLE_KEYGUARD": 0,
-        "DUMP": 0,
-        "ENFORCE_UPDATE_OWNERSHIP": 0,
-        "EXECUTE_APP_ACTION": 0,
-        "EXECUTE_APP_FUNCTIONS": 0,
-        "EXPAND_STATUS_BAR": 0,
-        "FACTORY_TEST": 0,
-        "FOREGROUND_SERVICE": 0,
-        "FOREGROUND_SERVICE_CAMERA": 0,
-        "FOREGROUND_SERVICE_CONNECTED_DEVICE": 0,
-        "FOREGROUND_SERVICE_DATA_SYNC": 0,
-        "FOREGROUND_SERVICE_HEALTH": 0,
-        "FOREGROUND_SERVICE_LOCATION": 0,
-        "FOREGROUND_SERVICE_MEDIA_PLAYBACK": 0,
-        "FOREGROUND_SERVICE_MEDIA_PROCESSING": 0,
-        "FOREGROUND_SERVICE_MEDIA_PROJECTION": 0,
-        "FOREGROUND_SERVICE_MICROPHONE": 0,
-        "FOREGROUND_SERVICE_PHONE_CALL": 0,
-        "FOREGROUND_SERVICE_REMOTE_MESSAGING": 0,
-        "FOREGROUND_SERVICE_SPECIAL_USE": 0,
-        "FOREGROUND_SERVICE_SYSTEM_EXEMPTED": 0,
-        "GET_ACCOUNTS": 0,
-        "GET_ACCOUNTS_PRIVILEGED": 0,
-        "GET_PACKAGE_SIZE": 0,
-        "GET_TASKS": 0,
-        "GLOBAL_SEARCH": 0,
-        "HIDE_OVERLAY_WINDOWS": 0,
-        "HIGH_SAMPLING_RATE_SENSORS": 0,
-        "INSTALL_LOCATION_PROVIDER": 0,
-        "INSTALL_PACKAGES": 0,
-        "INSTALL_SHORTCUT": 0,
-        "INSTANT_APP_FOREGROUND_SERVICE": 0,
-        "INTERACT_ACROSS_PROFILES": 0,
-        "INTERNET": 0,
-        "KILL_BACKGROUND_PROCESSES": 0,
-        "LAUNCH_CAPTURE_CONTENT_ACTIVITY_FOR_NOTE": 0,
-        "LAUNCH_MULTI_PANE_SETTINGS_DEEP_LINK": 0,
-        "LOADER_USAGE_STATS": 0,
-        "LOCATION_HARDWARE": 0,
-        "MANAGE_DEVICE_LOCK_STATE": 0,
-        "MANAGE_DEVICE_POLICY_ACCESSIBILITY": 0,
-        "MANAGE_DEVICE_POLICY_ACCOUNT_MANAGEMENT": 0,
-        "MANAGE_DEVICE_POLICY_ACROSS_USERS": 0,
-        "MANAGE_DEVICE_POLICY_ACROSS_USERS_FULL": 0,
-        "MANAGE_DEVICE_POLICY_ACROSS_USERS_SECURITY_CRITICAL": 0,
-        "MANAGE_DEVICE_POLICY_AIRPLANE_MODE": 0,
-        "MANAGE_DEVICE_POLICY_APPS_CONTROL": 0,
-        "MANAGE_DEVICE_POLICY_APP_FUNCTIONS": 0,
-        "MANAGE_DEVICE_POLICY_APP_RESTRICTIONS": 0,
-        "MANAGE_DEVICE_POLICY_APP_USER_DATA": 0,
-        "MANAGE_DEVICE_POLICY_ASSIST_CONTENT": 0,
-        "MANAGE_DEVICE_POLICY_AUDIO_OUTPUT": 0,
-        "MANAGE_DEVICE_POLICY_AUTOFILL": 0,
-        "MANAGE_DEVICE_POLICY_BACKUP_SERVICE": 0,
-        "MANAGE_DEVICE_POLICY_BLOCK_UNINSTALL": 0,
-        "MANAGE_DEVICE_POLICY_BLUETOOTH": 0,
-        "MANAGE_DEVICE_POLICY_BUGREPORT": 0,
-        "MANAGE_DEVICE_POLICY_CALLS": 0,
-        "MANAGE_DEVICE_POLICY_CAMERA": 0,
-        "MANAGE_DEVICE_POLICY_CAMERA_TOGGLE": 0,
-        "MANAGE_DEVICE_POLICY_CERTIFICATES": 0,
-        "MANAGE_DEVICE_POLICY_COMMON_CRITERIA_MODE": 0,
-        "MANAGE_DEVICE_POLICY_CONTENT_PROTECTION": 0,
-        "MANAGE_DEVICE_POLICY_DEBUGGING_FEATURES": 0,
-        "MANAGE_DEVICE_POLICY_DEFAULT_SMS": 0,
-        "MANAGE_DEVICE_POLICY_DEVICE_IDENTIFIERS": 0,
-        "MANAGE_DEVICE_POLICY_DISPLAY": 0,
-        "MANAGE_DEVICE_POLICY_FACTORY_RESET": 0,
-        "MANAGE_DEVICE_POLICY_FUN": 0,
-        "MANAGE_DEVICE_POLICY_INPUT_METHODS": 0,
-        "MANAGE_DEVICE_POLICY_INSTALL_UNKNOWN_SOURCES": 0,
-        "MANAGE_DEVICE_POLICY_KEEP_UNINSTALLED_PACKAGES": 0,
-        "MANAGE_DEVICE_POLICY_KEYGUARD": 0,
-        "MANAGE_DEVICE_POLICY_LOCALE": 0,
-        "MANAGE_DEVICE_POLICY_LOCATION": 0,
-        "MANAGE_DEVICE_POLICY_LOCK": 0,
-        "MANAGE_DEVICE_POLICY_LOCK_CREDENTIALS": 0,
-        "MANAGE_DEVICE_POLICY_LOCK_TASK": 0,
-        "MANAGE_DEVICE_POLICY_MANAGED_SUBSCRIPTIONS": 0,
-        "MANAGE_DEVICE_POLICY_METERED_DATA": 0,
-        "MANAGE_DEVICE_POLICY_MICROPHONE": 0,
-        "MANAGE_DEVICE_POLICY_MICROPHONE_TOGGLE": 0,
-        "MANAGE_DEVICE_POLICY_MOBILE_NETWORK": 0,
-        "MANAGE_DEVICE_POLICY_MODIFY_USERS": 0,
-        "MANAGE_DEVICE_POLICY_MTE": 0,
-        "MANAGE_DEVICE_POLICY_NEARBY_COMMUNICATION": 0,
-        "MANAGE_DEVICE_POLICY_NETWORK_LOGGING": 0,
-        "MANAGE_DEVICE_POLICY_ORGANIZATION_IDENTITY": 0,
-        "MANAGE_DEVICE_POLICY_OVERRIDE_APN": 0,
-        "MANAGE_DEVICE_POLICY_PACKAGE_STATE": 0,
-        "MANAGE_DEVICE_POLICY_PHYSICAL_MEDIA": 0,
-        "MANAGE_DEVICE_POLICY_PRINTING": 0,
-        "MANAGE_DEVICE_POLICY_PRIVATE_DNS": 0,
-        "MANAGE_DEVICE_POLICY_PROFILES": 0,
-        "MANAGE_DEVICE_POLICY_PROFILE_INTERACTION": 0,
-        "MANAGE_DEVICE_POLICY_PROXY": 0,
-        "MANAGE_DEVICE_POLICY_QUERY_SYSTEM_UPDATES": 0,
-        "MANAGE_DEVICE_POLICY_RESET_PASSWORD": 0,
-        "MANAGE_DEVICE_POLICY_RESTRICT_PRIVATE_DNS": 0,
-        "MANAGE_DEVICE_POLICY_RUNTIME_PERMISSIONS": 0,
-        "MANAGE_DEVICE_POLICY_RUN_IN_BACKGROUND": 0,
-        "MANAGE_DEVICE_POLICY_SAFE_BOOT": 0,
-        "MANAGE_DEVICE_POLICY_SCREEN_CAPTURE": 0,
-        "MANAGE_DEVICE_POLICY_SCREEN_CONTENT": 0,
-        "MANAGE_DEVICE_POLICY_SECURITY_LOGGING": 0,
-        "MANAGE_DEVICE_POLICY_SETTINGS": 0,
-        "MANAGE_DEVICE_POLICY_SMS": 0,
-        "MANAGE_DEVICE_POLICY_STATUS_BAR": 0,
-        "MANAGE_DEVICE_POLICY_SUPPORT_MESSAGE": 0,
-        "MANAGE_DEVICE_POLICY_SUSPEND_PERSONAL_APPS": 0,
-        "MANAGE_DEVICE_POLICY_SYSTEM_APPS": 0,
-        "MANAGE_DEVICE_POLICY_SYSTEM_DIALOGS": 0,
-        "MANAGE_DEVICE_POLICY_SYSTEM_UPDATES": 0,
-        "MANAGE_DEVICE_POLICY_THREAD_NETWORK": 0,
-        "MANAGE_DEVICE_POLICY_TIME": 0,
-        "MANAGE_DEVICE_POLICY_USB_DATA_SIGNALLING": 0,
-        "MANAGE_DEVICE_POLICY_USB_FILE_TRANSFER": 0,
-        "MANAGE_DEVICE_POLICY_USERS": 0,
-        "MANAGE_DEVICE_POLICY_VPN": 0,
-        "MANAGE_DEVICE_POLICY_WALLPAPER": 0,
-        "MANAGE_DEVICE_POLICY_WIFI": 0,
-        "MANAGE_DEVICE_POLICY_WINDOWS": 0,
-        "MANAGE_DEVICE_POLICY_WIPE_DATA": 0,
-        "MANAGE_DOCUMENTS": 0,
-        "MANAGE_EXTERNAL_STORAGE": 0,
-        "MANAGE_MEDIA": 0,
-        "MANAGE_ONGOING_CALLS": 0,
-        "MANAGE_OWN_CALLS": 0,
-        "MANAGE_WIFI_INTERFACES": 0,
-        "MANAGE_WIFI_NETWORK_SELECTION": 0,
-        "MASTER_CLEAR": 0,
-        "MEDIA_CONTENT_CONTROL": 0,
-        "MEDIA_ROUTING_CONTROL": 0,
-        "MODIFY_AUDIO_SETTINGS": 0,
-        "MODIFY_PHONE_STATE": 0,
-        "MOUNT_FORMAT_FILESYSTEMS": 0,
-        "MOUNT_UNMOUNT_FILESYSTEMS": 0,
-        "NEARBY_WIFI_DEVICES": 0,
-        "NFC": 0,
-        "NFC_PREFERRED_PAYMENT_INFO": 0,
-        "NFC_TRANSACTION_EVENT": 0,
-        "OVERRIDE_WIFI_CONFIG": 0,
-        "PACKAGE_USAGE_STATS": 0,
-        "PERSISTENT_ACTIVITY": 0,
-        "POST_NOTIFICATIONS": 0,
-        "PROCESS_OUTGOING_CALLS": 0,
-        "PROVIDE_OWN_AUTOFILL_SUGGESTIONS": 0,
-        "PROVIDE_REMOTE_CREDENTIALS": 0,
-        "QUERY_ADVANCED_PROTECTION_MODE": 0,
-        "QUERY_ALL_PACKAGES": 0,
-        "RANGING": 0,
-        "READ_ASSISTANT_APP_SEARCH_DATA": 0,
-        "READ_BASIC_PHONE_STATE": 0,
-        "READ_CALENDAR": 0,
-        "READ_CALL_LOG": 0,
-        "READ_COLOR_ZONES": 0,
-        "READ_CONTACTS": 0,
-        "READ_DROPBOX_DATA": 0,
-        "READ_EXTERNAL_STORAGE": 0,
-        "READ_HOME_APP_SEARCH_DATA": 0,
-        "READ_INPUT_STATE": 0,
-        "READ_LOGS": 0,
-        "READ_MEDIA_AUDIO": 0,
-        "READ_MEDIA_IMAGES": 0,
-        "READ_MEDIA_VIDEO": 0,
-        "READ_MEDIA_VISUAL_USER_SELECTED": 0,
-        "READ_NEARBY_STREAMING_POLICY": 0,
-        "READ_PHONE_NUMBERS": 0,
-        "READ_PHONE_STATE": 0,
-        "READ_PRECISE_PHONE_STATE": 0,
-        "READ_SMS": 0,
-        "READ_SYNC_SETTINGS": 0,
-        "READ_SYNC_STATS": 0,
-        "READ_SYSTEM_PREFERENCES": 0,
-        "READ_VOICEMAIL": 0,
-        "REBOOT": 0,
-        "RECEIVE_BOOT_COMPLETED": 0,
-        "RECEIVE_MMS": 0,
-        "RECEIVE_SMS": 0,
-        "RECEIVE_WAP_PUSH": 0,
-        "RECORD_AUDIO": 0,
-        "REORDER_TASKS": 0,
-        "REQUEST_COMPANION_PROFILE_APP_STREAMING": 0,
-        "REQUEST_COMPANION_PROFILE_AUTOMOTIVE_PROJECTION": 0,
-        "REQUEST_COMPANION_PROFILE_COMPUTER": 0,
-        "REQUEST_COMPANION_PROFILE_GLASSES": 0,
-        "REQUEST_COMPANION_PROFILE_NEARBY_DEVICE_STREAMING": 0,
-        "REQUEST_COMPANION_PROFILE_WATCH": 0,
-        "REQUEST_COMPANION_RUN_IN_BACKGROUND": 0,
-        "REQUEST_COMPANION_SELF_MANAGED": 0,
-        "REQUEST_COMPANION_START_FOREGROUND_SERVICES_FROM_BACKGROUND": 0,
-        "REQUEST_COMPANION_USE_DATA_IN_BACKGROUND": 0,
-        "REQUEST_DELETE_PACKAGES": 0,
-        "REQUEST_IGNORE_BATTERY_OPTIMIZATIONS": 0,
-        "REQUEST_INSTALL_PACKAGES": 0,
-        "REQUEST_OBSERVE_COMPANION_DEVICE_PRESENCE": 0,
-        "REQUEST_OBSERVE_DEVICE_UUID_PRESENCE": 0,
-        "REQUEST_PASSWORD_COMPLEXITY": 0,
-        "RESTART_PACKAGES": 0,
-        "RUN_USER_INITIATED_JOBS": 0,
-        "SCHEDULE_EXACT_ALARM": 0,
-        "SEND_RESPOND_VIA_MESSAGE": 0,
-        "SEND_SMS": 0,
-        "SET_ALARM": 0,
-        "SET_ALWAYS_FINISH": 0,
-        "SET_ANIMATION_SCALE": 0,
-        "SET_BIOMETRIC_DIALOG_ADVANCED": 0,
-        "SET_DEBUG_APP": 0,
-        "SET_PREFERRED_APPLICATIONS": 0,
-        "SET_PROCESS_LIMIT": 0,
-        "SET_TIME": 0,
-        "SET_TIME_ZONE": 0,
-        "SET_WALLPAPER": 0,
-        "SET_WALLPAPER_HINTS": 0,
-        "SIGNAL_PERSISTENT_PROCESSES": 0,
-        "SMS_FINANCIAL_TRANSACTIONS": 0,
-        "START_FOREGROUND_SERVICES_FROM_BACKGROUND": 0,
-        "START_VIEW_APP_FEATURES": 0,
-        "START_VIEW_PERMISSION_USAGE": 0,
-        "STATUS_BAR": 0,
-        "SUBSCRIBE_TO_KEYGUARD_LOCKED_STATE": 0,
-        "SYSTEM_ALERT_WINDOW": 0,
-        "TRANSMIT_IR": 0,
-        "TURN_SCREEN_ON": 0,
-        "TV_IMPLICIT_ENTER_PIP": 0,
-        "UNINSTALL_SHORTCUT": 0,
-        "UPDATE_DEVICE_STATS": 0,
-        "UPDATE_PACKAGES_WITHOUT_USER_ACTION": 0,
-        "USE_BIOMETRIC": 0,
-        "USE_EXACT_ALARM": 0,
-        "USE_FINGERPRINT": 0,
-        "WRITE_VOICEMAIL": 0,
-        "USE_FULL_SCREEN_INTENT": 0,
-        "USE_ICC_AUTH_WITH_DEVICE_IDENTIFIER": 0,
-        "USE_SIP": 0,
-        "UWB_RANGING": 0,
-        "VIBRATE": 0,
-        "WAKE_LOCK": 0,
-        "WRITE_APN_SETTINGS": 0,
-        "WRITE_CALENDAR": 0,
-        "WRITE_CALL_LOG": 0,
-        "WRITE_CONTACTS": 0,
-        "WRITE_EXTERNAL_STORAGE": 0,
-        "WRITE_GSERVICES": 0,
-        "WRITE_SECURE_SETTINGS": 0,
-        "WRITE_SETTINGS": 0,
-        "WRITE_SYNC_SETTINGS": 0,
-        "WRITE_SYSTEM_PREFERENCES": 0
-    }
-    os.makedirs("./permissions_data/", exist_ok=True)
-    for filename in os.listdir(directory):
-        # Get the full filepath for running the command
+def write_feature_csv(output_dir, apkname, header, values):
+    """
+    Writes the header line and the feature values of one APK to
+    <output_dir>/<apkname>.csv. The file only appears once it is complete.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    output_file_path = os.path.join(output_dir, apkname)
+    with progress_journal.atomic_output(f"{output_file_path}.csv") as output_file:
+        output_file.write(header)
+        output_file.write("\n")  # End of header line
+        output_file.write(",".join(map(str, values)))
+
+
+def analyze_manifest(root, filename=""):
+    """
+    Walks a parsed AndroidManifest.xml once and collects both the requested
+    permissions and the actions of the <intent-filter> elements of its
+    activities, receivers and services.
+
+    Returns:
+        tuple: The permission dictionary (1 if the permission is requested,
+               0 otherwise) and the intent action dictionary (10, 11 or 12 if
+               the action is found within an <intent-filter> of an activity,
+               receiver or service, 0 otherwise).
+    """
+    current_permissions = permissions.copy()
+    all_current_intents = all_intent_actions.copy()
+
+    for element in root.iter():
+        if element.tag in permission_tags:
+            key = permission_index.get(element.get(ANDROID_NAME))
+            if key is not None:
+                current_permissions[key] = 1
+                print(f"Found {key} in {filename}")
+
+        elif element.tag in component_intent_codes:
+            # A service outranks a receiver, which outranks an activity
+            code = component_intent_codes[element.tag]
+            for intent_filter in element.findall('./intent-filter'):
+                for action_element in intent_filter.findall('./action'):
+                    action = action_element.get(ANDROID_NAME)
+                    if action in all_intent_actions and all_current_intents[action] < code:
+                        all_current_intents[action] = code
+
+    return current_permissions, all_current_intents
+
+
+def write_manifest_features(apkname, current_permissions, all_current_intents):
+    """Writes the permission and intent action CSVs of one APK."""
+    write_feature_csv("./permissions_data/", apkname, ",".join(permissions.keys()),
+                      current_permissions.values())
+    write_feature_csv("./intents_data/", apkname, ",".join(all_intent_actions.keys()),
+                      all_current_intents.values())
+
+
+def write_sensitive_api_features(apkname, sensitive_apis_map_current):
+    """
+    Writes the sensitive API CSV of one APK. The first column, name, holds
+    the APK name. The last column, sensitive_apis_missing, is 1 when the APK
+    has no sensitive API dictionary because its analysis exceeded the budget,
+    the vector is all zeros then.
+    """
+    missing = sensitive_apis_map_current is None
+    values = list((sentitive_apis_map if missing else sensitive_apis_map_current).values())
+    write_feature_csv("./sensitive_apis_data/", apkname,
+                      "name," + ",".join(sentitive_apis_map.keys()) + ",sensitive_apis_missing",
+                      [apkname] + values + [int(missing)])
+
+
+def write_apk_features(apkname, current_permissions, all_current_intents, sensitive_apis_map_current=None,
+                       sensitive_apis_missing=False):
+    """
+    Writes the permission, intent and, when extracted, sensitive API CSVs of one APK.
+    With sensitive_apis_missing the sensitive API CSV is written flagged as missing.
+
+    Returns:
+        list: The stages whose outputs were written, see ENGINE_STAGES.
+    """
+    write_manifest_features(apkname, current_permissions, all_current_intents)
+    stages = ["manifest"]
+    if sensitive_apis_map_current is not None:
+        write_sensitive_api_features(apkname, sensitive_apis_map_current)
+        stages.append("sensitive_apis")
+    elif sensitive_apis_missing:
+        write_sensitive_api_features(apkname, None)
+    return stages
+
+
+def extract_manifest_data(filenames=None, workdir="./"):
+    """
+    Parses every AndroidManifest.xml in <workdir>/manifests/ once and writes
+    the permission and intent action CSVs of its APK.
+    """
+    directory = os.path.join(workdir, "manifests")
+    if filenames is None:
+        filenames = os.listdir(directory)
+    for filename in filenames:
         analyze = os.path.join(directory, filename)
+        if not os.path.isfile(analyze):
+            continue
         apkname = filename.replace('_AndroidManifest.xml', '')
-        # Check if it is a file (not a directory)
-        if os.path.isfile(analyze):
-            output_file_path = os.path.join("./permissions_data/", apkname)
-            with open(f"{output_file_path}.csv", "w", encoding="utf-8") as output_file:
-                # Write CSV headers
-                output_file.write(",".join(permissions.keys()))  # Permission keys as columns
-                output_file.write("\n")  # End of header line
-                # Reset permissions for the current file
-                current_permissions = permissions.copy()
-
-                # Open and read the manifest file
-                try:
-                    with open(analyze, "r", encoding="utf-8") as input_file:
-                        for line in input_file:
-                            for key in current_permissions:
-                                if "android.permission." + key in line:
-                                    current_permissions[key] = 1
-                                    print(f"Found {key} in {filename}")
+        try:
+            root = ET.parse(analyze).getroot()
+        except ET.ParseError:
+            print(f"Error: Could not parse the XML file {filename}")
+            continue
+        current_permissions, all_current_intents = analyze_manifest(root, filename)
+        write_manifest_features(apkname, current_permissions, all_current_intents)
+        print(f"Processed: {analyze}")
+
 
-                    # Write the results to the CSV file
-                    output_file.write(
-                        ",".join(map(str, current_permissions.values())))  # Write permission values
+def decode_manifest(filepath, workdir="./", decoder="axml", reader=None, timeout=None):
+    """
+    Decodes the AndroidManifest.xml of an APK into an element tree.
 
-                    print(f"Processed: {analyze}")
+    The "axml" decoder reads the binary manifest straight out of the apk zip,
+    or out of the given ApkReader, and only falls back to a full apktool decode
+    into <workdir> when the manifest is malformed. "axml-only" never runs
+    apktool, "apktool" always does, killed after timeout seconds.
 
-                except Exception as e:
-                    print(f"Error processing {analyze}: {e}")
+    Returns:
+        Element: The root <manifest> element.
+    """
+    directory, filename = os.path.split(filepath)
+    if decoder != "apktool":
+        try:
+            return axml.read_manifest(filepath, reader)
+        except axml.AXMLError as e:
+            if decoder == "axml-only":
+                raise
+            print(f"Falling back to apktool for {filepath}: {e}")
+
+    extract_manifests(directory, [filename], workdir, timeout)
+    manifest_path = os.path.join(workdir, "manifests", f"{filename.replace('.apk', '')}_AndroidManifest.xml")
+    return ET.parse(manifest_path).getroot()
 
 
-def extract_intent_actions():
+def is_sensitive_label(label):
     """
-    Parses an AndroidManifest.xml file and returns a dictionary
-    indicating the presence of common intent actions.
+    Tells whether the class path of a method label or class descriptor contains
+    one of the sensitive API classes, e.g. Landroid/telephony/TelephonyManager;->getDeviceId()Ljava/lang/String;
+    """
+    return not sensitive_api_classes.isdisjoint(label.split(';', 1)[0].split('/'))
+
+
+def sensitive_nodes(labels):
+    """
+    Finds the nodes of a callgraph that sensitive_apis_from_callgraph looks
+    at, from their method labels.
 
     Returns:
-        dict: A dictionary where keys are common intent action strings
-              and values are 1 if the action is found in the manifest
-              within an <intent-filter>, and 0 otherwise.
-    """
-    directory = "./manifests/"
-    all_intent_actions = {
-        "android.intent.action.MAIN": 0,
-        "android.intent.action.VIEW": 0,
-        "android.intent.action.DIAL": 0,
-        "android.intent.action.CALL": 0,
-        "android.intent.action.SENDTO": 0,
-        "android.intent.action.SEND": 0,
-        "android.intent.action.SEND_MULTIPLE": 0,
-        "android.intent.action.INSERT": 0,
-        "android.intent.action.DELETE": 0,
-        "android.intent.action.EDIT": 0,
-        "android.intent.action.PICK": 0,
-        "android.intent.action.GET_CONTENT": 0,
-        "android.intent.action.OPEN_DOCUMENT": 0,
-        "android.intent.action.CREATE_DOCUMENT": 0,
-        "android.intent.action.CHOOSER": 0,
-        "android.intent.action.SEARCH": 0,
-        "android.intent.action.WEB_SEARCH": 0,
-        "android.intent.action.SYNC": 0,
-        "android.intent.action.SET_WALLPAPER": 0,
-        "android.intent.action.INSTALL_PACKAGE": 0,
-        "android.intent.action.UNINSTALL_PACKAGE": 0,
-        "android.intent.action.BOOT_COMPLETED": 0,
-        "android.intent.action.MEDIA_MOUNTED": 0,
-        "android.intent.action.MEDIA_UNMOUNTED": 0,
-        "android.intent.action.ACTION_POWER_CONNECTED": 0,
-        "android.intent.action.ACTION_POWER_DISCONNECTED": 0,
-        "android.intent.action.BATTERY_LOW": 0,
-        "android.intent.action.BATTERY_OKAY": 0,
-        "android.intent.action.DEVICE_STORAGE_LOW": 0,
-        "android.intent.action.DEVICE_STORAGE_OK": 0,
-        "android.intent.action.MANAGE_NETWORK_STORAGE": 0,
-        "android.intent.action.LOCALE_CHANGED": 0,
-        "android.intent.action.TIME_SET": 0,
-        "android.intent.action.TIMEZONE_CHANGED": 0,
-        "android.intent.action.REBOOT": 0,
-        "android.intent.action.SHUTDOWN": 0,
-        "android.intent.action.CONFIGURATION_CHANGED": 0,
-        "android.intent.action.CONTENT_CHANGED": 0,
-        "android.intent.action.EXTERNAL_APPLICATIONS_AVAILABLE": 0,
-        "android.intent.action.EXTERNAL_APPLICATIONS_UNAVAILABLE": 0,
-        "android.intent.action.PACKAGE_ADDED": 0,
-        "android.intent.action.PACKAGE_CHANGED": 0,
-        "android.intent.action.PACKAGE_REMOVED": 0,
-        "android.intent.action.PACKAGE_REPLACED": 0,
-        "android.intent.action.PACKAGE_RESTARTED": 0,
-        "android.intent.action.MY_PACKAGE_REPLACED": 0,
-        "android.intent.action.UID_REMOVED": 0,
-        "android.intent.action.USER_PRESENT": 0,
-        "android.intent.action.QUICK_VIEW": 0,
-        "android.intent.action.ASSIST": 0,
-        "android.intent.action.BUG_REPORT": 0,
-        "android.intent.action.PROCESS_TEXT": 0,
-        "android.intent.action.SHOW_APP_INFO": 0,
-        "android.intent.action.VOICE_COMMAND": 0,
-        "android.intent.action.CREATE_SHORTCUT": 0,
-        "android.intent.action.OPEN_DOCUMENT_TREE": 0,
-        "android.intent.action.OPEN_EXTERNAL_DIRECTORY": 0,
-        "android.intent.action.ADVANCED_SETTINGS": 0,
-        "android.intent.action.APPLICATION_DETAILS_SETTINGS": 0,
-        "android.intent.action.MANAGE_APPLICATIONS_SETTINGS": 0,
-        "android.intent.action.MANAGE_ALL_APPLICATIONS_ACCESS_PERMISSION": 0,
-        "android.intent.action.NOTIFICATION_POLICY_ACCESS_SETTINGS": 0,
-        "android.intent.action.ACTION_SEARCH_SETTINGS": 0,
-        "android.intent.action.SHOW_INPUT_METHOD_PICKER": 0,
-        "android.intent.action.SHOW_KEYBOARD_SHORTCUTS": 0,
-        "android.intent.action.ACTION_SHOW_WORK_POLICY": 0,
-        "android.intent.action.ACTION_SYSTEM_LOCALE_CHANGED": 0,
-        "android.intent.action.UPGRADE_ASSISTANT": 0,
-        "android.intent.action.AUTO_FILL_SET_SERVICE": 0,
-        "android.intent.action.RESOLVE_ACTIVITY": 0,
-        "android.intent.action.NEXT": 0,
-        "android.intent.action.PREVIOUS": 0,
-        "android.intent.action.CLOSE_SYSTEM_DIALOGS": 0,
-        "android.intent.action.ALL_APPS": 0,
-        "android.intent.action.STK_INVOKE": 0,
-        "android.intent.action.STK_CC_OPEN": 0,
-        "android.intent.action.STK_CMD": 0,
-        "android.intent.action.STK_EVENT": 0,
-        "android.intent.action.DEVICE_LOCKED_CHANGED": 0,
-        "android.intent.action.PROFILE_PROVISIONING_COMPLETE": 0,
-        "android.intent.action.PROFILE_PROVISIONING_ERROR": 0,
-        "android.intent.action.PROVISIONING_REQUIRED": 0,
-        "android.intent.action.ACTION_SESSION_DETAILS": 0,
-        "android.intent.action.VIEW_INSTANT_APP": 0,
-        "android.intent.action.START_ACTIVITY_FROM_RECENTS": 0,
-        "android.intent.action.SHOW_RECENT_APPS": 0,
-        "android.intent.action.GLOBAL_BUTTON": 0,
-        "android.intent.action.KEYBOARD_RESOURCE_MAPPING": 0,
-        "android.intent.action.MEDIA_BUTTON": 0,
-        "android.intent.action.PRE_BOOT_COMPLETED": 0,
-        "android.intent.action.UMS_CONNECTED": 0,
-        "android.intent.action.UMS_DISCONNECTED": 0,
-        "android.intent.action.USER_INITIALIZE": 0,
-        "android.intent.action.USER_ADDED": 0,
-        "android.intent.action.USER_REMOVED": 0,
-        "android.intent.action.USER_STARTED": 0,
-        "android.intent.action.USER_STOPPED": 0,
-        "android.intent.action.USER_UNLOCKED": 0,
-        "android.intent.action.USER_BACKGROUND": 0,
-        "android.intent.action.USER_FOREGROUND": 0,
-        "android.intent.action.LOCKED_BOOT_COMPLETED": 0,
-        "android.intent.action.ACTION_PREFERRED_ACTIVITY_CHANGED": 0,
-        "android.intent.action.PACKAGE_DATA_CLEARED": 0,
-        "android.intent.action.PACKAGE_FULLY_SUSPENDED": 0,
-        "android.intent.action.PACKAGE_UNSUSPENDED": 0,
-        "android.intent.action.START_INSTRUMENTATION": 0,
-        "android.intent.action.FINISH_INSTRUMENTATION": 0,
-        "android.intent.action.GET_PREFERRED_APPLICATIONS": 0,
-        "android.intent.action.CLEAR_PREFERRED_APPLICATIONS": 0,
-        "android.intent.action.CHANGE_COMPONENT_ENABLED_STATE": 0,
-        "android.intent.action.SHOW_SUSPENDED_APP_DETAILS": 0,
-        "android.intent.action.REQUEST_OMNIFOCUS": 0,
-        "android.intent.action.DISMISS_KEYBOARD": 0,
-        "android.intent.action.SHOW_VOICE_INPUT_PICKER": 0,
-        "android.intent.action.PROCESS_WIDGETS": 0,
-        "android.intent.action.GET_CONTENT_WITH_PERMISSION": 0,
-        "android.intent.action.REVIEW_VOICE_INTERACTIONS": 0,
-        "android.intent.action.GET_RESTRICTION_ENTRIES": 0,
-        "android.intent.action.START_CAPTURE": 0,
-        "android.intent.action.STOP_CAPTURE": 0,
-        "android.intent.action.SHOW_APP_PREFERENCES": 0,
-        "android.intent.action.ENTER_CAR_MODE": 0,
-        "android.intent.action.EXIT_CAR_MODE": 0,
-        "android.intent.action.SET_MEDIA_PLAYBACK": 0,
-        "android.intent.action.PLAY_FROM_SEARCH": 0,
-        "android.intent.action.MEDIA_PLAY_FROM_SEARCH": 0,
-        "android.intent.action.MEDIA_PAUSE": 0,
-        "android.intent.action.MEDIA_PLAY": 0,
-        "android.intent.action.MEDIA_PLAY_FROM_URI": 0,
-        "android.intent.action.MEDIA_PREPARE": 0,
-        "android.intent.action.MEDIA_RECORD": 0,
-        "android.intent.action.MEDIA_STOP": 0,
-        "android.intent.action.MEDIA_STEP_BACKWARD": 0,
-        "android.intent.action.MEDIA_STEP_FORWARD": 0,
-        "android.intent.action.MEDIA_STEP_INTO": 0,
-        "android.intent.action.MEDIA_STEP_OUT": 0,
-        "android.intent.action.ACTION_PLAY_FROM_ID": 0,
-        "android.intent.action.ACTION_PLAY_FROM_INDEX": 0,
-        "android.intent.action.ACTION_CHANGE_VOLUME": 0,
-        "android.intent.action.ACTION_SET_PLAYBACK_SPEED": 0,
-        "android.intent.action.ACTION_SET_REPEAT_MODE": 0,
-        "android.intent.action.ACTION_HANDLE_MEDIA_KEY": 0,
-        "android.intent.action.ACTION_NOTIFY_SESSION_STATE_CHANGED": 0,
-        "android.intent.action.ACTION_SET_RINGTONE": 0,
-        "android.intent.action.RINGTONE_PICKER": 0,
-        "android.intent.action.ACTION_GET_SAMPLE_DATA": 0,
-        "android.intent.action.OPEN_DOCUMENT_SETTINGS": 0,
-        "android.intent.action.PRINT": 0,
-        "android.intent.action.PRINT_DOCUMENT": 0,
-        "android.intent.action.PRINT_WRITE": 0,
-        "android.intent.action.PRINT_JOB_QUEUED": 0,
-        "android.intent.action.PRINT_JOB_STATE_CHANGED": 0,
-        "android.intent.action.PRINT_SPOOLER_STARTED": 0,
-        "android.intent.action.PRINT_SPOOLER_STOPPED": 0,
-        "android.intent.action.VIEW_DOWNLOADS": 0,
-        "android.intent.action.DOWNLOAD_COMPLETE": 0,
-        "android.intent.action.DOWNLOAD_NOTIFICATION_CLICKED": 0,
-        "android.intent.action.RESTART_DOWNLOAD": 0,
-        "android.intent.action.ENQUEUE": 0,
-        "android.intent.action.PAUSE": 0,
-        "android.intent.action.PAUSE_ALL": 0,
-        "android.intent.action.RESUME": 0,
-        "android.intent.action.RESUME_ALL": 0,
-        "android.intent.action.CANCEL": 0,
-        "android.intent.action.HIDE": 0,
-        "android.intent.action.SHOW": 0,
-        "android.intent.action.MIME_TYPE_CHANGED": 0,
-        "android.intent.action.SYNC_STATUS_CHANGED": 0,
-        "android.intent.action.AUTHENTICATE": 0,
-        "android.intent.action.ACCOUNT_REMOVED": 0,
-        "android.intent.action.ADD_ACCOUNT": 0,
-        "android.intent.action.REQUEST_SYNC": 0,
-        "android.intent.action.SEND_MULTIPLE_SYNC": 0,
-        "android.intent.action.SEND_SYNC": 0,
-        "android.intent.action.SYNC_ERROR": 0,
-        "android.intent.action.DISCOVER": 0,
-        "android.intent.action.CREATE_ACTION": 0,
-        "android.intent.action.RECOGNIZE_SPEECH": 0,
-        "android.intent.action.GET_LANGUAGE_DETAILS": 0,
-        "android.intent.action.TRANSLATE": 0,
-        "android.intent.action.TRANSLATION_SERVICE": 0,
-        "android.intent.action.PROVIDE_DEFAULT_VOICE_INTERACTION_SERVICE": 0,
-        "android.intent.action.VOICE_ASSIST": 0,
-        "android.intent.action.LAUNCH_VOICE_SEARCH": 0,
-        "android.intent.action.REPORT_TEXT": 0,
-        "android.intent.action.SELECT_TEXT": 0,
-        "android.intent.action.SHOW_OR_HIDE_INPUT_METHOD": 0,
-        "android.intent.action.TOGGLE_INPUT_METHOD": 0,
-        "android.intent.action.PICK_KEYBOARD_LAYOUT": 0,
-        "android.intent.action.TOGGLE_INPUT": 0,
-        "android.intent.action.CLEAR_APP_CACHE": 0,
-        "android.intent.action.CLEAR_APP_DATA": 0,
-        "android.intent.action.CLEAR_APP_PREFERRED_SETTINGS": 0,
-        "android.intent.action.MANAGE_SPACE": 0,
-        "android.intent.action.MANAGE_SPACE_INTERNAL": 0,
-        "android.intent.action.MANAGE_APP_PERMISSIONS": 0,
-        "android.intent.action.MANAGE_DEFAULT_APPS_SETTINGS": 0,
-        "android.intent.action.MANAGE_ROLE_ACCESS": 0,
-        "android.intent.action.REQUEST_INSTALL_PACKAGES": 0,
-        "android.intent.action.VIEW_APP_DETAILS": 0,
-        "android.intent.action.REQUEST_DELETE_PACKAGES": 0,
-        "android.intent.action.REQUEST_SCAN_FILE": 0,
-        "android.intent.action.RESPOND_VIA_MESSAGE": 0,
-        "android.intent.action.SEND_MESSAGE": 0,
-        "android.intent.action.AUTO_SEND": 0,
-        "android.intent.action.ECM_CHANGED": 0,
-        "android.intent.action.ACTION_SHOW_CURRENT_PERMISSION_GRANTS": 0,
-        "android.intent.action.ACTION_VOICE_SESSION": 0,
-        "android.intent.action.DIAL_EMERGENCY": 0,
-        "android.intent.action.CALL_EMERGENCY": 0,
-        "android.intent.action.CONFIGURE_VOICEMAIL": 0,
-        "android.intent.action.CHECK_VOICEMAIL": 0,
-        "android.intent.action.ADD_VOICEMAIL": 0,
-        "android.intent.action.ACTION_ ক্যারি_ON_SUBSCRIPTION": 0,
-        "android.intent.action.ACTION_CONFIGURE_PHONE_ACCOUNT": 0,
-        "android.intent.action.ACTION_CHANGE_PHONE_ACCOUNT": 0,
-        "android.intent.action.ACTION_DISABLE_SELF_CALL": 0,
-        "android.intent.action.ACTION_SHOW_SUBSCRIPTION_SETTING": 0,
-        "android.intent.action.ACTION_MANAGE_SUBSCRIPTION_PLANS": 0,
-        "android.intent.action.ACTION_PERFORM_VOICE_CALL": 0,
-        "android.intent.action.ACTION_PERFORM_VIDEO_CALL": 0,
-        "android.intent.action.ACTION_PERFORM_IMS_CALL": 0,
-        "android.intent.action.ACTION_PERFORM_RTT_CALL": 0,
-        "android.intent.action.ACTION_SHOW_CALL_SCREEN": 0,
-        "android.intent.action.ACTION_SHOW_CALL_HISTORY": 0,
-        "android.intent.action.ACTION_ADD_CALL": 0,
-        "android.intent.action.ACTION_ANSWER": 0,
-        "android.intent.action.ACTION_ANSWER_VIDEO": 0,
-        "android.intent.action.ACTION_DECLINE": 0,
-        "android.intent.action.ACTION_HANG_UP": 0,
-        "android.intent.action.ACTION_CHANGE_DEFAULT": 0,
-        "android.intent.action.ACTION_CHANGE_DEFAULT_DIALER": 0,
-        "android.intent.action.ACTION_GET_DEFAULT_SUBSCRIPTION_ID": 0,
-        "android.intent.action.ACTION_SHOW_MISSED_CALLS": 0,
-        "android.intent.action.ACTION_PLUG_IN_MANAGED_PROFILE": 0,
-        "android.intent.action.ACTION_PROVISION_MANAGED_PROFILE": 0,
-        "android.intent.action.ACTION_INSTALL_PACKAGE_SESSION": 0,
-        "android.intent.action.ACTION_COMMIT_SESSION": 0,
-        "android.intent.action.ACTION_ABANDON_SESSION": 0,
-        "android.intent.action.ACTION_OPEN_APP_PERMISSION_SETTINGS": 0,
-        "android.intent.action.ACTION_REVIEW_PERMISSIONS": 0,
-        "android.intent.action.ACTION_APPLICATION_PREFERENCES": 0,
-        "android.intent.action.VIEW_CONTENT": 0,
-        "android.intent.action.EDIT_CONTENT": 0,
-        "android.intent.action.PICK_ACTIVITY": 0,
-        "android.intent.action.BROWSE": 0,
-        "android.intent.action.INSERT_CALENDAR_EVENT": 0,
-        "android.intent.action.INSERT_CONTACT": 0,
-        "android.intent.action.ADD_TO_HOME_SCREEN": 0,
-        "android.intent.action.INSTALL_SHORTCUT": 0,
-        "android.intent.action.UNINSTALL_SHORTCUT": 0,
-        "android.intent.action.DREAMING_STARTED": 0,
-        "android.intent.action.DREAMING_STOPPED": 0,
-        "android.intent.action.SCREEN_OFF": 0,
-        "android.intent.action.SCREEN_ON": 0,
-        "android.intent.action.ACTION_DOCK_EVENT": 0,
-        "android.intent.action.ACTION_HEADSET_PLUG": 0,
-        "android.intent.action.ACTION_NEW_OUTGOING_CALL": 0,
-        "android.intent.action.PHONE_STATE": 0,
-        "android.intent.action.ACTION_EXTERNAL_STORAGE_MOUNTED": 0,
-        "android.intent.action.ACTION_EXTERNAL_STORAGE_UNMOUNTED": 0,
-        "android.intent.action.ACTION_GTALK_SERVICE_CONNECTED": 0,
-        "android.intent.action.ACTION_GTALK_SERVICE_DISCONNECTED": 0,
-        "android.intent.action.INPUT_METHOD_CHANGED": 0,
-        "android.intent.action.NEW_PICTURE": 0,
-        "android.intent.action.NEW_VIDEO": 0,
-        "android.intent.action.PROVIDER_CHANGED": 0,
-        "android.intent.action.PROXY_CHANGE": 0,
-        "android.intent.action.REBOOT_REQUIRED": 0,
-        "android.intent.action.SEARCH_LONG_PRESS": 0
-    }
-    os.makedirs("./intents_data/", exist_ok=True)
-    for filename in os.listdir(directory):
-        all_current_intents = all_intent_actions.copy()
-        apkname = filename.replace('_AndroidManifest.xml', '')
-        output_file_path = os.path.join("./intents_data/", apkname)
-        with open(f"{output_file_path}.csv", "w", encoding="utf-8") as output_file:
-            # Write CSV headers
-            output_file.write(",".join(all_intent_actions.keys()))  # Permission keys as columns
-            output_file.write("\n")  # End of header line
-            try:
-                analyze = os.path.join(directory, filename)
-                tree = ET.parse(analyze)
-                root = tree.getroot()
-
-                for activity in root.findall('.//activity'):
-                    for intent_filter in activity.findall('./intent-filter'):
-                        for action_element in intent_filter.findall('./action'):
-                            action = action_element.get('{http://schemas.android.com/apk/res/android}name')
-                            if action in all_intent_actions:
-                                all_current_intents[action] = 10
-
-                for receiver in root.findall('.//receiver'):
-                    for intent_filter in receiver.findall('./intent-filter'):
-                        for action_element in intent_filter.findall('./action'):
-                            action = action_element.get('{http://schemas.android.com/apk/res/android}name')
-                            if action in all_intent_actions:
-                                all_current_intents[action] = 11
-
-                for service in root.findall('.//service'):
-                    for intent_filter in service.findall('./intent-filter'):
-                        for action_element in intent_filter.findall('./action'):
-                            action = action_element.get('{http://schemas.android.com/apk/res/android}name')
-                            if action in all_intent_actions:
-                                all_current_intents[action] = 12
-                output_file.write(",".join(map(str, all_current_intents.values())))  # Write permission values
-            except ET.ParseError:
-                print(f"Error: Could not parse the XML file {filename}")
-
-
-def extract_sensitive_apis():
-    directory = './callgraphs/'
-    sentitive_apis_map = {
-        "getInputStream": 0,
-        "canChangeDtmfToneLength": 0,
-        "clearSignalStrengthUpdateRequest": 0,
-        "createForPhoneAccountHandle": 0,
-        "createForSubscriptionId": 0,
-        "doesSwitchMultiSimConfigTriggerReboot": 0,
-        "switchMultiSimConfig": 0,
-        "getActiveModemCount": 0,
-        "getAllCellInfo": 0,
-        "getAllowedNetworkTypesForReason": 0,
-        "getCallComposerStatus": 0,
-        "getCallState": 0,
-        "getCallStateForSubscription": 0,
-        "isInCall": 0,
-        "getCardIdForDefaultEuicc": 0,
-        "getCarrierConfig": 0,
-        "getCarrierIdFromSimMccMnc": 0,
-        "getSimOperator": 0,
-        "getCarrierRestrictionStatus": 0,
-        "getCellLocation": 0,
-        "getDataActivity": 0,
-        "getDataNetworkType": 0,
-        "getDataState": 0,
-        "getDeviceId": 0,
-        "getImei": 0,
-        "getMeid": 0,
-        "getDeviceSoftwareVersion": 0,
-        "getEmergencyNumberList": 0,
-        "getEquivalentHomePlmns": 0,
-        "getForbiddenPlmns": 0,
-        "getGroupIdLevel": 0,
-        "getIccAuthentication": 0,
-        "getLine": 0,
-        "getPhoneNumber": 0,
-        "getManualNetworkSelectionPlmn": 0,
-        "getManufacturerCode": 0,
-        "getMaximumCallComposerPictureSize": 0,
-        "getMmsUAProfUrl": 0,
-        "getMmsUserAgent": 0,
-        "getNai": 0,
-        "getNetworkCountryIso": 0,
-        "getNetworkOperator": 0,
-        "getNetworkOperatorName": 0,
-        "getNetworkSelectionMode": 0,
-        "getNetworkSlicingConfiguration": 0,
-        "getNetworkSpecifier": 0,
-        "getNetworkType": 0,
-        "getPhoneAccountHandle": 0,
-        "getPhoneCount": 0,
-        "getPhoneType": 0,
-        "getPreferredOpportunisticDataSubscription": 0,
-        "hasCarrierPrivileges": 0,
-        "getPrimaryImei": 0,
-        "getServiceState": 0,
-        "getSignalStrength": 0,
-        "getSimCarrierId": 0,
-        "getSimCarrierIdName": 0,
-        "getSimCountryIso": 0,
-        "getSimOperatorName": 0,
-        "getSimSerialNumber": 0,
-        "getSimSpecificCarrierId": 0,
-        "getSimSpecificCarrierIdName": 0,
-        "getSimState": 0,
-        "getSubscriberId": 0,
-        "getSubscriptionId": 0,
-        "getSupportedModemCount": 0,
-        "getSupportedRadioAccessFamily": 0,
-        "hasSystemFeature": 0,
-        "getTypeAllocationCode": 0,
-        "getUiccCardsInfo": 0,
-        "getVisualVoicemailPackageName": 0,
-        "getVoiceMailAlphaTag": 0,
-        "getVoiceMailNumber": 0,
-        "getVoiceNetworkType": 0,
-        "getVoicemailRingtoneUri": 0,
-        "hasIccCard": 0,
-        "iccCloseLogicalChannel": 0,
-        "iccExchangeSimIO": 0,
-        "iccOpenLogicalChannel": 0,
-        "iccTransmitApduBasicChannel": 0,
-        "iccTransmitApduLogicalChannel": 0,
-        "isConcurrentVoiceAndDataSupported": 0,
-        "isDataCapable": 0,
-        "isDataConnectionAllowed": 0,
-        "isDataEnabled": 0,
-        "isDataEnabledForReason": 0,
-        "isDataRoamingEnabled": 0,
-        "isDeviceSmsCapable": 0,
-        "isDeviceVoiceCapable": 0,
-        "isEmergencyNumber": 0,
-        "isHearingAidCompatibilitySupported": 0,
-        "isManualNetworkSelectionAllowed": 0,
-        "isModemEnabledForSlot": 0,
-        "isMultiSimSupported": 0,
-        "isNetworkRoaming": 0,
-        "isPremiumCapabilityAvailableForPurchase": 0,
-        "isRadioInterfaceCapabilitySupported": 0,
-        "isRttSupported": 0,
-        "isSmsCapable": 0,
-        "isTtyModeSupported": 0,
-        "isTtySupported": 0,
-        "isVoiceCapable": 0,
-        "isVoicemailVibrationEnabled": 0,
-        "isWorldPhone": 0,
-        "listen": 0,
-        "registerTelephonyCallback": 0,
-        "purchasePremiumCapability": 0,
-        "rebootModem": 0,
-        "requestCellInfoUpdate": 0,
-        "requestNetworkScan": 0,
-        "sendDialerSpecialCode": 0,
-        "sendEnvelopeWithStatus": 0,
-        "sendUssdRequest": 0,
-        "sendVisualVoicemailSms": 0,
-        "setAllowedNetworkTypesForReason": 0,
-        "setCallComposerStatus": 0,
-        "setDataEnabled": 0,
-        "setDataEnabledForReason": 0,
-        "setForbiddenPlmns": 0,
-        "setLine": 0,
-        "setCarrierPhoneNumber": 0,
-        "setNetworkSelectionModeAutomatic": 0,
-        "setNetworkSelectionModeManual": 0,
-        "setOperatorBrandOverride": 0,
-        "setPreferredNetworkTypeToGlobal": 0,
-        "setPreferredOpportunisticDataSubscription": 0,
-        "setSignalStrengthUpdateRequest": 0,
-        "setVisualVoicemailSmsFilterSettings": 0,
-        "setVoiceMailNumber": 0,
-        "setVoicemailRingtoneUri": 0,
-        "setVoicemailVibrationEnabled": 0,
-        "unregisterTelephonyCallback": 0,
-        "updateAvailableNetworks": 0,
-        "uploadCallComposerPicture": 0,
-        "createAppSpecificSmsToken": 0,
-        "createAppSpecificSmsTokenWithPackageInfo": 0,
-        "divideMessage": 0,
-        "downloadMultimediaMessage": 0,
-        "getDefault": 0,
-        "getCarrierConfigValues": 0,
-        "getSystemService": 0,
-        "getDefaultSmsSubscriptionId": 0,
-        "getSmsCapacityOnIcc": 0,
-        "getSmsManagerForSubscriptionId": 0,
-        "getSmsMessagesForFinancialApp": 0,
-        "getSmscAddress": 0,
-        "injectSmsPdu": 0,
-        "sendDataMessage": 0,
-        "sendMultimediaMessage": 0,
-        "sendMultipartTextMessage": 0,
-        "sendTextMessage": 0,
-        "sendTextMessageWithoutPersisting": 0,
-        "setSmscAddress": 0,
-        "addGpsStatusListener": 0,
-        "addNmeaListener": 0,
-        "addProximityAlert": 0,
-        "addTestProvider": 0,
-        "clearTestProviderEnabled": 0,
-        "clearTestProviderLocation": 0,
-        "clearTestProviderStatus": 0,
-        "getAllProviders": 0,
-        "getBestProvider": 0,
-        "getCurrentLocation": 0,
-        "getGnssAntennaInfos": 0,
-        "getGnssCapabilities": 0,
-        "getGnssHardwareModelName": 0,
-        "getGnssYearOfHardware": 0,
-        "getGpsStatus": 0,
-        "getLastKnownLocation": 0,
-        "getProvider": 0,
-        "getProviderProperties": 0,
-        "getProviders": 0,
-        "hasProvider": 0,
-        "isLocationEnabled": 0,
-        "isProviderEnabled": 0,
-        "registerAntennaInfoListener": 0,
-        "registerGnssMeasurementsCallback": 0,
-        "registerGnssNavigationMessageCallback": 0,
-        "registerGnssStatusCallback": 0,
-        "removeGpsStatusListener": 0,
-        "removeNmeaListener": 0,
-        "removeProximityAlert": 0,
-        "removeTestProvider": 0,
-        "removeUpdates": 0,
-        "requestFlush": 0,
-        "requestLocationUpdates": 0,
-        "requestSingleUpdate": 0,
-        "sendExtraCommand": 0,
-        "setTestProviderEnabled": 0,
-        "setTestProviderLocation": 0,
-        "setTestProviderStatus": 0,
-        "unregisterAntennaInfoListener": 0,
-        "unregisterGnssMeasurementsCallback": 0,
-        "unregisterGnssNavigationMessageCallback": 0,
-        "unregisterGnssStatusCallback": 0,
-        "abandonAudioFocus": 0,
-        "abandonAudioFocusRequest": 0,
-        "addOnActiveSessionsChangedListener": 0,
-        "addOnCommunicationDeviceChangedListener": 0,
-        "addOnModeChangedListener": 0,
-        "addOnPreferredMixerAttributesChangedListener": 0,
-        "adjustStreamVolume": 0,
-        "adjustSuggestedStreamVolume": 0,
-        "adjustVolume": 0,
-        "adjustVolumeGroupVolume": 0,
-        "clearCommunicationDevice": 0,
-        "clearPreferredMixerAttributes": 0,
-        "dispatchMediaKeyEvent": 0,
-        "generateAudioSessionId": 0,
-        "getActivePlaybackConfigurations": 0,
-        "getActiveRecordingConfigurations": 0,
-        "getAllowedCapturePolicy": 0,
-        "getAudioDevicesForAttributes": 0,
-        "getAudioHwSyncForSession": 0,
-        "getAvailableCommunicationDevices": 0,
-        "getCommunicationDevice": 0,
-        "getDevices": 0,
-        "getDirectPlaybackSupport": 0,
-        "getDirectProfilesForAttributes": 0,
-        "getEncodedSurroundMode": 0,
-        "getMicrophones": 0,
-        "getMode": 0,
-        "getParameters": 0,
-        "getPlaybackOffloadSupport": 0,
-        "getPreferredMixerAttributes": 0,
-        "getProperty": 0,
-        "getRingerMode": 0,
-        "getRouting": 0,
-        "getSpatializer": 0,
-        "getStreamMaxVolume": 0,
-        "getStreamMinVolume": 0,
-        "getStreamVolume": 0,
-        "getStreamVolumeDb": 0,
-        "getSupportedDeviceTypes": 0,
-        "getSupportedMixerAttributes": 0,
-        "getVibrateSetting": 0,
-        "getVolumeGroupIdForAttributes": 0,
-        "isBluetoothA": 0,
-        "isBluetoothScoAvailableOffCall": 0,
-        "isBluetoothScoOn": 0,
-        "isCallScreeningModeSupported": 0,
-        "isHapticPlaybackSupported": 0,
-        "isMicrophoneMute": 0,
-        "isMusicActive": 0,
-        "isOffloadedPlaybackSupported": 0,
-        "isRampingRingerEnabled": 0,
-        "isSpeakerphoneOn": 0,
-        "isStreamMute": 0,
-        "isSurroundFormatEnabled": 0,
-        "isVolumeFixed": 0,
-        "isVolumeGroupMuted": 0,
-        "isWiredHeadsetOn": 0,
-        "loadSoundEffects": 0,
-        "playSoundEffect": 0,
-        "registerAudioDeviceCallback": 0,
-        "registerAudioPlaybackCallback": 0,
-        "registerAudioRecordingCallback": 0,
-        "registerMediaButtonEventReceiver": 0,
-        "registerRemoteControlClient": 0,
-        "registerRemoteController": 0,
-        "removeOnCommunicationDeviceChangedListener": 0,
-        "removeOnModeChangedListener": 0,
-        "removeOnPreferredMixerAttributesChangedListener": 0,
-        "removeOnActiveSessionsChangedListener": 0,
-        "requestAudioFocus": 0,
-        "selectRoute": 0,
-        "setAllowedCapturePolicy": 0,
-        "setBluetoothA": 0,
-        "setBluetoothScoOn": 0,
-        "setCommunicationDevice": 0,
-        "setEncodedSurroundMode": 0,
-        "setMediaButtonReceiver": 0,
-        "setMicrophoneMute": 0,
-        "setMode": 0,
-        "setParameters": 0,
-        "setPreferredMixerAttributes": 0,
-        "setRingerMode": 0,
-        "setRouting": 0,
-        "setSpeakerphoneOn": 0,
-        "setStreamMute": 0,
-        "setStreamSolo": 0,
-        "setStreamVolume": 0,
-        "setSurroundFormatEnabled": 0,
-        "setVibrateSetting": 0,
-        "setWiredHeadsetOn": 0,
-        "shouldVibrate": 0,
-        "startBluetoothSco": 0,
-        "stopBluetoothSco": 0,
-        "unloadSoundEffects": 0,
-        "unregisterAudioDeviceCallback": 0,
-        "unregisterAudioPlaybackCallback": 0,
-        "unregisterAudioRecordingCallback": 0,
-        "unregisterMediaButtonEventReceiver": 0,
-        "unregisterRemoteControlClient": 0,
-        "unregisterRemoteController": 0,
-        "disconnect": 0,
-        "getErrorStream": 0,
-        "getFollowRedirects": 0,
-        "getHeaderField": 0,
-        "getHeaderFieldDate": 0,
-        "getHeaderFieldKey": 0,
-        "getInstanceFollowRedirects": 0,
-        "getPermission": 0,
-        "getRequestMethod": 0,
-        "getResponseCode": 0,
-        "getResponseMessage": 0,
-        "setChunkedStreamingMode": 0,
-        "setFixedLengthStreamingMode": 0,
-        "setFollowRedirects": 0,
-        "setInstanceFollowRedirects": 0,
-        "setRequestMethod": 0,
-        "usingProxy": 0,
-        "addDefaultNetworkActiveListener": 0,
-        "bindProcessToNetwork": 0,
-        "bindSocket": 0,
-        "createSocketKeepalive": 0,
-        "getActiveNetwork": 0,
-        "getActiveNetworkInfo": 0,
-        "getAllNetworkInfo": 0,
-        "getAllNetworks": 0,
-        "getBackgroundDataSetting": 0,
-        "getBoundNetworkForProcess": 0,
-        "getConnectionOwnerUid": 0,
-        "getDefaultProxy": 0,
-        "getLinkProperties": 0,
-        "getMultipathPreference": 0,
-        "getNetworkCapabilities": 0,
-        "getNetworkInfo": 0,
-        "getNetworkPreference": 0,
-        "getNetworkWatchlistConfigHash": 0,
-        "getProcessDefaultNetwork": 0,
-        "getRestrictBackgroundStatus": 0,
-        "isActiveNetworkMetered": 0,
-        "isDefaultNetworkActive": 0,
-        "isNetworkTypeValid": 0,
-        "openConnection": 0,
-        "registerBestMatchingNetworkCallback": 0,
-        "registerDefaultNetworkCallback": 0,
-        "registerNetworkCallback": 0,
-        "releaseNetworkRequest": 0,
-        "removeDefaultNetworkActiveListener": 0,
-        "reportBadNetwork": 0,
-        "reportNetworkConnectivity": 0,
-        "requestBandwidthUpdate": 0,
-        "requestNetwork": 0,
-        "reserveNetwork": 0,
-        "setIncludeOtherUidNetworks": 0,
-        "setNetworkPreference": 0,
-        "setProcessDefaultNetwork": 0,
-        "unregisterNetworkCallback": 0,
-        "abortBroadcast": 0,
-        "clearAbortBroadcast": 0,
-        "getAbortBroadcast": 0,
-        "getDebugUnregister": 0,
-        "getResultCode": 0,
-        "getResultData": 0,
-        "getResultExtras": 0,
-        "getSentFromPackage": 0,
-        "getSentFromUid": 0,
-        "goAsync": 0,
-        "isInitialStickyBroadcast": 0,
-        "isOrderedBroadcast": 0,
-        "onReceive": 0,
-        "peekService": 0,
-        "registerReceiver": 0,
-        "sendOrderedBroadcast": 0,
-        "setDebugUnregister": 0,
-        "setOrderedHint": 0,
-        "setResult": 0,
-        "setResultCode": 0,
-        "setResultData": 0,
-        "setResultExtras": 0,
-        "doFinal": 0,
-        "getAlgorithm": 0,
-        "getBlockSize": 0,
-        "getExemptionMechanism": 0,
-        "getIV": 0,
-        "getInstance": 0,
-        "getMaxAllowedKeyLength": 0,
-        "getMaxAllowedParameterSpec": 0,
-        "getOutputSize": 0,
-        "init": 0,
-        "unwrap": 0,
-        "update": 0,
-        "updateAAD": 0,
-        "wrap": 0,
-        "getAnnotation": 0,
-        "getAnnotations": 0,
-        "getAnnotationsByType": 0,
-        "getDeclaredAnnotation": 0,
-        "getDeclaredAnnotations": 0,
-        "getDeclaredAnnotationsByType": 0,
-        "isAccessible": 0,
-        "isAnnotationPresent": 0,
-        "setAccessible": 0,
-        "addPackageToPreferred": 0,
-        "resolveActivity": 0,
-        "queryIntentActivities": 0,
-        "addPermission": 0,
-        "addPermissionAsync": 0,
-        "addPreferredActivity": 0,
-        "addWhitelistedRestrictedPermission": 0,
-        "canPackageQuery": 0,
-        "canRequestPackageInstalls": 0,
-        "canonicalToCurrentPackageNames": 0,
-        "checkPermission": 0,
-        "checkSignatures": 0,
-        "clearInstantAppCookie": 0,
-        "clearPackagePreferredActivities": 0,
-        "currentToCanonicalPackageNames": 0,
-        "extendVerificationTimeout": 0,
-        "getActivityBanner": 0,
-        "getActivityIcon": 0,
-        "getActivityInfo": 0,
-        "getActivityLogo": 0,
-        "getAllPermissionGroups": 0,
-        "getApplicationBanner": 0,
-        "getApplicationEnabledSetting": 0,
-        "getApplicationIcon": 0,
-        "getApplicationInfo": 0,
-        "getApplicationLabel": 0,
-        "getApplicationLogo": 0,
-        "getArchivedPackage": 0,
-        "getBackgroundPermissionOptionLabel": 0,
-        "getChangedPackages": 0,
-        "getComponentEnabledSetting": 0,
-        "getDefaultActivityIcon": 0,
-        "getDrawable": 0,
-        "getGroupOfPlatformPermission": 0,
-        "getInstallSourceInfo": 0,
-        "getInstalledApplications": 0,
-        "getInstalledModules": 0,
-        "getInstalledPackages": 0,
-        "getInstallerPackageName": 0,
-        "getInstantAppCookie": 0,
-        "getInstantAppCookieMaxBytes": 0,
-        "getInstrumentationInfo": 0,
-        "getLaunchIntentForPackage": 0,
-        "getLaunchIntentSenderForPackage": 0,
-        "getLeanbackLaunchIntentForPackage": 0,
-        "getMimeGroup": 0,
-        "getModuleInfo": 0,
-        "getNameForUid": 0,
-        "getPackageArchiveInfo": 0,
-        "getPackageGids": 0,
-        "getPackageInfo": 0,
-        "getPackageInstaller": 0,
-        "getPackageUid": 0,
-        "getPackagesForUid": 0,
-        "getPackagesHoldingPermissions": 0,
-        "getPermissionGroupInfo": 0,
-        "getPermissionInfo": 0,
-        "getPlatformPermissionsForGroup": 0,
-        "getPreferredActivities": 0,
-        "getPreferredPackages": 0,
-        "getProviderInfo": 0,
-        "getReceiverInfo": 0,
-        "getResourcesForActivity": 0,
-        "getResourcesForApplication": 0,
-        "getServiceInfo": 0,
-        "getSharedLibraries": 0,
-        "getSuspendedPackageAppExtras": 0,
-        "getSyntheticAppDetailsActivityEnabled": 0,
-        "getSystemAvailableFeatures": 0,
-        "getSystemSharedLibraryNames": 0,
-        "getTargetSdkVersion": 0,
-        "getText": 0,
-        "getUserBadgedDrawableForDensity": 0,
-        "getUserBadgedIcon": 0,
-        "getUserBadgedLabel": 0,
-        "getVerifiedSigningInfo": 0,
-        "getWhitelistedRestrictedPermissions": 0,
-        "getXml": 0,
-        "hasSigningCertificate": 0,
-        "isAppArchivable": 0,
-        "isAutoRevokeWhitelisted": 0,
-        "isDefaultApplicationIcon": 0,
-        "isDeviceUpgrading": 0,
-        "isInstantApp": 0,
-        "isPackageStopped": 0,
-        "isPackageSuspended": 0,
-        "isPermissionRevokedByPolicy": 0,
-        "isSafeMode": 0,
-        "parseAndroidManifest": 0,
-        "queryActivityProperty": 0,
-        "queryApplicationProperty": 0,
-        "queryBroadcastReceivers": 0,
-        "queryContentProviders": 0,
-        "queryInstrumentation": 0,
-        "queryIntentActivityOptions": 0,
-        "queryIntentContentProviders": 0,
-        "queryIntentServices": 0,
-        "queryPermissionsByGroup": 0,
-        "queryProviderProperty": 0,
-        "queryReceiverProperty": 0,
-        "queryServiceProperty": 0,
-        "relinquishUpdateOwnership": 0,
-        "removePackageFromPreferred": 0,
-        "removePermission": 0,
-        "removeWhitelistedRestrictedPermission": 0,
-        "requestChecksums": 0,
-        "resolveContentProvider": 0,
-        "resolveService": 0,
-        "setApplicationCategoryHint": 0,
-        "setApplicationEnabledSetting": 0,
-        "setAutoRevokeWhitelisted": 0,
-        "setComponentEnabledSetting": 0,
-        "setComponentEnabledSettings": 0,
-        "setInstallerPackageName": 0,
-        "setMimeGroup": 0,
-        "updateInstantAppCookie": 0,
-        "verifyPendingInstall": 0,
-    }
-    os.makedirs("./sensitive_apis_data/", exist_ok=True)
-    for filename in os.listdir(directory):
-        apkname = filename.replace('_callgraph.gml', '')
+        tuple: The labels of the methods whose class path contains one of the
+               sensitive API classes, e.g. Landroid/telephony/TelephonyManager;->getDeviceId()Ljava/lang/String;
+               and the set of nodes whose label without its ' [access_flags=...]' suffix is one of them.
+    """
+    sensitive_api_malware = {label for label in set(labels) if is_sensitive_label(label)}
+    return sensitive_api_malware, {node for node, label in enumerate(labels)
+                                   if label.split(' [', 1)[0] in sensitive_api_malware}
+
+
+def sensitive_apis_from_callgraph(graph):
+    """
+    Looks up the sensitive API calls in a CompactGraph callgraph.
+
+    Returns:
+        dict: A dictionary where keys are sensitive API method names and values
+              are 1 if the method is called between sensitive APIs, and 0 otherwise.
+    """
+    sensitive_apis_map_current = sentitive_apis_map.copy()
+    labels = graph.labels
+
+    sensitive_api_malware, data = sensitive_nodes(labels)
+
+    print('\033[93m' + "Total Sensitive API Calls found in the MALWARE: " + str(len(sensitive_api_malware)))
+
+    # Getting the CALLER and CALLEE relationship between the Sensitive API's fetched above:
+    # every sensitive API that is called, and every sensitive API calling another one.
+    listing = set()
+    offsets, callers = graph.offsets, graph.callers
+    for i in data:
+        if offsets[i] != offsets[i + 1]:
+            listing.add(labels[i])
+        for k in callers[offsets[i]:offsets[i + 1]]:
+            if k in data:
+                listing.add(labels[k])
+
+    # Resolving every API name through its class and method name, e.g.
+    # Landroid/telephony/TelephonyManager;->getDeviceId()Ljava/lang/String; -> getDeviceId
+    for label in sorted(listing):
+        print('\033[96m' + label)
+        key = sensitive_api_signatures.get(label.split('(', 1)[0])
+        if key is not None:
+            sensitive_apis_map_current[key] = 1
+
+    return sensitive_apis_map_current
+
+
+def sensitive_apis_from_dex(dex_members):
+    """
+    Looks up the sensitive API calls in the method_ids tables of the dex
+    members of an APK, see dex_scan.method_references. Unlike
+    sensitive_apis_from_callgraph it marks every sensitive API the app
+    references, without building a callgraph.
+
+    Returns:
+        dict: A dictionary where keys are sensitive API method names and values
+              are 1 if the method is referenced, and 0 otherwise.
+    """
+    sensitive_apis_map_current = sentitive_apis_map.copy()
+    for _, dex_bytes in dex_members:
+        for signature in dex_scan.method_references(dex_bytes, sensitive_api_descriptors):
+            key = sensitive_api_signatures.get(signature)
+            if key is not None:
+                sensitive_apis_map_current[key] = 1
+    return sensitive_apis_map_current
+
+
+def extract_sensitive_apis(filenames=None, workdir="./"):
+    directory = os.path.join(workdir, "callgraphs")
+    if filenames is None:
+        filenames = os.listdir(directory)
+    for filename in filenames:
+        if not os.path.isfile(os.path.join(directory, filename)):
+            continue
+        apkname = filename.replace('_callgraph.gml', '').replace('_callgraph.cgb', '')
         analyze = os.path.join(directory, filename)
-        output_file_path = os.path.join("./sensitive_apis_data/", apkname)
-        sensitive_apis_map_current = sentitive_apis_map.copy()
-        with open(f"{output_file_path}.csv", "w", encoding="utf-8") as output_file:
-            output_file.write("name,")  # First column is "name"
-            output_file.write(",".join(sentitive_apis_map.keys()))  # Permission keys as columns
-            output_file.write("\n")  # End of header line
-            # Reading the Callgraphs created using androguard tool
-            G2 = nx.read_gml(analyze, label='label')
-
-            # List containing the names of all the sensitive API classes.
-            sensitive_api = ['TelephonyManager', 'SmsManager', 'LocationManager', 'AudioManager', 'HttpURLConnection',
-                             'ConnectivityManager', 'BroadcastReceiver', 'Cipher', 'AccessibleObject', 'PackageManager']
-
-            sensitive_api_malware = []
-
-            count_api_in_malware = 0
-
-            # Using Regex to fetch all the sensitive API calls from the call graphs and counting the TOTAL number of sensitive API in Application
-            for j in sensitive_api:
-                for i in G2.nodes():
-                    data = re.split('[;]', i)
-                    data1 = re.split('/', data[0])
-                    for k in data1:
-                        if k in sensitive_api:
-                            if i in sensitive_api_malware:
-                                continue
-                            else:
-                                sensitive_api_malware.append(i)
-                                count_api_in_malware = count_api_in_malware + 1
-
-            print('\033[93m' + "Total Sensitive API Calls found in the MALWARE: " + str(count_api_in_malware))
-
-            # Reading the graph of the Application
-            G = nx.read_gml('callgraph.gml', label='id')
-
-            data = []
-
-            b = nx.get_node_attributes(G, 'label')
-
-            for keys, values in b.items():
-                splitting = re.split('[[]', values)
-                if splitting[0] in sensitive_api_malware:
-                    data.append(keys)
-
-            # Getting the CALLER and CALLEE relationship between the Sensitive API's fetched above.
-            listing = []
-            U = nx.DiGraph()
-            counter_in_degree = 0
-            for i in data:
-
-                a = G.in_edges(i)
-                for j in a:
-                    b = list(j)
-                    for k in b:
-                        if k in data:
-                            if G.nodes[k]['label'] not in listing:
-                                listing.append(G.nodes[k]['label'])
-                                counter_in_degree = counter_in_degree + G.in_degree(i)
-                            else:
-                                continue
-                        else:
-                            continue
-
-            # Sorting the API names in ascending order to construct a DiGraph showing a relation between caller and callee.
-            sensitive_api_in_malware_name = []
-            for el in sorted(listing):
-                sensitive_api_in_malware_name.append(el)
-
-            for i in range(0, len(sensitive_api_in_malware_name)):
-                print('\033[96m' + sensitive_api_in_malware_name[i])
-                for key in sentitive_apis_map:
-                    if key in sensitive_api_in_malware_name[i]:
-                        sensitive_apis_map_current[key] = 1
-            output_file.write(
-                ",".join(map(str, sensitive_apis_map_current.values())))  # Write permission values
+        # Reading the Callgraphs created using androguard tool, as GML text or in the binary format
+        graph = compact_graph.read_callgraph(analyze)
+        sensitive_apis_map_current = sensitive_apis_from_callgraph(graph)
+        write_sensitive_api_features(apkname, sensitive_apis_map_current)
+
+
+def sensitive_callgraph(dx):
+    """
+    Builds the part of the callgraph of an androguard Analysis that
+    sensitive_apis_from_callgraph looks at: the methods of the sensitive API
+    classes and the edges from their direct callers. Only the cross-references
+    of the sensitive classes are visited, so the graph grows with the use of
+    sensitive APIs instead of the size of the app. The analysis only needs
+    the cross-references of the classes that invoke a sensitive API method.
+
+    Returns:
+        CompactGraph: The pruned callgraph, labelled like the full one.
+    """
+    node_ids = {}
+    labels = []
+    sources = array('i')
+    targets = array('i')
+
+    def node(method):
+        if method not in node_ids:
+            node_ids[method] = len(labels)
+            labels.append(str(method))
+        return node_ids[method]
+
+    for class_analysis in dx.get_classes():
+        if not is_sensitive_label(class_analysis.name):
+            continue
+        for method_analysis in class_analysis.get_methods():
+            callee = node(method_analysis.get_method())
+            for _, caller, _ in method_analysis.get_xref_from():
+                sources.append(node(caller.get_method()))
+                targets.append(callee)
+    return compact_graph.CompactGraph.from_edges(labels, sources, targets)
+
+
+def full_callgraph(CG):
+    """
+    Converts the networkx callgraph of an androguard Analysis to a CompactGraph,
+    numbering the methods the same way 'androguard cg' does when it writes the GML.
+    """
+    node_ids = {}
+    labels = []
+    for node in CG.nodes():
+        node_ids[node] = len(labels)
+        labels.append(str(node))
+    return compact_graph.CompactGraph.from_edges(labels, array('i', (node_ids[u] for u, v in CG.edges())),
+                                                 array('i', (node_ids[v] for u, v in CG.edges())))
+
+
+def write_compact_gml(graph, path):
+    """Writes a CompactGraph as GML, with the method labels as node labels."""
+    G = nx.DiGraph()
+    G.add_nodes_from(graph.labels)
+    for node in range(len(graph)):
+        G.add_edges_from((graph.labels[caller], graph.labels[node]) for caller in graph.callers_of(node))
+    nx.write_gml(G, path)
+
+
+def read_manifest_in_process(filepath, apk):
+    """
+    Decodes the manifest of an open ApkReader with the axml decoder, falling
+    back to androguard's own decoder, which copes with more kinds of damage.
+
+    Returns:
+        Element: The root <manifest> element.
+    """
+    try:
+        return axml.read_manifest(filepath, apk)
+    except axml.AXMLError:
+        from androguard.core.axml import AXMLPrinter
+        return ET.fromstring(AXMLPrinter(apk.manifest()).get_xml())
+
+
+def target_sdk_version(manifest):
+    uses_sdk = manifest.find('uses-sdk')
+    if uses_sdk is None:
+        return None
+    return uses_sdk.get('{http://schemas.android.com/apk/res/android}targetSdkVersion')
+
+
+def build_analysis(dex_members, target_sdk=None, skip_prefixes=None, xref_classes=None):
+    """
+    Builds the same androguard Analysis AnalyzeAPK builds, minus the
+    decompiler, from (name, content) pairs of dex files. skip_prefixes holds
+    a tuple of package prefixes per dex file whose classes are left out of
+    the cross-reference pass, xref_classes a set of class descriptors per
+    dex file that are the only ones cross-referenced.
+    """
+    # Only the androguard engine needs androguard, the dexscan and manifest engines run without it
+    from androguard.core import dex
+    from androguard.core.analysis.analysis import Analysis
+
+    dx = Analysis()
+    vms = []
+    for _, dex_bytes in dex_members:
+        vm = dex.DEX(dex_bytes, using_api=target_sdk)
+        dx.add(vm)
+        vms.append(vm)
+    if (not skip_prefixes or not any(skip_prefixes)) and xref_classes is None:
+        dx.create_xref()
+        return dx
+
+    # What create_xref does, class by class, minus the skipped classes
+    for position, vm in enumerate(vms):
+        prefixes = skip_prefixes[position] if skip_prefixes else ()
+        selected = xref_classes[position] if xref_classes is not None else None
+        for current_class in vm.get_classes():
+            name = current_class.get_name()
+            if (selected is None or name in selected) and not name.startswith(prefixes):
+                dx._create_xref(current_class)
+    return dx
+
+
+def find_libraries(dex_members, libraries):
+    """
+    Looks the bundled libraries of every dex file up in a LibraryIndex.
+
+    Returns:
+        tuple: The package prefixes of the known libraries per dex file, the
+               sensitive API keys they call and the classes of the unknown
+               libraries, mapped to their prefix and fingerprint.
+    """
+    skip_prefixes = []
+    known_keys = set()
+    unknown = {}
+    for _, dex_bytes in dex_members:
+        prefixes = ()
+        for prefix, (library_sha256, descriptors) in libraries.libraries(dex_bytes).items():
+            keys = libraries.get(library_sha256)
+            if keys is None:
+                unknown.update(dict.fromkeys(descriptors, (prefix, library_sha256)))
+            else:
+                prefixes += (prefix,)
+                known_keys.update(keys)
+        skip_prefixes.append(prefixes)
+    return skip_prefixes, known_keys, unknown
+
+
+def library_contributions(graph, unknown):
+    """
+    Collects the sensitive API keys the classes of every unknown library add
+    to sensitive_apis_from_callgraph: the sensitive API nodes they call, and
+    their own methods among those nodes calling one. Adding them back gives
+    the same result when the library is left out of the callgraph.
+
+    Returns:
+        dict: The set of keys of every (prefix, fingerprint) library, empty
+              for a library that calls no sensitive API.
+    """
+    contributions = {library: set() for library in unknown.values()}
+    labels = graph.labels
+    _, data = sensitive_nodes(labels)
+    for node in data:
+        for caller in graph.callers_of(node):
+            library = unknown.get(labels[caller].split('->', 1)[0])
+            if library is None:
+                continue
+            for listed in (node, caller) if caller in data else (node,):
+                key = sensitive_api_signatures.get(labels[listed].split('(', 1)[0])
+                if key is not None:
+                    contributions[library].add(key)
+    return contributions
+
+
+def sensitive_analysis(dex_members, target_sdk=None, callgraph_scope="sensitive", libraries=None):
+    """
+    Builds the androguard Analysis and the callgraph of dex files and looks
+    up their sensitive API calls.
+
+    With a LibraryIndex the classes of the libraries it knows are left out of
+    the analysis and their sensitive API keys are added to the result instead.
+    What the unknown libraries call is stored in the index for the next APK.
+
+    Returns:
+        tuple: The networkx callgraph (None with callgraph_scope "sensitive"),
+               the CompactGraph and the sensitive API dictionary.
+    """
+    dex_members = list(dex_members)
+    skip_prefixes, known_keys, unknown = None, set(), {}
+    if libraries is not None:
+        skip_prefixes, known_keys, unknown = find_libraries(dex_members, libraries)
+
+    CG = None
+    if callgraph_scope == "sensitive":
+        # Only the classes that invoke a sensitive API method add edges to the sensitive callgraph
+        xref_classes = [dex_scan.invoking_classes(dex_bytes, is_sensitive_label) for _, dex_bytes in dex_members]
+        graph = sensitive_callgraph(build_analysis(dex_members, target_sdk, skip_prefixes, xref_classes))
+    else:
+        CG = build_analysis(dex_members, target_sdk, skip_prefixes).get_call_graph()
+        graph = full_callgraph(CG)
+
+    sensitive_apis_map_current = sensitive_apis_from_callgraph(graph)
+    for key in known_keys:
+        sensitive_apis_map_current[key] = 1
+    for (prefix, library_sha256), keys in library_contributions(graph, unknown).items():
+        libraries.put(library_sha256, prefix, keys)
+    return CG, graph, sensitive_apis_map_current
+
+
+def analyze_dex_in_process(filepath, dex_name, target_sdk=None, callgraph_scope="sensitive", libraries=None):
+    """
+    Computes the sensitive API features of a single dex member of an APK,
+    so the dex files of a multi-dex APK can be analyzed in parallel. The
+    results of all members are merged with merge_sensitive_apis.
+
+    Returns:
+        dict: The sensitive API dictionary of the dex member.
+    """
+    with apk_reader.ApkReader(filepath) as apk:
+        dex_bytes = apk.read(dex_name)
+    return sensitive_analysis([(dex_name, dex_bytes)], target_sdk, callgraph_scope, libraries)[2]
+
+
+def merge_sensitive_apis(parts):
+    """
+    Merges the sensitive API dictionaries of the dex members of an APK. The
+    sensitive APIs are framework methods, so the callers of one are found in
+    whichever dex file calls it and a method is marked if any member marks it.
+    """
+    sensitive_apis_map_current = sentitive_apis_map.copy()
+    for part in parts:
+        for key, value in part.items():
+            if value:
+                sensitive_apis_map_current[key] = value
+    return sensitive_apis_map_current
+
+
+def analyze_apk_in_process(filepath, workdir="./", callgraph_format=None, callgraph_scope="sensitive",
+                           libraries=None):
+    """
+    Opens an APK once and computes its permission, intent and sensitive API
+    features straight from the in-memory androguard analysis, without apktool
+    or the 'androguard cg' subprocess. The manifest and the dex members are read
+    from a single memory-mapped ApkReader and never written to disk.
+
+    With callgraph_scope "sensitive" only the classes that invoke a sensitive
+    API method are cross-referenced, see dex_scan.invoking_classes, and only
+    the methods of the sensitive API classes and their callers are put in the
+    callgraph, see sensitive_callgraph, "full" converts the whole callgraph.
+    Both give the same features. With a LibraryIndex the known bundled
+    libraries are not analyzed, see sensitive_analysis.
+
+    The callgraph is only serialized to <workdir>/callgraphs/ when a callgraph_format
+    ("gml" or the binary "cgb") is given.
+
+    Returns:
+        tuple: The permission, intent action and sensitive API dictionaries.
+    """
+    filename = os.path.basename(filepath)
+    with apk_reader.ApkReader(filepath) as apk:
+        manifest = read_manifest_in_process(filepath, apk)
+        current_permissions, all_current_intents = analyze_manifest(manifest, filename)
+        CG, graph, sensitive_apis_map_current = \
+            sensitive_analysis(apk.dex_members(), target_sdk_version(manifest), callgraph_scope, libraries)
+
+    if callgraph_format:
+        callgraphs_dir = os.path.join(workdir, "callgraphs")
+        os.makedirs(callgraphs_dir, exist_ok=True)
+        callgraph_dest = os.path.join(callgraphs_dir, f"{filename.replace('.apk', '')}_callgraph.{callgraph_format}")
+        if callgraph_format == "cgb":
+            compact_graph.write_cgb(graph, callgraph_dest)
+        elif CG is not None:
+            nx.write_gml(CG, callgraph_dest, stringizer=str)
+        else:
+            write_compact_gml(graph, callgraph_dest)
+
+    return current_permissions, all_current_intents, sensitive_apis_map_current
+
+
+def analyze_apk_dexscan(filepath, workdir="./", decoder="axml"):
+    """
+    Computes the permission, intent and sensitive API features of an APK
+    without androguard: the manifest is decoded with decode_manifest and the
+    sensitive APIs are read from the method_ids tables of its dex members.
+
+    Returns:
+        tuple: The permission, intent action and sensitive API dictionaries.
+    """
+    with apk_reader.ApkReader(filepath) as apk:
+        manifest = decode_manifest(filepath, workdir, decoder, apk)
+        current_permissions, all_current_intents = analyze_manifest(manifest, os.path.basename(filepath))
+        sensitive_apis_map_current = sensitive_apis_from_dex(apk.dex_members())
+    return current_permissions, all_current_intents, sensitive_apis_map_current
 
 
 def extract_static_data(directory):
     extract_manifests(directory)
-    extract_permissions()
-    extract_intent_actions()
+    extract_manifest_data()
 
 
 def extract_dynamic_data(directory):
@@ -1403,25 +1851,753 @@ def extract_dynamic_data(directory):
     extract_sensitive_apis()
 
 
+def archive_artifacts(workdir, apkname, callgraph_format="gml"):
+    """
+    Copies the manifest and callgraph of an APK out of its scratch directory
+    into ./manifests/ and ./callgraphs/, converting a GML callgraph to the
+    binary format first when callgraph_format is "cgb".
+    """
+    gml_path = os.path.join(workdir, "callgraphs", f"{apkname}_callgraph.gml")
+    if callgraph_format == "cgb" and os.path.isfile(gml_path):
+        compact_graph.write_cgb(compact_graph.read_gml(gml_path), gml_path[:-len(".gml")] + ".cgb")
+        os.remove(gml_path)
+
+    for subdir, suffix in (("manifests", "_AndroidManifest.xml"), ("callgraphs", "_callgraph.gml"),
+                           ("callgraphs", "_callgraph.cgb")):
+        artifact = os.path.join(workdir, subdir, apkname + suffix)
+        if os.path.isfile(artifact):
+            os.makedirs(os.path.join("./", subdir), exist_ok=True)
+            with open(artifact, "rb") as input_file, \
+                    progress_journal.atomic_output(os.path.join("./", subdir, apkname + suffix), "wb") as output_file:
+                shutil.copyfileobj(input_file, output_file)
+
+
+@functools.lru_cache(maxsize=None)
+def feature_fingerprint(engine):
+    """
+    Fingerprint of everything that decides the feature values besides the
+    APK itself: the vocabularies, the sensitive API signature table and the engine.
+    """
+    return extraction_cache.vocabulary_fingerprint(list(permissions), list(all_intent_actions),
+                                                   list(sentitive_apis_map), sorted(sensitive_api_signatures.items()),
+                                                   engine)
+
+
+@functools.lru_cache(maxsize=None)
+def dex_fingerprint(engine):
+    """
+    Fingerprint of the per-dex cache entries: the sensitive API vocabulary,
+    the signature table and the engine that analyzed the dex file.
+    """
+    return extraction_cache.vocabulary_fingerprint(list(sentitive_apis_map), sorted(sensitive_api_signatures.items()),
+                                                   engine, "dex")
+
+
+# Outputs every engine produces per APK, as recorded in the progress journal:
+# "manifest" is the permission and intent CSVs, "sensitive_apis" the sensitive API CSV
+ENGINE_STAGES = {
+    "androguard": ("manifest", "sensitive_apis"),
+    "cg": ("manifest", "sensitive_apis"),
+    "dexscan": ("manifest", "sensitive_apis"),
+    "manifest": ("manifest",),
+}
+
+# Engines that read the APK themselves in the analyze stage, nothing is unpacked for them
+IN_PROCESS_ENGINES = ("androguard", "dexscan")
+
+
+def open_cache(options):
+    if not options.cache:
+        return None
+    return extraction_cache.ExtractionCache(options.cache, options.cache_size * 1024 * 1024)
+
+
+@functools.lru_cache(maxsize=None)
+def library_fingerprint():
+    """
+    Fingerprint of the library index entries: the sensitive API vocabulary,
+    the signature table and the library package prefixes.
+    """
+    return extraction_cache.vocabulary_fingerprint(list(sentitive_apis_map), sorted(sensitive_api_signatures.items()),
+                                                   list(library_index.LIBRARY_PREFIXES), "library")
+
+
+def open_library_index(options):
+    """
+    Opens the library index of the androguard engine, kept in the extraction
+    cache. Kept callgraphs must cover the libraries too, so they disable it.
+    """
+    if options.engine != "androguard" or not options.library_index or options.keep_artifacts:
+        return None
+    cache = open_cache(options)
+    if cache is None:
+        return None
+    return library_index.LibraryIndex(cache, library_fingerprint())
+
+
+def discard_workdir(job):
+    if job["workdir"] is not None:
+        shutil.rmtree(job["workdir"], ignore_errors=True)
+        job["workdir"] = None
+
+
+def split_dex_enabled(options):
+    """
+    Tells whether APKs may be analyzed dex by dex, for parallelism or for the
+    per-dex cache. Kept callgraphs need the whole APK in one analysis, so they
+    disable it.
+    """
+    return options.engine == "androguard" and not options.keep_artifacts and \
+        (options.split_dex_size > 0 or dex_cache_enabled(options))
+
+
+def dex_cache_enabled(options):
+    return options.engine == "androguard" and options.cache and options.dex_cache and not options.keep_artifacts
+
+
+def unpack_apk(filepath, options, sha256=None):
+    """
+    Unpack stage of the pipeline. Hashes the APK and looks it up in the
+    extraction cache. On a miss it prepares a scratch directory with
+    everything the analyze stage needs: the decoded manifest for the cg and
+    manifest engines and the callgraph written by 'androguard cg' for the cg
+    engine. The androguard and dexscan engines read the APK themselves, so
+    nothing is unpacked. For an androguard APK whose dex members are at least
+    options.split_dex_size MB, the manifest is decoded and the dex names are
+    listed in job["dex_names"] so every dex file is analyzed as its own task.
+
+    With the per-dex cache every androguard APK is split: each dex member is
+    looked up on its own by its apk_reader member_digest, which needs no
+    inflating, the cached results go to job["dex_parts"]
+    and only the dex files that missed are left in job["dex_names"]. When all
+    of them hit the job is completed right here.
+
+    An apktool decode tree is removed as soon as the manifest is read from it.
+    sha256 is the content hash of the APK when it is known already.
+
+    Returns:
+        dict: The job of the APK. "entry" holds the cached features on a hit,
+              "error" the reason the APK failed.
+    """
+    directory, filename = os.path.split(filepath)
+    job = {"filepath": filepath, "filename": filename, "apkname": filename.replace('.apk', ''),
+           "start": time.time(), "sha256": None, "entry": None, "workdir": None, "manifest": None,
+           "features": None, "dex_names": None, "dex_hashes": None, "dex_parts": None, "dex_features": None,
+           "degraded": None, "aliases": [], "error": None}
+    reader = None
+    try:
+        cache = open_cache(options)
+        if cache is not None or options.engine not in IN_PROCESS_ENGINES or split_dex_enabled(options):
+            reader = apk_reader.ApkReader(filepath)
+        if cache is not None:
+            job["sha256"] = sha256 or reader.sha256()
+            job["entry"] = cache.get(job["sha256"], feature_fingerprint(options.engine))
+            if job["entry"] is not None:
+                return job
+
+        job["workdir"] = tempfile.mkdtemp(prefix=f"{job['apkname']}_", dir=options.scratch)
+        if dex_cache_enabled(options):
+            job["manifest"] = read_manifest_in_process(filepath, reader)
+            job["dex_hashes"] = {dex_name: reader.member_digest(dex_name) for dex_name in reader.dex_names()}
+            job["dex_parts"] = {}
+            for dex_name, dex_digest in job["dex_hashes"].items():
+                entry = cache.get(dex_digest, dex_fingerprint(options.engine))
+                if entry is not None:
+                    job["dex_parts"][dex_name] = dict(zip(sentitive_apis_map, entry["sensitive_apis"]))
+            job["dex_names"] = [dex_name for dex_name in job["dex_hashes"] if dex_name not in job["dex_parts"]]
+            if job["dex_parts"]:
+                print(f"Reusing {len(job['dex_parts'])} of {len(job['dex_hashes'])} dex analyses for: {filepath}")
+            if not job["dex_names"]:
+                return merge_dex_jobs(job, {})
+        elif split_dex_enabled(options) and options.split_dex_size > 0 and len(reader.dex_names()) > 1 \
+                and reader.dex_size() >= options.split_dex_size * 1024 * 1024:
+            job["manifest"] = read_manifest_in_process(filepath, reader)
+            job["dex_names"] = reader.dex_names()
+        if options.engine not in IN_PROCESS_ENGINES:
+            print(f"Decoding: {filepath}")
+            job["manifest"] = decode_manifest(filepath, job["workdir"], options.manifest_decoder, reader,
+                                              options.timeout)
+            shutil.rmtree(os.path.join(job["workdir"], "apkd"), ignore_errors=True)
+            if options.engine == "cg" and \
+                    extract_callgraph(directory, [filename], job["workdir"], options.timeout, options.memory_limit):
+                job["degraded"] = "the callgraph extraction exceeded its budget"
+    except Exception as e:
+        print(f"Error unpacking {filepath}: {e}")
+        job["error"] = str(e)
+        discard_workdir(job)
+    finally:
+        if reader is not None:
+            reader.close()
+    return job
+
+
+def analyze_dex_job(job, dex_name, options):
+    """
+    Analyze stage task of one dex member of a split APK, see unpack_apk.
+
+    Returns:
+        dict: The sensitive API dictionary of the dex member.
+    """
+    print(f"Analyzing {dex_name} of: {job['filepath']}")
+    with analysis_budget.time_budget(options.timeout):
+        return analyze_dex_in_process(job["filepath"], dex_name, target_sdk_version(job["manifest"]),
+                                      options.callgraph_scope, open_library_index(options))
+
+
+def degrade_job(job, reason):
+    """
+    Falls back to the manifest features of an APK whose sensitive API
+    analysis exceeded its budget. The sensitive API CSV is written flagged
+    as missing, see write_sensitive_api_features.
+    """
+    print(f"Falling back to the manifest features of {job['filepath']}: {reason}")
+    root = job["manifest"]
+    if root is None:
+        with apk_reader.ApkReader(job["filepath"]) as apk:
+            root = read_manifest_in_process(job["filepath"], apk)
+    current_permissions, all_current_intents = analyze_manifest(root, job["filename"])
+    job["features"] = (current_permissions, all_current_intents, None)
+    job["degraded"] = reason
+
+
+def merge_dex_jobs(job, parts):
+    """
+    Completes a split APK once all its dex members are analyzed: extracts the
+    manifest features and merges the sensitive API dictionaries of the parts,
+    a dictionary from dex name to result, with the cached ones in
+    job["dex_parts"]. A part that failed is passed as its exception and fails
+    the APK, one that exceeded its budget or whose worker died degrades it to
+    the manifest features.
+    With the per-dex cache, the analyzed parts are kept in job["dex_features"]
+    for it.
+
+    Returns:
+        dict: The job.
+    """
+    try:
+        for part in parts.values():
+            if isinstance(part, (analysis_budget.BudgetExceeded, worker_pool.WorkerLost)):
+                degrade_job(job, str(part))
+                return job
+        for part in parts.values():
+            if isinstance(part, BaseException):
+                raise part
+        current_permissions, all_current_intents = analyze_manifest(job["manifest"], job["filename"])
+        cached_parts = list((job["dex_parts"] or {}).values())
+        sensitive_apis_map_current = merge_sensitive_apis(list(parts.values()) + cached_parts)
+        job["features"] = (current_permissions, all_current_intents, sensitive_apis_map_current)
+        if job["dex_hashes"] is not None:
+            job["dex_features"] = parts
+    except Exception as e:
+        print(f"Error processing {job['filepath']}: {e}")
+        job["error"] = str(e)
+    finally:
+        discard_workdir(job)
+        job["manifest"] = None
+    return job
+
+
+def extract_job_features(job, options):
+    """
+    Extracts the features of an unpacked APK with the engine of the options.
+
+    Returns:
+        tuple: The permission, intent action and sensitive API dictionaries,
+               the latter None when the engine does not extract it.
+    """
+    filepath, filename, apkname, workdir = job["filepath"], job["filename"], job["apkname"], job["workdir"]
+    if options.engine == "androguard":
+        callgraph_format = options.callgraph_format if options.keep_artifacts else None
+        return analyze_apk_in_process(filepath, workdir, callgraph_format, options.callgraph_scope,
+                                      open_library_index(options))
+    if options.engine == "dexscan":
+        return analyze_apk_dexscan(filepath, workdir, options.manifest_decoder)
+
+    root = job["manifest"]
+    current_permissions, all_current_intents = analyze_manifest(root, filename)
+    if options.keep_artifacts:
+        manifest_dest = os.path.join(workdir, "manifests", f"{apkname}_AndroidManifest.xml")
+        if not os.path.isfile(manifest_dest):
+            os.makedirs(os.path.dirname(manifest_dest), exist_ok=True)
+            ET.ElementTree(root).write(manifest_dest, encoding="utf-8")
+
+    sensitive_apis_map_current = None
+    callgraph_path = os.path.join(workdir, "callgraphs", f"{apkname}_callgraph.gml")
+    if options.engine == "cg" and os.path.isfile(callgraph_path):
+        sensitive_apis_map_current = sensitive_apis_from_callgraph(compact_graph.read_gml(callgraph_path))
+    return current_permissions, all_current_intents, sensitive_apis_map_current
+
+
+def analyze_job(job, options):
+    """
+    Analyze stage of the pipeline, run in the worker processes. Extracts the
+    features of an unpacked APK into job["features"] and removes its scratch
+    directory, after archiving the manifest and callgraph with keep_artifacts.
+
+    The analysis runs within options.timeout seconds, an APK that takes
+    longer or runs out of memory keeps its manifest features, see degrade_job.
+    A split APK never comes here, run_pipeline dispatches its dex members as
+    analyze_dex_job tasks.
+
+    Returns:
+        dict: The job.
+    """
+    if job["entry"] is not None or job["error"] is not None or job["features"] is not None:
+        return job
+    filepath = job["filepath"]
+    try:
+        print(f"Analyzing: {filepath}")
+        try:
+            with analysis_budget.time_budget(options.timeout):
+                job["features"] = extract_job_features(job, options)
+        except analysis_budget.BudgetExceeded as e:
+            if options.engine == "manifest":
+                raise
+            degrade_job(job, str(e))
+
+        if options.keep_artifacts:
+            archive_artifacts(job["workdir"], job["apkname"], options.callgraph_format)
+    except Exception as e:
+        print(f"Error processing {filepath}: {e}")
+        job["error"] = str(e)
+    finally:
+        # The decode tree is consumed, only the feature dictionaries travel on
+        discard_workdir(job)
+        job["manifest"] = None
+
+    return job
+
+
+def write_job_features(job, *features):
+    """
+    Writes the feature CSVs of a job under its APK name and the names of its
+    aliases, see write_apk_features.
+
+    Returns:
+        list: The stages whose outputs were written.
+    """
+    stages = []
+    for filename in [job["filename"]] + job["aliases"]:
+        stages = write_apk_features(filename.replace('.apk', ''), *features)
+    return stages
+
+
+def write_job(job, options, cache=None):
+    """
+    Write stage of the pipeline. Writes the feature CSVs of an analyzed or
+    cached APK and stores freshly analyzed features in the extraction cache.
+
+    An APK that exceeded its budget is written with the sensitive API CSV
+    flagged as missing and not cached, so it is analyzed again next time.
+    The same CSVs are written for every alias in job["aliases"].
+
+    Returns:
+        tuple: The status ("cached", "analyzed", "degraded" or "failed") and the completed stages.
+    """
+    if job["error"] is not None:
+        return "failed", []
+
+    if job["entry"] is not None:
+        entry = job["entry"]
+        sensitive_apis_map_current = None
+        if entry["sensitive_apis"] is not None:
+            sensitive_apis_map_current = dict(zip(sentitive_apis_map, entry["sensitive_apis"]))
+        stages = write_job_features(job, dict(zip(permissions, entry["permissions"])),
+                                    dict(zip(all_intent_actions, entry["intent_actions"])),
+                                    sensitive_apis_map_current)
+        return "cached", stages
+
+    current_permissions, all_current_intents, sensitive_apis_map_current = job["features"]
+    stages = write_job_features(job, current_permissions, all_current_intents, sensitive_apis_map_current,
+                                job["degraded"] is not None)
+    if job["degraded"] is not None:
+        return "degraded", stages
+
+    # An APK whose callgraph failed is not cached, so it is retried next time
+    if not set(ENGINE_STAGES[options.engine]) <= set(stages):
+        return "failed", stages
+    if cache is not None and job["sha256"] is not None:
+        cache.put(job["sha256"], feature_fingerprint(options.engine), {
+            "apk": job["filename"],
+            "permissions": list(current_permissions.values()),
+            "intent_actions": list(all_current_intents.values()),
+            "sensitive_apis": None if sensitive_apis_map_current is None
+            else list(sensitive_apis_map_current.values()),
+        })
+        for dex_name, part in (job["dex_features"] or {}).items():
+            cache.put(job["dex_hashes"][dex_name], dex_fingerprint(options.engine), {
+                "apk": job["filename"],
+                "dex": dex_name,
+                "sensitive_apis": list(part.values()),
+            })
+    return "analyzed", stages
+
+
+def schedule_apks(filepaths):
+    """
+    Orders the APKs longest job first, so the most expensive ones start
+    while every worker is still busy instead of running alone at the end.
+    The cost is estimated from the file size, which needs no reading, so
+    nothing delays the dispatch of the first APK.
+
+    Returns:
+        list: The filepaths of the APKs, most expensive first.
+    """
+    costs = {filepath: os.path.getsize(filepath) for filepath in filepaths}
+    return sorted(costs, key=lambda filepath: (-costs[filepath], filepath))
+
+
+def parse_shard(value):
+    """
+    Parses a --shard value "i/N" into (i, N), with 0 <= i < N.
+    """
+    index, _, count = value.partition("/")
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid shard {value!r}, expected i/N, e.g. 0/4")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"invalid shard {value!r}, i must be in 0..N-1")
+    return index, count
+
+
+def shard_of(sha256, count):
+    """Returns the shard of an APK content hash among count shards."""
+    return int(sha256[:16], 16) % count
+
+
+def hash_apks(filepaths, workers=1):
+    """
+    Returns the SHA-256 of every file by filepath, hashed by workers threads.
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        return dict(zip(filepaths, executor.map(extraction_cache.file_sha256, filepaths)))
+
+
+def select_shard(filepaths, shard, workers=1):
+    """
+    Hashes the APKs and keeps those of the given (index, count) shard. The
+    shard only depends on the content, so every machine running one shard
+    of a shared APK store picks a disjoint part without coordination.
+
+    Returns:
+        tuple: The filepaths of the shard and their SHA-256 by filepath.
+    """
+    index, count = shard
+    hashes = hash_apks(filepaths, workers)
+    selected = [filepath for filepath in filepaths if shard_of(hashes[filepath], count) == index]
+    return selected, {filepath: hashes[filepath] for filepath in selected}
+
+
+def group_duplicates(filepaths, hashes):
+    """
+    Groups the APKs by content. The first filepath of every content is
+    analyzed, the filenames of the others are its aliases.
+
+    Returns:
+        tuple: The filepaths to analyze, in their original order, and the
+               alias filenames of each of them.
+    """
+    first = {}
+    aliases = {}
+    for filepath in filepaths:
+        sha256 = hashes[filepath]
+        if sha256 in first:
+            aliases[first[sha256]].append(os.path.basename(filepath))
+        else:
+            first[sha256] = filepath
+            aliases[filepath] = []
+    return list(first.values()), {filepath: names for filepath, names in aliases.items() if names}
+
+
+# Seconds a worker gets past options.timeout to give up on its own before the pool terminates it
+WATCHDOG_GRACE = 30
+
+
+def run_pipeline(directory, options):
+    """
+    Extracts the features of every APK in the directory as a streaming
+    pipeline of three stages connected by bounded queues:
+
+    unpack   options.unpack_workers threads hash the APK, check the cache,
+             decode the manifest and run 'androguard cg' (I/O and child processes)
+    analyze  options.workers processes build the feature dictionaries (CPU),
+             the dex members of a large multi-dex APK as separate tasks; a
+             process is replaced after options.recycle_after tasks or once
+             it holds more than options.max_worker_rss MB
+    write    options.write_workers threads write the CSVs, the cache entries
+             and the progress journal
+
+    At most options.queue_depth unpacked APKs wait for the analyze stage and
+    every scratch directory is removed as soon as the analyze stage has
+    consumed it, so scratch usage depends on the queue depth and worker
+    counts instead of the corpus size.
+
+    Every completed stage of an APK is recorded in the progress journal as
+    soon as its outputs are written. With options.resume the APKs whose
+    stages are all in the journal already are skipped.
+
+    The APKs are dispatched longest job first, see schedule_apks. With
+    options.shard only the APKs of that shard are processed, see select_shard.
+
+    With options.dedup every APK is hashed up front and byte-identical APKs
+    are analyzed once: the outputs of the first one are written and journaled
+    under the names of all of them. APKs seen in earlier runs come out of the
+    extraction cache, which is keyed on the same hash.
+    """
+    journal = progress_journal.ProgressJournal(options.journal, options.resume)
+    pending = queue.Queue()
+    skipped = 0
+    outstanding = []
+    for filename in sorted(os.listdir(directory)):
+        filepath = os.path.join(directory, filename)
+        if not os.path.isfile(filepath):
+            continue
+        if not journal.outstanding(ENGINE_STAGES[options.engine], filename):
+            skipped += 1
+        # Checked before any hashing for sharding or deduplication
+        elif not apk_reader.is_zip(filepath):
+            print(f"Skipping {filepath}: not an apk")
+        else:
+            outstanding.append(filepath)
+    content_hashes = {}
+    if options.shard:
+        outstanding, content_hashes = select_shard(outstanding, options.shard, options.unpack_workers)
+        print(f"Shard {options.shard[0]}/{options.shard[1]}: {len(outstanding)} APKs")
+    aliases = {}
+    if options.dedup:
+        if not options.shard:
+            content_hashes = hash_apks(outstanding, options.unpack_workers)
+        outstanding, aliases = group_duplicates(outstanding, content_hashes)
+        duplicates = sum(map(len, aliases.values()))
+        if duplicates:
+            print(f"Deduplicated {duplicates} APKs that are copies of another one")
+    for filepath in schedule_apks(outstanding):
+        pending.put(filepath)
+    total = pending.qsize()
+    workers = max(1, options.workers)
+    unpack_workers = max(1, options.unpack_workers)
+    write_workers = max(1, options.write_workers)
+    if skipped:
+        print(f"Resuming: {skipped} APKs are already complete in {options.journal}")
+    print(f"Processing {total} APKs with {unpack_workers} unpack, {workers} analyze and {write_workers} write "
+          f"workers using the {options.engine} engine")
+
+    cache = open_cache(options)
+    unpacked = queue.Queue(maxsize=max(1, options.queue_depth))
+    analyzed = queue.Queue(maxsize=max(1, options.queue_depth))
+    # Jobs handed to the pool but not yet back, enough to keep every worker busy
+    in_flight = threading.Semaphore(2 * workers)
+    done_stage = object()
+
+    statuses = {"cached": 0, "analyzed": 0, "degraded": 0, "failed": 0}
+    progress_lock = threading.Lock()
+    start = time.time()
+
+    def unpack_worker():
+        while True:
+            try:
+                filepath = pending.get_nowait()
+            except queue.Empty:
+                return
+            job = unpack_apk(filepath, options, content_hashes.get(filepath))
+            job["aliases"] = aliases.get(filepath, [])
+            unpacked.put(job)
+
+    def write_worker():
+        while True:
+            job = analyzed.get()
+            if job is done_stage:
+                return
+            try:
+                status, stages = write_job(job, options, cache)
+            except Exception as e:
+                print(f"Error writing the features of {job['filepath']}: {e}")
+                status, stages = "failed", []
+
+            with progress_lock:
+                for filename in [job["filename"]] + job["aliases"]:
+                    for stage in stages:
+                        journal.record(stage, filename)
+                statuses[status] += 1
+                done = sum(statuses.values())
+                wall = time.time() - start
+                print(f"[{done}/{total}] Finished {job['filename']} ({status}) in {time.time() - job['start']:.1f}s "
+                      f"({done / wall:.2f} APKs/s overall)")
+                if cache is not None and done % 500 == 0:
+                    cache.evict()
+
+    def analyzed_callback(job):
+        # Queued before its slot is freed, so the write stage is not closed ahead of it
+        analyzed.put(job)
+        in_flight.release()
+
+    unpackers = [threading.Thread(target=unpack_worker, daemon=True) for _ in range(unpack_workers)]
+    writers = [threading.Thread(target=write_worker, daemon=True) for _ in range(write_workers)]
+    for thread in unpackers + writers:
+        thread.start()
+
+    def close_unpack_stage():
+        for thread in unpackers:
+            thread.join()
+        unpacked.put(done_stage)
+
+    threading.Thread(target=close_unpack_stage, daemon=True).start()
+
+    # The SIGALRM budget inside the workers cannot interrupt C code, the pool kills a worker that overruns it
+    pool = worker_pool.RecyclingPool(workers, initializer=analysis_budget.limit_memory,
+                                     initargs=(options.memory_limit,), max_tasks=options.recycle_after,
+                                     max_rss=options.max_worker_rss * 1024 * 1024,
+                                     task_timeout=options.timeout + WATCHDOG_GRACE if options.timeout else None)
+    with journal, pool:
+        while True:
+            job = unpacked.get()
+            if job is done_stage:
+                break
+            if job["entry"] is not None or job["error"] is not None or job["features"] is not None:
+                analyzed.put(job)
+                continue
+
+            if job["dex_names"]:
+                # One task per dex file, the APK is complete once the last one is back
+                parts = {}
+
+                def dex_part_done(dex_name, part, job=job, parts=parts):
+                    parts[dex_name] = part
+                    if len(parts) == len(job["dex_names"]):
+                        analyzed.put(merge_dex_jobs(job, parts))
+                    in_flight.release()
+
+                for dex_name in job["dex_names"]:
+                    in_flight.acquire()
+                    part_done = functools.partial(dex_part_done, dex_name)
+                    pool.apply_async(analyze_dex_job, (job, dex_name, options), callback=part_done,
+                                     error_callback=part_done)
+                continue
+
+            in_flight.acquire()
+
+            def analyze_failed(error, job=job):
+                # A worker killed for running out of memory exceeded its budget like a timed out one
+                try:
+                    if not isinstance(error, worker_pool.WorkerLost) or options.engine == "manifest":
+                        raise error
+                    degrade_job(job, str(error))
+                except Exception as e:
+                    print(f"Error processing {job['filepath']}: {e}")
+                    job["error"] = str(e)
+                finally:
+                    discard_workdir(job)
+                    job["manifest"] = None
+                analyzed_callback(job)
+
+            pool.apply_async(analyze_job, (job, options), callback=analyzed_callback, error_callback=analyze_failed)
+
+        # Wait for the jobs still in the pool before closing the write stage
+        for _ in range(2 * workers):
+            in_flight.acquire()
+        for _ in writers:
+            analyzed.put(done_stage)
+        for thread in writers:
+            thread.join()
+
+    if pool.recycled:
+        print(f"Recycled {pool.recycled} analyze workers")
+    if cache is not None:
+        removed = cache.evict()
+        if removed:
+            print(f"Evicted {removed} least recently used cache entries")
+
+    wall = time.time() - start
+    if total:
+        print(f"Processed {total} APKs in {wall:.1f}s ({total / wall:.2f} APKs/s): "
+              f"{statuses['analyzed']} analyzed, {statuses['cached']} from cache, "
+              f"{statuses['degraded']} manifest only, {statuses['failed']} failed")
+
+
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python script.py <filepath>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Extracts permissions, intents and sensitive api calls of Android apks")
+    parser.add_argument("apkdirectory", help="directory containing the apks to analyze")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(),
+                        help="number of analyze stage processes, i.e. APKs analyzed in parallel "
+                             "(default: number of cores)")
+    parser.add_argument("--unpack-workers", type=int, default=os.cpu_count(),
+                        help="number of unpack stage threads that hash the APKs and run the decoders "
+                             "(default: number of cores)")
+    parser.add_argument("--write-workers", type=int, default=1,
+                        help="number of write stage threads (default: 1)")
+    parser.add_argument("--queue-depth", type=int, default=16,
+                        help="maximum number of unpacked APKs waiting for the analyze stage, which bounds the "
+                             "scratch space in use (default: 16)")
+    parser.add_argument("--scratch", default=None,
+                        help="directory for the per-APK scratch directories (default: system temp directory)")
+    parser.add_argument("--keep-artifacts", action="store_true",
+                        help="copy every manifest and callgraph to ./manifests/ and ./callgraphs/")
+    parser.add_argument("--callgraph-format", choices=["gml", "cgb"], default="gml",
+                        help="format of the kept callgraphs: GML text (default) or the memory-mappable binary cgb")
+    parser.add_argument("--callgraph-scope", choices=["sensitive", "full"], default="sensitive",
+                        help="callgraph the androguard engine builds: only the sensitive API methods and their "
+                             "callers (default) or the whole app, which is only needed to keep full callgraphs")
+    parser.add_argument("--split-dex-size", type=int, default=16,
+                        help="the androguard engine analyzes the dex files of a multi-dex APK in parallel tasks "
+                             "once they add up to this many MB, 0 analyzes every APK as one task (default: 16)")
+    parser.add_argument("--engine", choices=["androguard", "cg", "dexscan", "manifest"], default="androguard",
+                        help="androguard: analyze every APK in-process with the androguard library (default), "
+                             "cg: decode the manifest and run the 'androguard cg' command, "
+                             "dexscan: read the sensitive APIs the APK references from its dex method tables "
+                             "without building a callgraph, "
+                             "manifest: only extract the permission and intent features")
+    parser.add_argument("--manifest-decoder", choices=["axml", "axml-only", "apktool"], default="axml",
+                        help="how the cg, dexscan and manifest engines decode AndroidManifest.xml: axml reads it "
+                             "from the apk zip and falls back to apktool when it is malformed (default), axml-only "
+                             "never runs apktool, apktool always does a full decode")
+    parser.add_argument("--timeout", type=int, default=900,
+                        help="seconds the callgraph extraction and the analysis of one APK may take, an APK that "
+                             "takes longer only gets its manifest features (default: 900, 0 for no limit)")
+    parser.add_argument("--memory-limit", type=int, default=0,
+                        help="address space cap of every analyze worker and 'androguard cg' run in MB, an APK "
+                             "that exceeds it only gets its manifest features (default: 0, no limit)")
+    parser.add_argument("--recycle-after", type=int, default=50,
+                        help="replace an analyze worker by a fresh process after this many tasks (default: 50, "
+                             "0 never)")
+    parser.add_argument("--max-worker-rss", type=int, default=2048,
+                        help="replace an analyze worker once its resident memory passes this many MB after a task "
+                             "(default: 2048, 0 never)")
+    parser.add_argument("--cache", default="./feature_cache/",
+                        help="directory of the extraction cache keyed on APK content (default: ./feature_cache/)")
+    parser.add_argument("--no-cache", dest="cache", action="store_const", const=None,
+                        help="always analyze every APK")
+    parser.add_argument("--no-dex-cache", dest="dex_cache", action="store_false",
+                        help="only cache whole APKs, by default the androguard engine also caches every dex file "
+                             "so a new version of an app only analyzes the dex files that changed")
+    parser.add_argument("--no-library-index", dest="library_index", action="store_false",
+                        help="always analyze the bundled libraries, by default the androguard engine stores the "
+                             "sensitive API calls of every library version it sees in the cache and skips it later")
+    parser.add_argument("--cache-size", type=int, default=1024,
+                        help="size cap of the extraction cache in MB, least recently used entries are evicted "
+                             "(default: 1024)")
+    parser.add_argument("--shard", type=parse_shard, default=None,
+                        help="only process shard i of N (i/N, 0 <= i < N), assigned by the SHA-256 of the APK "
+                             "content; combine the outputs of all shards with merge_shards.py")
+    parser.add_argument("--no-dedup", dest="dedup", action="store_false",
+                        help="analyze byte-identical APKs separately instead of once for all their filenames")
+    parser.add_argument("--journal", default="./extraction_journal.log",
+                        help="progress journal of the completed APKs (default: ./extraction_journal.log)")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue an interrupted run, only the APKs not completed in the journal are processed")
+    args = parser.parse_args()
 
-    apkdirectory = sys.argv[1]
+    apkdirectory = args.apkdirectory
 
     if os.path.isdir(apkdirectory):
         print(f"Apk Directory path provided: {apkdirectory}")
     else:
         print(f"Invalid Apk directory path: {apkdirectory}")
+        sys.exit(1)
 
-    process1 = multiprocessing.Process(target=extract_static_data(apkdirectory))
-    process2 = multiprocessing.Process(target=extract_dynamic_data(apkdirectory))
-
-    process1.start()
-    process2.start()
+    if args.scratch:
+        os.makedirs(args.scratch, exist_ok=True)
 
-    process1.join()
-    process2.join()
+    run_pipeline(apkdirectory, args)
 
     print("Done")
@@ -0,0 +1,384 @@
+"""MinHash/LSH index over the extracted feature vectors to find near-duplicate samples."""
+
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import zlib
+from array import array
+
+# Per-APK output directories of feature_extractor.py, the prefix of a feature token is the feature set
+FEATURE_SETS = ("permissions", "intents", "sensitive_apis")
+
+# Columns of the CSVs that are not features
+NON_FEATURE_COLUMNS = {"", "Unnamed: 0", "name", "filename", "sensitive_apis_missing"}
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = 0xFFFFFFFF
+
+
+def feature_tokens(feature_set, header, values):
+    """
+    Turns one feature vector into the set of its active features, e.g.
+    'permissions:INTERNET' or 'intents:android.intent.action.BOOT_COMPLETED=11'.
+    Features that are 0 or empty are left out.
+    """
+    tokens = set()
+    for column, value in zip(header, values):
+        if column in NON_FEATURE_COLUMNS or value in ("", "0", "0.0"):
+            continue
+        try:
+            number = float(value)
+        except ValueError:
+            continue
+        if number == 0:
+            continue
+        if number == 1:
+            tokens.add(f"{feature_set}:{column}")
+        else:
+            tokens.add(f"{feature_set}:{column}={int(number)}")
+    return tokens
+
+
+def read_feature_csv(path, feature_set):
+    """
+    Reads a per-APK CSV as written by feature_extractor.py. The sensitive API
+    header starts with a 'name' column, which older CSVs have no value for,
+    and a vector flagged as sensitive_apis_missing has no features.
+
+    Returns:
+        set: The feature tokens of the APK.
+    """
+    with open(path, "r", encoding="utf-8", newline="") as input_file:
+        rows = list(csv.reader(input_file))
+    if len(rows) < 2:
+        return set()
+    header, values = rows[0], rows[1]
+    if header and header[0] == "name" and len(header) == len(values) + 1:
+        header = header[1:]
+    row = dict(zip(header, values))
+    if row.get("sensitive_apis_missing", "0") not in ("0", ""):
+        return set()
+    return feature_tokens(feature_set, header, values)
+
+
+def read_feature_dirs(root):
+    """
+    Reads the per-APK CSVs of <root>/permissions_data/, intents_data/ and
+    sensitive_apis_data/.
+
+    Returns:
+        dict: The feature tokens of every APK name.
+    """
+    samples = {}
+    for feature_set in FEATURE_SETS:
+        directory = os.path.join(root, f"{feature_set}_data")
+        if not os.path.isdir(directory):
+            continue
+        for filename in sorted(os.listdir(directory)):
+            if filename.endswith(".csv"):
+                tokens = read_feature_csv(os.path.join(directory, filename), feature_set)
+                samples.setdefault(filename[:-len(".csv")], set()).update(tokens)
+    return samples
+
+
+def read_merged_table(path):
+    """
+    Reads a merged table as written by reading_features_into_pandas.py or
+    merge_shards.py, e.g. permissions_merged_benign.csv. The feature set is
+    taken from the start of the file name.
+
+    pandas reads a sensitive API CSV without a value for its 'name' column
+    shifted by one: 'name' holds the first feature and the last column before
+    'filename' is empty. Such rows are read with the header shifted back.
+
+    Returns:
+        dict: The feature tokens of every APK name.
+    """
+    basename = os.path.basename(path)
+    feature_set = next((name for name in FEATURE_SETS if basename.startswith(name)), None)
+    if feature_set is None:
+        raise ValueError(f"{path} is not a merged permissions, intents or sensitive_apis table")
+    samples = {}
+    with open(path, "r", encoding="utf-8", newline="") as input_file:
+        reader = csv.reader(input_file)
+        header = next(reader, [])
+        filename_column = header.index("filename")
+        shifted = None
+        if "name" in header[:filename_column]:
+            name_column = header.index("name")
+            shifted = header[:name_column] + header[name_column + 1:filename_column] + [""] + header[filename_column:]
+        for values in reader:
+            name = values[filename_column]
+            if name.endswith(".csv"):
+                name = name[:-len(".csv")]
+            row_header = shifted if shifted is not None and values[filename_column - 1] == "" else header
+            samples.setdefault(name, set()).update(feature_tokens(feature_set, row_header, values))
+    return samples
+
+
+class FeatureIndex:
+    """
+    Locality sensitive hashing index over the feature vectors of known
+    samples. Every sample is reduced to a MinHash signature of num_perm
+    values over its active features, and the signature is split into bands
+    of equal rows: two samples that agree on all rows of any band are
+    candidates, so a query only compares the samples that share a bucket.
+    The similarity is the estimated Jaccard similarity of the feature sets.
+
+    The index lives in a directory: index.json holds the parameters,
+    samples.jsonl the name and label of every sample and signatures.bin
+    their signatures as uint32 rows, both appended to by add(), so the index
+    grows incrementally as new outputs arrive.
+    """
+
+    def __init__(self, directory, num_perm=64, bands=16, seed=1):
+        self.directory = directory
+        settings_path = os.path.join(directory, "index.json")
+        if os.path.isfile(settings_path):
+            with open(settings_path, "r", encoding="utf-8") as input_file:
+                settings = json.load(input_file)
+            num_perm, bands, seed = settings["num_perm"], settings["bands"], settings["seed"]
+        else:
+            if num_perm % bands:
+                raise ValueError(f"num_perm {num_perm} is not a multiple of bands {bands}")
+            os.makedirs(directory, exist_ok=True)
+            with open(settings_path, "w", encoding="utf-8") as output_file:
+                json.dump({"num_perm": num_perm, "bands": bands, "seed": seed}, output_file)
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        generator = random.Random(seed)
+        self.permutations = [(generator.randrange(1, MERSENNE_PRIME), generator.randrange(0, MERSENNE_PRIME))
+                             for _ in range(num_perm)]
+
+        self._hashes = {}
+        self.names = []
+        self.labels = []
+        self.positions = {}
+        self.signatures = array('I')
+        self.buckets = [{} for _ in range(bands)]
+        self._torn = None
+        self._load()
+
+    def _load(self):
+        samples_path = os.path.join(self.directory, "samples.jsonl")
+        signatures_path = os.path.join(self.directory, "signatures.bin")
+        if not os.path.isfile(samples_path):
+            return
+        with open(samples_path, "rb") as input_file:
+            content = input_file.read()
+        lines = content.split(b"\n")[:-1]
+        with open(signatures_path, "rb") as input_file:
+            data = input_file.read()
+        # A crash during add() leaves a torn or unmatched tail, only the complete samples are loaded
+        size = 4 * self.num_perm
+        count = min(len(lines), len(data) // size)
+        complete = (sum(len(line) + 1 for line in lines[:count]), count * size)
+        if complete != (len(content), len(data)):
+            self._torn = complete
+        self.signatures.frombytes(data[:count * size])
+        if sys.byteorder != "little":
+            self.signatures.byteswap()
+        for line in lines[:count]:
+            sample = json.loads(line)
+            self._insert(sample["name"], sample.get("label"))
+
+    def _repair(self):
+        # Cuts the torn tail off both files before add() appends to them, a query leaves them untouched
+        if self._torn is None:
+            return
+        for filename, length in zip(("samples.jsonl", "signatures.bin"), self._torn):
+            with open(os.path.join(self.directory, filename), "r+b") as output_file:
+                output_file.truncate(length)
+        self._torn = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.positions
+
+    def _token_hashes(self, token):
+        # The feature vocabulary is bounded, so the permuted hashes of every token are computed once
+        hashes = self._hashes.get(token)
+        if hashes is None:
+            value = zlib.crc32(token.encode("utf-8"))
+            hashes = self._hashes[token] = [((a * value + b) % MERSENNE_PRIME) & MAX_HASH
+                                            for a, b in self.permutations]
+        return hashes
+
+    def signature(self, tokens):
+        """Returns the MinHash signature of a set of feature tokens."""
+        if not tokens:
+            return array('I', [MAX_HASH] * self.num_perm)
+        return array('I', map(min, zip(*(self._token_hashes(token) for token in tokens))))
+
+    def _band_keys(self, signature):
+        rows = self.rows
+        return [tuple(signature[band * rows:(band + 1) * rows]) for band in range(self.bands)]
+
+    def _signature_at(self, position):
+        return self.signatures[position * self.num_perm:(position + 1) * self.num_perm]
+
+    def _insert(self, name, label):
+        position = len(self.names)
+        self.names.append(name)
+        self.labels.append(label)
+        self.positions[name] = position
+        for bucket, key in zip(self.buckets, self._band_keys(self._signature_at(position))):
+            bucket.setdefault(key, []).append(position)
+
+    def add(self, samples, label=None):
+        """
+        Adds the samples, a dictionary from name to feature tokens, that are
+        not in the index yet. Samples without any feature are left out, they
+        would all be identical.
+
+        Returns:
+            int: The number of added samples.
+        """
+        new = [(name, tokens) for name, tokens in samples.items() if tokens and name not in self.positions]
+        if not new:
+            return 0
+        signatures = array('I')
+        for _, tokens in new:
+            signatures.extend(self.signature(tokens))
+        stored = array('I', signatures)
+        if sys.byteorder != "little":
+            stored.byteswap()
+        self._repair()
+        with open(os.path.join(self.directory, "signatures.bin"), "ab") as output_file:
+            stored.tofile(output_file)
+        with open(os.path.join(self.directory, "samples.jsonl"), "a", encoding="utf-8") as output_file:
+            for name, _ in new:
+                output_file.write(json.dumps({"name": name, "label": label}) + "\n")
+
+        self.signatures.extend(signatures)
+        for name, _ in new:
+            self._insert(name, label)
+        return len(new)
+
+    def _similarity(self, signature, position):
+        other = self._signature_at(position)
+        return sum(1 for x, y in zip(signature, other) if x == y) / self.num_perm
+
+    def candidates(self, signature):
+        """Returns the positions of the samples sharing a bucket with the signature."""
+        found = set()
+        for bucket, key in zip(self.buckets, self._band_keys(signature)):
+            found.update(bucket.get(key, ()))
+        return found
+
+    def query(self, tokens, k=5, exclude=None):
+        """
+        Finds the k known samples most similar to a set of feature tokens.
+        A sample without any feature matches nothing.
+
+        Returns:
+            list: (similarity, name, label) tuples, most similar first.
+        """
+        if not tokens:
+            return []
+        signature = self.signature(tokens)
+        matches = [(self._similarity(signature, position), self.names[position], self.labels[position])
+                   for position in self.candidates(signature) if self.names[position] != exclude]
+        matches.sort(key=lambda match: (-match[0], match[1]))
+        return matches[:k]
+
+    def verdict(self, tokens, threshold=0.9, exclude=None):
+        """
+        Returns the label of the most similar labeled known sample that is at
+        least threshold similar, None when the sample has to go to the models.
+        Unlabeled samples are passed over.
+        """
+        for similarity, _, label in self.query(tokens, k=len(self), exclude=exclude):
+            if similarity < threshold:
+                break
+            if label is not None:
+                return label
+        return None
+
+    def clusters(self, threshold=0.8):
+        """
+        Groups the samples into families: samples that share a bucket and
+        are at least threshold similar end up in the same cluster.
+
+        Returns:
+            list: The clusters with more than one sample, as lists of names,
+                  largest first.
+        """
+        parent = list(range(len(self.names)))
+
+        def find(position):
+            while parent[position] != position:
+                parent[position] = parent[parent[position]]
+                position = parent[position]
+            return position
+
+        for bucket in self.buckets:
+            for positions in bucket.values():
+                first = positions[0]
+                signature = self._signature_at(first)
+                for position in positions[1:]:
+                    if find(position) != find(first) and self._similarity(signature, position) >= threshold:
+                        parent[find(position)] = find(first)
+
+        groups = {}
+        for position in range(len(self.names)):
+            groups.setdefault(find(position), []).append(self.names[position])
+        return sorted((names for names in groups.values() if len(names) > 1), key=len, reverse=True)
+
+
+def read_sources(sources):
+    """
+    Reads the feature tokens of every sample in the sources, output roots
+    with the per-APK *_data/ directories or merged tables.
+    """
+    samples = {}
+    for source in sources:
+        found = read_feature_dirs(source) if os.path.isdir(source) else read_merged_table(source)
+        for name, tokens in found.items():
+            samples.setdefault(name, set()).update(tokens)
+    return samples
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Near-duplicate index over the extracted feature vectors")
+    parser.add_argument("index", help="directory of the index, created on the first add")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add_parser = commands.add_parser("add", help="add the samples that are not indexed yet")
+    add_parser.add_argument("sources", nargs="+",
+                            help="output directories with permissions_data/, intents_data/ and "
+                                 "sensitive_apis_data/, or merged *_merged*.csv tables")
+    add_parser.add_argument("--label", default=None, help="label of the added samples, e.g. benign or malicious")
+
+    query_parser = commands.add_parser("query", help="find the known samples most similar to some APKs")
+    query_parser.add_argument("sources", nargs="+", help="outputs of the APKs to look up, as for add")
+    query_parser.add_argument("-k", type=int, default=5, help="number of similar samples (default: 5)")
+    query_parser.add_argument("--threshold", type=float, default=0.9,
+                              help="similarity from which the closest label is taken as verdict (default: 0.9)")
+
+    cluster_parser = commands.add_parser("cluster", help="group the indexed samples into families")
+    cluster_parser.add_argument("--threshold", type=float, default=0.8,
+                                help="similarity of two samples of a family (default: 0.8)")
+    args = parser.parse_args()
+
+    index = FeatureIndex(args.index)
+    if args.command == "add":
+        added = index.add(read_sources(args.sources), args.label)
+        print(f"Added {added} samples, {len(index)} in the index")
+    elif args.command == "query":
+        for name, tokens in sorted(read_sources(args.sources).items()):
+            matches = index.query(tokens, args.k, exclude=name)
+            verdict = index.verdict(tokens, args.threshold, exclude=name)
+            print(f"{name}: {verdict or 'no verdict'}")
+            for similarity, match, label in matches:
+                print(f"    {similarity:.3f} {match} ({label})")
+    else:
+        for number, names in enumerate(index.clusters(args.threshold)):
+            print(f"Family {number}: {len(names)} samples: {', '.join(names)}")
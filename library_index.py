@@ -0,0 +1,72 @@
+"""Index of the sensitive API calls made by known versions of bundled third-party libraries."""
+
+import dex_scan
+
+# Package prefixes of the SDKs bundled with most apps. A class belongs to the
+# first prefix it starts with, so no prefix may start with another one.
+LIBRARY_PREFIXES = (
+    "Lcom/google/android/gms/",
+    "Lcom/google/firebase/",
+    "Lcom/google/android/material/",
+    "Lcom/google/android/exoplayer2/",
+    "Lcom/google/ads/",
+    "Lcom/google/gson/",
+    "Lcom/google/protobuf/",
+    "Landroidx/",
+    "Landroid/support/",
+    "Lkotlin/",
+    "Lkotlinx/",
+    "Lokhttp3/",
+    "Lokio/",
+    "Lretrofit2/",
+    "Lio/reactivex/",
+    "Lcom/squareup/",
+    "Lcom/bumptech/glide/",
+    "Lcom/facebook/",
+    "Lcom/unity3d/",
+    "Lcom/applovin/",
+    "Lcom/ironsource/",
+    "Lcom/vungle/",
+    "Lcom/chartboost/",
+    "Lcom/mopub/",
+    "Lcom/inmobi/",
+    "Lcom/adjust/sdk/",
+    "Lcom/appsflyer/",
+    "Lcom/crashlytics/",
+    "Lio/fabric/",
+)
+
+
+class LibraryIndex:
+    """
+    Maps the fingerprint of the classes of a library in a dex file, see
+    dex_scan.package_fingerprints, to the sensitive API keys those classes
+    call. The entries live in the extraction cache next to the APK entries,
+    under their own vocabulary fingerprint.
+
+    An analysis can leave the classes of a known library out and add its
+    keys instead, only the app's own code and unknown libraries are walked.
+    """
+
+    def __init__(self, cache, fingerprint, prefixes=LIBRARY_PREFIXES):
+        self.cache = cache
+        self.fingerprint = fingerprint
+        self.prefixes = prefixes
+
+    def libraries(self, dex_bytes):
+        """
+        Returns the libraries of a dex file, see dex_scan.package_fingerprints.
+        """
+        return dex_scan.package_fingerprints(dex_bytes, self.prefixes)
+
+    def get(self, library_sha256):
+        """
+        Returns the sensitive API keys of a known library, None if it is unknown.
+        """
+        entry = self.cache.get(library_sha256, self.fingerprint)
+        if entry is None:
+            return None
+        return entry["sensitive_apis"]
+
+    def put(self, library_sha256, prefix, keys):
+        self.cache.put(library_sha256, self.fingerprint, {"library": prefix, "sensitive_apis": sorted(keys)})
@@ -0,0 +1,89 @@
+"""Merges the per-APK feature CSVs of several extraction shards into one table per feature set."""
+
+import argparse
+import filecmp
+import os
+import sys
+import pandas as pd
+
+# Output directory of every feature set, as written by feature_extractor.py
+FEATURE_DIRS = ("intents_data", "permissions_data", "sensitive_apis_data")
+
+
+def collect_csvs(shard_dirs, feature_dir):
+    """
+    Collects the per-APK CSVs of a feature set from every shard. An APK
+    found in more than one shard is kept once: copies with the same content
+    are reported as duplicates, copies that differ as conflicts, and the
+    first shard wins.
+
+    Returns:
+        tuple: The CSV path by filename, the number of duplicates and the
+               number of conflicts.
+    """
+    csvs = {}
+    duplicates = conflicts = 0
+    for shard_dir in shard_dirs:
+        directory = os.path.join(shard_dir, feature_dir)
+        if not os.path.isdir(directory):
+            print(f"No {feature_dir} in shard {shard_dir}")
+            continue
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith(".csv"):
+                continue
+            file_path = os.path.join(directory, filename)
+            if filename not in csvs:
+                csvs[filename] = file_path
+            elif filecmp.cmp(csvs[filename], file_path, shallow=False):
+                duplicates += 1
+            else:
+                print(f"Conflict: {file_path} differs from {csvs[filename]}, keeping {csvs[filename]}")
+                conflicts += 1
+    return csvs, duplicates, conflicts
+
+
+def merge_feature_dir(shard_dirs, feature_dir, output_path):
+    """
+    Merges the CSVs of a feature set the same way reading_features_into_pandas.py
+    does: one row per APK with its CSV filename in the 'filename' column.
+
+    Returns:
+        int: The number of merged APKs.
+    """
+    csvs, duplicates, conflicts = collect_csvs(shard_dirs, feature_dir)
+    if not csvs:
+        print(f"No {feature_dir} CSVs found")
+        return 0
+
+    combined_df = []
+    for filename in sorted(csvs):
+        df = pd.read_csv(csvs[filename])
+        df['filename'] = filename
+        combined_df.append(df)
+    final_df = pd.concat(combined_df, ignore_index=True)
+    final_df.to_csv(output_path)
+    print(f"Merged {len(csvs)} APKs of {len(shard_dirs)} shards into {output_path} "
+          f"({duplicates} duplicates, {conflicts} conflicts)")
+    return len(csvs)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merges the feature CSVs of the shards of a sharded extraction run")
+    parser.add_argument("shards", nargs="+",
+                        help="output directories of the shards, each with intents_data/, permissions_data/ "
+                             "and sensitive_apis_data/")
+    parser.add_argument("-o", "--output", default="./",
+                        help="directory of the merged tables (default: ./)")
+    parser.add_argument("--suffix", default="",
+                        help="suffix of the merged table names, e.g. _benign gives intents_merged_benign.csv")
+    args = parser.parse_args()
+
+    for shard_dir in args.shards:
+        if not os.path.isdir(shard_dir):
+            print(f"Invalid shard directory path: {shard_dir}")
+            sys.exit(1)
+    os.makedirs(args.output, exist_ok=True)
+
+    for feature_dir in FEATURE_DIRS:
+        output_name = feature_dir.replace("_data", "_merged") + args.suffix + ".csv"
+        merge_feature_dir(args.shards, feature_dir, os.path.join(args.output, output_name))
@@ -0,0 +1,81 @@
+"""Durable record of the finished extraction stages and atomic output files."""
+
+import contextlib
+import os
+import tempfile
+
+
+@contextlib.contextmanager
+def atomic_output(path, mode="w", encoding="utf-8"):
+    """
+    Opens a temp file next to path and renames it over path once the block
+    finishes without an exception. Readers and crashed runs only ever see
+    the old file or the complete new one.
+    """
+    directory = os.path.dirname(path) or "."
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, encoding=None if "b" in mode else encoding) as output_file:
+            yield output_file
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class ProgressJournal:
+    """
+    Append-only journal of the (stage, apk) pairs a run has completed, one
+    tab separated line each. Every record is flushed and fsynced before the
+    next APK is reported, so after a crash the journal lists exactly the
+    outputs that were fully written.
+
+    With resume the existing journal is loaded and extended, otherwise a new
+    run starts with an empty journal.
+    """
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.completed = {}
+        if resume and os.path.isfile(path):
+            self._load()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.journal_file = open(path, "a" if resume else "w", encoding="utf-8")
+
+    def _load(self):
+        with open(self.path, "rb") as input_file:
+            data = input_file.read()
+        # A line without its newline was cut off by the crash, it is cut from the journal before appending
+        complete = data[:data.rfind(b"\n") + 1]
+        for line in complete.decode("utf-8", errors="replace").splitlines():
+            stage, _, apk = line.partition("\t")
+            if apk:
+                self.completed.setdefault(stage, set()).add(apk)
+        if len(complete) != len(data):
+            with open(self.path, "r+b") as output_file:
+                output_file.truncate(len(complete))
+
+    def is_done(self, stage, apk):
+        return apk in self.completed.get(stage, ())
+
+    def outstanding(self, stages, apk):
+        """Returns the stages of the APK that are not completed yet."""
+        return [stage for stage in stages if not self.is_done(stage, apk)]
+
+    def record(self, stage, apk):
+        self.journal_file.write(f"{stage}\t{apk}\n")
+        self.journal_file.flush()
+        os.fsync(self.journal_file.fileno())
+        self.completed.setdefault(stage, set()).add(apk)
+
+    def close(self):
+        self.journal_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
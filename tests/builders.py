@@ -0,0 +1,319 @@
+"""
+Builders of the small binary fixtures the tests decode: compiled Android XML
+documents, dex files and apk zips, and the options of a pipeline run.
+"""
+
+import argparse
+import hashlib
+import struct
+import zipfile
+import zlib
+
+ANDROID_NAMESPACE = "http://schemas.android.com/apk/res/android"
+
+# Resource ids of the android: attributes the fixtures use
+ANDROID_ATTRIBUTE_IDS = {
+    "name": 0x01010003,
+    "exported": 0x01010010,
+    "priority": 0x0101001c,
+    "screenOrientation": 0x0101001e,
+    "targetSdkVersion": 0x01010270,
+}
+
+TYPE_STRING = 0x03
+TYPE_INT_DEC = 0x10
+TYPE_INT_BOOLEAN = 0x12
+NO_ENTRY = 0xFFFFFFFF
+
+
+def _chunk(chunk_type, header, body=b""):
+    return struct.pack("<HHI", chunk_type, 8 + len(header), 8 + len(header) + len(body)) + header + body
+
+
+def _string_pool(strings):
+    data = b""
+    offsets = []
+    for string in strings:
+        offsets.append(len(data))
+        encoded = string.encode("utf-16-le")
+        data += struct.pack("<H", len(string)) + encoded + b"\0\0"
+    data += b"\0" * (-len(data) % 4)
+    strings_start = 28 + 4 * len(strings)
+    header = struct.pack("<5I", len(strings), 0, 0, strings_start, 0)
+    return _chunk(0x0001, header, struct.pack(f"<{len(strings)}I", *offsets) + data)
+
+
+def build_axml(elements):
+    """
+    Encodes a document as compiled Android XML. elements is a nested
+    (tag, attributes, children) tuple; attribute names of the android
+    namespace are given as 'android:name', values are str, int or bool.
+    """
+    # Attribute names with a resource id come first, their ids are in the resource map
+    android_names = []
+    strings = []
+
+    def collect(element):
+        tag, attributes, children = element
+        for name in attributes:
+            if name.startswith("android:") and name[len("android:"):] not in android_names:
+                android_names.append(name[len("android:"):])
+        for child in children:
+            collect(child)
+
+    collect(elements)
+    strings.extend(android_names)
+
+    def index(string):
+        if string not in strings:
+            strings.append(string)
+        return strings.index(string)
+
+    body = []
+
+    def encode(element):
+        tag, attributes, children = element
+        encoded = b""
+        for name, value in attributes.items():
+            if name.startswith("android:"):
+                ns, name_index = index(ANDROID_NAMESPACE), strings.index(name[len("android:"):])
+            else:
+                ns, name_index = NO_ENTRY, index(name)
+            if isinstance(value, bool):
+                raw, data_type, data = NO_ENTRY, TYPE_INT_BOOLEAN, 0xFFFFFFFF if value else 0
+            elif isinstance(value, int):
+                raw, data_type, data = NO_ENTRY, TYPE_INT_DEC, value & 0xFFFFFFFF
+            else:
+                raw = data = index(value)
+                data_type = TYPE_STRING
+            encoded += struct.pack("<IIIHBBI", ns, name_index, raw, 8, 0, data_type, data)
+        header = struct.pack("<II", 1, NO_ENTRY)
+        body.append(_chunk(0x0102, header, struct.pack("<IIHHHHHH", NO_ENTRY, index(tag), 20, 20, len(attributes),
+                                                       0, 0, 0) + encoded))
+        for child in children:
+            encode(child)
+        body.append(_chunk(0x0103, header, struct.pack("<II", NO_ENTRY, index(tag))))
+
+    namespace = struct.pack("<II", index("android"), index(ANDROID_NAMESPACE))
+    line = struct.pack("<II", 1, NO_ENTRY)
+    encode(elements)
+    chunks = _string_pool(strings)
+    chunks += _chunk(0x0180, b"", struct.pack(f"<{len(android_names)}I",
+                                              *(ANDROID_ATTRIBUTE_IDS[name] for name in android_names)))
+    chunks += _chunk(0x0100, line, namespace) + b"".join(body) + _chunk(0x0101, line, namespace)
+    return struct.pack("<HHI", 0x0003, 8, 8 + len(chunks)) + chunks
+
+
+def build_apk(path, manifest, members=()):
+    """Writes an apk zip with the compiled manifest and the (name, bytes) members."""
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as apk:
+        apk.writestr("AndroidManifest.xml", manifest)
+        for name, data in members:
+            apk.writestr(name, data)
+    return path
+
+
+NO_INDEX = 0xFFFFFFFF
+ACC_PUBLIC_STATIC = 0x0009
+
+OP_RETURN_VOID = 0x0e
+OP_CONST_STRING = 0x1a
+OP_INVOKE_STATIC = 0x71
+OP_INVOKE_VIRTUAL = 0x6e
+
+
+def _uleb128(value):
+    encoded = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            encoded.append(byte | 0x80)
+        else:
+            encoded.append(byte)
+            return bytes(encoded)
+
+
+def _parse_descriptor(descriptor):
+    """Splits a method descriptor like '(I[BLjava/lang/String;)V' into its parameter types and return type."""
+    parameters = []
+    position = 1
+    while descriptor[position] != ")":
+        start = position
+        while descriptor[position] == "[":
+            position += 1
+        if descriptor[position] == "L":
+            position = descriptor.index(";", position)
+        position += 1
+        parameters.append(descriptor[start:position])
+    return tuple(parameters), descriptor[position + 1:]
+
+
+def _shorty(type_descriptor):
+    return "L" if type_descriptor[0] in "L[" else type_descriptor
+
+
+def invoke(class_name, name, descriptor, opcode=OP_INVOKE_STATIC):
+    """An invoke instruction without arguments of the method class_name->name descriptor."""
+    return ("invoke", opcode, (class_name, name, descriptor))
+
+
+def const_string(string):
+    """A const-string v0 instruction."""
+    return ("string", OP_CONST_STRING, string)
+
+
+def build_dex(classes):
+    """
+    Builds a dex file that androguard parses. classes is a list of
+    (descriptor, superclass, methods) tuples, methods a list of
+    (name, descriptor, code) tuples with code a list of invoke and
+    const_string instructions, return-void is appended. Every method is
+    public static.
+    """
+    references = set()
+    strings = set()
+    for descriptor, superclass, methods in classes:
+        strings.update((descriptor, superclass))
+        for name, method_descriptor, code in methods:
+            references.add((descriptor, name, method_descriptor))
+            for kind, _, operand in code:
+                if kind == "invoke":
+                    references.add(operand)
+                else:
+                    strings.add(operand)
+
+    protos = {}
+    for class_name, name, method_descriptor in references:
+        parameters, return_type = _parse_descriptor(method_descriptor)
+        protos[method_descriptor] = (parameters, return_type)
+        strings.update((class_name, name, return_type) + parameters)
+        strings.add(_shorty(return_type) + "".join(map(_shorty, parameters)))
+
+    strings = sorted(strings)
+    string_index = {string: index for index, string in enumerate(strings)}
+    type_names = sorted({class_name for class_name, _, _ in references} |
+                        {descriptor for descriptor, _, _ in classes} | {superclass for _, superclass, _ in classes} |
+                        {t for parameters, return_type in protos.values() for t in parameters + (return_type,)},
+                        key=string_index.get)
+    type_index = {name: index for index, name in enumerate(type_names)}
+    proto_list = sorted(protos, key=lambda d: (type_index[protos[d][1]], [type_index[t] for t in protos[d][0]]))
+    proto_index = {d: index for index, d in enumerate(proto_list)}
+    method_list = sorted(references, key=lambda m: (type_index[m[0]], string_index[m[1]], proto_index[m[2]]))
+    method_index = {m: index for index, m in enumerate(method_list)}
+
+    header_size = 0x70
+    string_ids_offset = header_size
+    type_ids_offset = string_ids_offset + 4 * len(strings)
+    proto_ids_offset = type_ids_offset + 4 * len(type_names)
+    method_ids_offset = proto_ids_offset + 12 * len(proto_list)
+    class_defs_offset = method_ids_offset + 8 * len(method_list)
+    data_offset = class_defs_offset + 32 * len(classes)
+
+    data = bytearray()
+
+    def align():
+        data.extend(b"\0" * (-(data_offset + len(data)) % 4))
+
+    # type_lists of the proto parameters
+    type_list_offsets = {}
+    type_lists_start = data_offset + len(data)
+    for d in proto_list:
+        parameters = protos[d][0]
+        if parameters and parameters not in type_list_offsets:
+            align()
+            type_list_offsets[parameters] = data_offset + len(data)
+            data.extend(struct.pack("<I", len(parameters)))
+            data.extend(struct.pack(f"<{len(parameters)}H", *(type_index[t] for t in parameters)))
+    align()
+
+    # code_items
+    code_offsets = {}
+    code_start = data_offset + len(data)
+    for descriptor, _, methods in classes:
+        for name, method_descriptor, code in methods:
+            align()
+            code_offsets[(descriptor, name, method_descriptor)] = data_offset + len(data)
+            units = []
+            for kind, opcode, operand in code:
+                if kind == "invoke":
+                    units += [opcode, method_index[operand], 0]
+                else:
+                    units += [opcode, string_index[operand]]
+            units.append(OP_RETURN_VOID)
+            ins = sum(2 if t in ("J", "D") else 1 for t in protos[method_descriptor][0])
+            registers = max(ins, 1)
+            data.extend(struct.pack("<4HII", registers, ins, 0, 0, 0, len(units)))
+            data.extend(struct.pack(f"<{len(units)}H", *units))
+    align()
+
+    # class_data_items
+    class_data_offsets = []
+    class_data_start = data_offset + len(data)
+    for descriptor, _, methods in classes:
+        class_data_offsets.append(data_offset + len(data))
+        data.extend(_uleb128(0) + _uleb128(0) + _uleb128(len(methods)) + _uleb128(0))
+        previous = 0
+        for method in sorted(((descriptor,) + method[:2] for method in methods), key=method_index.get):
+            data.extend(_uleb128(method_index[method] - previous) + _uleb128(ACC_PUBLIC_STATIC) +
+                        _uleb128(code_offsets[method]))
+            previous = method_index[method]
+
+    # string_data_items
+    string_offsets = []
+    string_data_start = data_offset + len(data)
+    for string in strings:
+        string_offsets.append(data_offset + len(data))
+        data.extend(_uleb128(len(string)) + string.encode("utf-8") + b"\0")
+    align()
+
+    map_offset = data_offset + len(data)
+    sections = [(0x0000, 1, 0), (0x0001, len(strings), string_ids_offset), (0x0002, len(type_names), type_ids_offset),
+                (0x0003, len(proto_list), proto_ids_offset), (0x0005, len(method_list), method_ids_offset),
+                (0x0006, len(classes), class_defs_offset)]
+    if type_list_offsets:
+        sections.append((0x1001, len(type_list_offsets), type_lists_start))
+    sections += [(0x2001, len(code_offsets), code_start), (0x2000, len(classes), class_data_start),
+                 (0x2002, len(strings), string_data_start), (0x1000, 1, map_offset)]
+    sections.sort(key=lambda section: section[2])
+    data.extend(struct.pack("<I", len(sections)))
+    for section_type, size, offset in sections:
+        data.extend(struct.pack("<HHII", section_type, 0, size, offset))
+
+    ids = bytearray()
+    ids.extend(struct.pack(f"<{len(strings)}I", *string_offsets))
+    ids.extend(struct.pack(f"<{len(type_names)}I", *(string_index[name] for name in type_names)))
+    for d in proto_list:
+        parameters, return_type = protos[d]
+        shorty = _shorty(return_type) + "".join(map(_shorty, parameters))
+        ids.extend(struct.pack("<3I", string_index[shorty], type_index[return_type], type_list_offsets.get(parameters, 0)))
+    for class_name, name, method_descriptor in method_list:
+        ids.extend(struct.pack("<HHI", type_index[class_name], proto_index[method_descriptor], string_index[name]))
+    for (descriptor, superclass, _), class_data_offset in zip(classes, class_data_offsets):
+        ids.extend(struct.pack("<8I", type_index[descriptor], 1, type_index[superclass], 0, NO_INDEX, 0,
+                               class_data_offset, 0))
+
+    file_size = data_offset + len(data)
+    header = bytearray(header_size)
+    header[0:8] = b"dex\n035\0"
+    struct.pack_into("<3I", header, 32, file_size, header_size, 0x12345678)
+    struct.pack_into("<3I", header, 44, 0, 0, map_offset)
+    struct.pack_into("<14I", header, 56, len(strings), string_ids_offset, len(type_names), type_ids_offset,
+                     len(proto_list), proto_ids_offset, 0, 0, len(method_list), method_ids_offset, len(classes),
+                     class_defs_offset, len(data), data_offset)
+    dex = header + ids + data
+    dex[12:32] = hashlib.sha1(dex[32:]).digest()
+    struct.pack_into("<I", dex, 8, zlib.adler32(dex[12:]))
+    return bytes(dex)
+
+
+def pipeline_options(tmp_path, **overrides):
+    """Returns the command line defaults of feature_extractor.py, with the scratch, cache and journal in tmp_path."""
+    options = dict(workers=2, unpack_workers=2, write_workers=1, queue_depth=16, scratch=str(tmp_path),
+                   keep_artifacts=False, callgraph_format="gml", callgraph_scope="sensitive", split_dex_size=16,
+                   engine="androguard", manifest_decoder="axml", timeout=900, memory_limit=0, recycle_after=50,
+                   max_worker_rss=2048, cache=str(tmp_path / "feature_cache"), dex_cache=True, library_index=True,
+                   cache_size=1024, shard=None, dedup=True, journal=str(tmp_path / "extraction_journal.log"),
+                   resume=False)
+    options.update(overrides)
+    return argparse.Namespace(**options)
@@ -0,0 +1,20 @@
+import subprocess
+import sys
+
+import pytest
+
+import analysis_budget
+
+pytestmark = pytest.mark.skipif(analysis_budget.resource is None, reason="no resource limits on this platform")
+
+
+def test_memory_limited_command_caps_the_child():
+    allocate = [sys.executable, "-c", "bytearray(256 * 1024 * 1024)"]
+
+    assert subprocess.run(allocate).returncode == 0
+    limited = subprocess.run(analysis_budget.memory_limited_command(allocate, 64), capture_output=True, text=True)
+    assert limited.returncode != 0 and "MemoryError" in limited.stderr
+
+
+def test_no_limit_leaves_the_command_alone():
+    assert analysis_budget.memory_limited_command(["androguard", "cg"], 0) == ["androguard", "cg"]
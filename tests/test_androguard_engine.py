@@ -0,0 +1,136 @@
+import csv
+
+import pytest
+
+import builders
+from builders import OP_INVOKE_VIRTUAL, build_apk, build_axml, build_dex, const_string, invoke
+
+pytest.importorskip("androguard")
+feature_extractor = pytest.importorskip("feature_extractor")
+
+TELEPHONY = "Landroid/telephony/TelephonyManager;"
+SMS = "Landroid/telephony/SmsManager;"
+CIPHER = "Ljavax/crypto/Cipher;"
+
+CLASSES = [
+    ("Lcom/example/Main;", "Ljava/lang/Object;", [
+        ("run", "()V", [invoke(TELEPHONY, "getDeviceId", "()Ljava/lang/String;", OP_INVOKE_VIRTUAL),
+                        invoke("Lcom/example/Util;", "help", "()V")]),
+        ("seal", "([B)V", [invoke(CIPHER, "doFinal", "([B)[B", OP_INVOKE_VIRTUAL)]),
+    ]),
+    ("Lcom/example/Util;", "Ljava/lang/Object;", [("help", "()V", [const_string("hello")])]),
+    # An app class whose path makes it a sensitive class, calling sensitive APIs itself
+    ("Lcom/example/sms/SmsManager;", "Ljava/lang/Object;", [
+        ("send", "()V", [invoke(SMS, "getDefault", "()Landroid/telephony/SmsManager;"),
+                         invoke(SMS, "sendTextMessage", "(Ljava/lang/String;)V", OP_INVOKE_VIRTUAL)]),
+    ]),
+    ("Lcom/example/Other;", "Ljava/lang/Object;", [
+        ("go", "()V", [invoke("Lcom/example/sms/SmsManager;", "send", "()V")]),
+    ]),
+]
+
+
+def marked(sensitive_apis):
+    return {key for key, value in sensitive_apis.items() if value}
+
+
+@pytest.fixture
+def apk(tmp_path):
+    manifest = build_axml(("manifest", {"package": "com.example.app"}, [
+        ("uses-permission", {"android:name": "android.permission.READ_PHONE_STATE"}, []),
+    ]))
+    return str(build_apk(tmp_path / "app.apk", manifest, [("classes.dex", build_dex(CLASSES))]))
+
+
+def test_sensitive_and_full_scope_give_the_same_features(apk, tmp_path):
+    permissions, _, sensitive = feature_extractor.analyze_apk_in_process(apk, str(tmp_path), None, "sensitive")
+    _, _, full = feature_extractor.analyze_apk_in_process(apk, str(tmp_path), None, "full")
+
+    assert permissions["READ_PHONE_STATE"] == 1
+    assert sensitive == full
+    assert marked(sensitive) == {"getDeviceId", "getDefault", "sendTextMessage", "doFinal"}
+
+
+def test_sensitive_scope_only_cross_references_invoking_classes(apk, monkeypatch):
+    from androguard.core.analysis.analysis import Analysis
+
+    xrefs = []
+    create_xref = Analysis._create_xref
+
+    def recording_create_xref(self, current_class):
+        xrefs.append(current_class.get_name())
+        return create_xref(self, current_class)
+
+    monkeypatch.setattr(Analysis, "_create_xref", recording_create_xref)
+    feature_extractor.analyze_apk_in_process(apk, None, None, "sensitive")
+
+    assert sorted(xrefs) == ["Lcom/example/Main;", "Lcom/example/Other;", "Lcom/example/sms/SmsManager;"]
+
+
+@pytest.mark.parametrize("dex_cache", [True, False])
+def test_split_apk_is_cached(tmp_path, monkeypatch, capsys, dex_cache):
+    directory = tmp_path / "apks"
+    directory.mkdir()
+    manifest = build_axml(("manifest", {"package": "com.example.app"}, []))
+    build_apk(directory / "split.apk", manifest, [("classes.dex", build_dex(CLASSES[:2])),
+                                                  ("classes2.dex", build_dex(CLASSES[2:]))])
+    options = builders.pipeline_options(tmp_path, dex_cache=dex_cache, split_dex_size=1)
+    monkeypatch.chdir(tmp_path)
+    # Big enough to be split without the per-dex cache too
+    monkeypatch.setattr(feature_extractor.apk_reader.ApkReader, "dex_size", lambda self: 1024 * 1024)
+
+    feature_extractor.run_pipeline(str(directory), options)
+    assert "1 analyzed, 0 from cache" in capsys.readouterr().out
+    feature_extractor.run_pipeline(str(directory), options)
+    assert "0 analyzed, 1 from cache" in capsys.readouterr().out
+
+    row = read_csv_row(tmp_path / "sensitive_apis_data" / "split.csv")
+    assert {key for key in feature_extractor.sentitive_apis_map if row[key] == "1"} == {
+        "getDeviceId", "getDefault", "sendTextMessage", "doFinal"}
+
+
+LIBRARY_CLASSES = [
+    ("Lcom/google/gson/Gson;", "Ljava/lang/Object;", [
+        ("id", "()V", [invoke(TELEPHONY, "getDeviceId", "()Ljava/lang/String;", OP_INVOKE_VIRTUAL)]),
+        ("seal", "([B)V", [invoke(CIPHER, "doFinal", "([B)[B", OP_INVOKE_VIRTUAL)]),
+    ]),
+]
+
+
+def test_library_index_gives_the_same_features(tmp_path):
+    manifest = build_axml(("manifest", {"package": "com.example.app"}, []))
+    apk = str(build_apk(tmp_path / "lib.apk", manifest,
+                        [("classes.dex", build_dex(CLASSES[1:2] + LIBRARY_CLASSES))]))
+    libraries = feature_extractor.library_index.LibraryIndex(
+        feature_extractor.extraction_cache.ExtractionCache(str(tmp_path / "cache"), 1 << 26),
+        feature_extractor.library_fingerprint())
+
+    _, _, without_index = feature_extractor.analyze_apk_in_process(apk, str(tmp_path))
+    _, _, unknown_library = feature_extractor.analyze_apk_in_process(apk, str(tmp_path), libraries=libraries)
+    _, _, known_library = feature_extractor.analyze_apk_in_process(apk, str(tmp_path), libraries=libraries)
+
+    assert marked(without_index) == {"getDeviceId", "doFinal"}
+    assert without_index == unknown_library == known_library
+
+
+def read_csv_row(path):
+    with open(path, "r", encoding="utf-8", newline="") as input_file:
+        header, values = list(csv.reader(input_file))
+    return dict(zip(header, values))
+
+
+def test_pipeline_writes_split_apks(tmp_path, monkeypatch):
+    directory = tmp_path / "apks"
+    directory.mkdir()
+    manifest = build_axml(("manifest", {"package": "com.example.app"}, []))
+    build_apk(directory / "split.apk", manifest, [("classes.dex", build_dex(CLASSES[:2])),
+                                                  ("classes2.dex", build_dex(CLASSES[2:]))])
+    monkeypatch.chdir(tmp_path)
+    # Big enough to be analyzed one dex file per task
+    monkeypatch.setattr(feature_extractor.apk_reader.ApkReader, "dex_size", lambda self: 1024 * 1024)
+
+    feature_extractor.run_pipeline(str(directory), builders.pipeline_options(tmp_path, split_dex_size=1, cache=None))
+
+    row = read_csv_row(tmp_path / "sensitive_apis_data" / "split.csv")
+    assert {key for key in feature_extractor.sentitive_apis_map if row[key] == "1"} == {
+        "getDeviceId", "getDefault", "sendTextMessage", "doFinal"}
@@ -0,0 +1,40 @@
+import pytest
+
+import apk_reader
+from builders import build_apk, build_axml
+
+MANIFEST = build_axml(("manifest", {"package": "com.example.app"}, []))
+
+
+def test_dex_members(tmp_path):
+    apk = build_apk(tmp_path / "app.apk", MANIFEST, [("classes.dex", b"dex 1"), ("classes2.dex", b"dex 2"),
+                                                     ("classes2xdex", b"not a dex"), ("lib/classes.dex", b"nested")])
+
+    with apk_reader.ApkReader(str(apk)) as reader:
+        assert reader.dex_names() == ["classes.dex", "classes2.dex"]
+        assert list(reader.dex_members()) == [("classes.dex", b"dex 1"), ("classes2.dex", b"dex 2")]
+        assert reader.dex_size() == 10
+        assert reader.manifest() == MANIFEST
+
+
+def test_not_a_zip(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("not an apk")
+
+    assert not apk_reader.is_zip(str(path))
+    with pytest.raises(apk_reader.ApkError):
+        apk_reader.ApkReader(str(path))
+
+
+def test_member_digest_needs_no_inflating(tmp_path, monkeypatch):
+    dex = b"dex\n035\0" + bytes(range(256)) * 64
+    first = build_apk(tmp_path / "first.apk", MANIFEST, [("classes.dex", dex)])
+    second = build_apk(tmp_path / "second.apk", MANIFEST, [("assets/x", b"x" * 100), ("classes.dex", dex)])
+
+    def inflate(*args, **kwargs):
+        raise AssertionError("inflated a member")
+
+    monkeypatch.setattr(apk_reader.zipfile.ZipFile, "open", inflate)
+    with apk_reader.ApkReader(str(first)) as reader, apk_reader.ApkReader(str(second)) as other:
+        assert reader.member_digest("classes.dex") == other.member_digest("classes.dex")
+        assert reader.member_digest("classes.dex") != reader.member_digest("AndroidManifest.xml")
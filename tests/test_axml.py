@@ -0,0 +1,64 @@
+import struct
+
+import pytest
+
+import axml
+from builders import ANDROID_NAMESPACE, build_apk, build_axml
+
+ANDROID = "{" + ANDROID_NAMESPACE + "}"
+
+MANIFEST = ("manifest", {"package": "com.example.app"}, [
+    ("uses-sdk", {"android:targetSdkVersion": 30}, []),
+    ("uses-permission", {"android:name": "android.permission.INTERNET"}, []),
+    ("application", {}, [
+        ("activity", {"android:name": ".MainActivity", "android:screenOrientation": 1, "android:exported": True}, [
+            ("intent-filter", {"android:priority": 100}, [
+                ("action", {"android:name": "android.intent.action.MAIN"}, []),
+            ]),
+        ]),
+    ]),
+])
+
+
+def test_parse_axml_decodes_the_manifest():
+    root = axml.parse_axml(build_axml(MANIFEST))
+
+    assert root.tag == "manifest"
+    assert root.get("package") == "com.example.app"
+    assert root.find("uses-sdk").get(ANDROID + "targetSdkVersion") == "30"
+    assert root.find("uses-permission").get(ANDROID + "name") == "android.permission.INTERNET"
+    activity = root.find("application/activity")
+    assert activity.attrib == {ANDROID + "name": ".MainActivity", ANDROID + "screenOrientation": "1",
+                               ANDROID + "exported": "true"}
+    assert activity.find("intent-filter").get(ANDROID + "priority") == "100"
+    assert activity.find("intent-filter/action").get(ANDROID + "name") == "android.intent.action.MAIN"
+
+
+def test_read_manifest_from_apk(tmp_path):
+    apk = build_apk(tmp_path / "app.apk", build_axml(MANIFEST))
+
+    root = axml.read_manifest(str(apk))
+
+    assert root.find("uses-permission").get(ANDROID + "name") == "android.permission.INTERNET"
+
+
+def test_read_manifest_without_manifest(tmp_path):
+    apk = tmp_path / "empty.apk"
+    build_apk(apk, b"")
+    with pytest.raises(axml.AXMLError):
+        axml.read_manifest(str(apk))
+
+
+def test_truncated_string_pool_raises_axml_error(tmp_path):
+    # A UTF-8 pool whose only string starts with a two byte length on the last byte of the document
+    header = struct.pack("<5I", 1, 0, axml.UTF8_FLAG, 32, 0) + struct.pack("<I", 0)
+    pool = struct.pack("<HHI", axml.RES_STRING_POOL_TYPE, 28, 8 + len(header) + 1) + header + b"\x80"
+    apk = build_apk(tmp_path / "truncated.apk", struct.pack("<HHI", axml.RES_XML_TYPE, 8, 8 + len(pool)) + pool)
+
+    with pytest.raises(axml.AXMLError):
+        axml.read_manifest(str(apk))
+
+
+def test_not_binary_xml():
+    with pytest.raises(axml.AXMLError):
+        axml.parse_axml(b"<manifest/>")
@@ -0,0 +1,82 @@
+import pytest
+
+import compact_graph
+
+nx = pytest.importorskip("networkx")
+feature_extractor = pytest.importorskip("feature_extractor")
+
+# Labels the way 'androguard cg' writes them: methods of the app with their access flags and code offset,
+# framework methods without, and characters GML has to escape
+EDGES = [
+    ("Lcom/example/Main;->onCreate(Landroid/os/Bundle;)V [access_flags=public] @ 0x1a0",
+     "Landroid/telephony/TelephonyManager;->getDeviceId()Ljava/lang/String;"),
+    ("Lcom/example/Main;->onCreate(Landroid/os/Bundle;)V [access_flags=public] @ 0x1a0",
+     "Lcom/example/Main;-><init>()V [access_flags=public constructor] @ 0x180"),
+    ("Lcom/example/Sms;->send(Ljava/lang/String;)V [access_flags=public] @ 0x200",
+     "Landroid/telephony/SmsManager;->sendTextMessage(Ljava/lang/String; Ljava/lang/String; Ljava/lang/String; "
+     "Landroid/app/PendingIntent; Landroid/app/PendingIntent;)V"),
+    ("Lcom/example/Sms;->send(Ljava/lang/String;)V [access_flags=public] @ 0x200",
+     "Landroid/telephony/SmsManager;->getDefault()Landroid/telephony/SmsManager;"),
+    ("Lcom/example/Crypto;->seal(\"&\")V @ 0x240",
+     "Ljavax/crypto/Cipher;->doFinal([B)[B"),
+]
+LONELY = "Landroid/location/LocationManager;->getLastKnownLocation(Ljava/lang/String;)Landroid/location/Location;"
+
+
+def edge_set(graph):
+    labels = graph.labels
+    return {(labels[caller], labels[node]) for node in range(len(graph)) for caller in graph.callers_of(node)}
+
+
+@pytest.fixture
+def gml_path(tmp_path):
+    G = nx.DiGraph()
+    G.add_node(LONELY)
+    G.add_edges_from(EDGES)
+    path = str(tmp_path / "app_callgraph.gml")
+    nx.write_gml(G, path)
+    return path
+
+
+def test_read_gml_matches_networkx(gml_path):
+    graph = compact_graph.read_gml(gml_path)
+    reference = nx.read_gml(gml_path, label="label")
+
+    assert sorted(graph.labels) == sorted(reference.nodes())
+    assert edge_set(graph) == set(reference.edges()) == set(EDGES)
+    assert graph.number_of_edges() == len(EDGES)
+
+
+def test_cgb_round_trip(gml_path, tmp_path):
+    graph = compact_graph.read_gml(gml_path)
+    cgb_path = str(tmp_path / "app_callgraph.cgb")
+    compact_graph.write_cgb(graph, cgb_path)
+
+    mapped = compact_graph.read_callgraph(cgb_path)
+
+    assert list(mapped.labels) == list(graph.labels)
+    assert list(mapped.offsets) == list(graph.offsets)
+    assert list(mapped.callers) == list(graph.callers)
+
+
+def test_truncated_cgb(gml_path, tmp_path):
+    cgb_path = tmp_path / "app_callgraph.cgb"
+    compact_graph.write_cgb(compact_graph.read_gml(gml_path), str(cgb_path))
+    cgb_path.write_bytes(cgb_path.read_bytes()[:-3])
+
+    with pytest.raises(ValueError):
+        compact_graph.open_cgb(str(cgb_path))
+
+
+def test_gml_cgb_and_networkx_give_the_same_features(gml_path, tmp_path):
+    cgb_path = str(tmp_path / "app_callgraph.cgb")
+    compact_graph.write_cgb(compact_graph.read_gml(gml_path), cgb_path)
+
+    from_gml = feature_extractor.sensitive_apis_from_callgraph(compact_graph.read_gml(gml_path))
+    from_cgb = feature_extractor.sensitive_apis_from_callgraph(compact_graph.open_cgb(cgb_path))
+    from_networkx = feature_extractor.sensitive_apis_from_callgraph(
+        feature_extractor.full_callgraph(nx.read_gml(gml_path, label="label")))
+
+    assert from_gml == from_cgb == from_networkx
+    assert {key for key, value in from_gml.items() if value} == {"getDeviceId", "sendTextMessage", "getDefault",
+                                                                    "doFinal"}
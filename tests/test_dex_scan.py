@@ -0,0 +1,105 @@
+import importlib
+import sys
+
+import pytest
+
+import dex_scan
+from builders import OP_INVOKE_VIRTUAL, build_apk, build_axml, build_dex, const_string, invoke
+
+TELEPHONY = "Landroid/telephony/TelephonyManager;"
+CIPHER = "Ljavax/crypto/Cipher;"
+
+APP_CLASSES = [
+    ("Lcom/example/Main;", "Ljava/lang/Object;", [
+        ("run", "()V", [invoke(TELEPHONY, "getDeviceId", "()Ljava/lang/String;", OP_INVOKE_VIRTUAL),
+                        const_string("hello")]),
+        ("seal", "([B)V", [invoke(CIPHER, "doFinal", "([B)[B", OP_INVOKE_VIRTUAL)]),
+    ]),
+]
+LIBRARY_CLASSES = [
+    ("Lcom/google/gson/Gson;", "Ljava/lang/Object;", [
+        ("toJson", "(Ljava/lang/Object;)Ljava/lang/String;", [invoke("Lcom/google/gson/Writer;", "write", "()V")]),
+    ]),
+    ("Lcom/google/gson/Writer;", "Ljava/lang/Object;", [("write", "()V", [])]),
+]
+
+
+def test_method_references():
+    data = build_dex(APP_CLASSES)
+
+    assert dex_scan.method_references(data, [TELEPHONY, CIPHER]) == {
+        TELEPHONY + "->getDeviceId", CIPHER + "->doFinal"}
+    assert dex_scan.method_references(data, [TELEPHONY]) == {TELEPHONY + "->getDeviceId"}
+    assert dex_scan.method_references(data, ["Landroid/telephony/SmsManager;"]) == set()
+
+
+def test_method_references_of_defined_methods():
+    data = build_dex(APP_CLASSES)
+
+    assert dex_scan.method_references(data, ["Lcom/example/Main;"]) == {
+        "Lcom/example/Main;->run", "Lcom/example/Main;->seal"}
+
+
+@pytest.mark.parametrize("data", [b"", b"not a dex file" * 10])
+def test_not_a_dex_file(data):
+    with pytest.raises(dex_scan.DexError):
+        dex_scan.method_references(data, [TELEPHONY])
+
+
+def test_truncated_dex_file():
+    data = build_dex(APP_CLASSES)
+    with pytest.raises(dex_scan.DexError):
+        dex_scan.method_references(data[:0x80], [TELEPHONY])
+
+
+def test_package_fingerprints_ignore_the_layout():
+    alone = dex_scan.package_fingerprints(build_dex(LIBRARY_CLASSES), ["Lcom/google/gson/"])
+    bundled = dex_scan.package_fingerprints(build_dex(APP_CLASSES + LIBRARY_CLASSES), ["Lcom/google/gson/"])
+
+    assert alone == bundled
+    assert alone["Lcom/google/gson/"][1] == {"Lcom/google/gson/Gson;", "Lcom/google/gson/Writer;"}
+    assert dex_scan.package_fingerprints(build_dex(APP_CLASSES), ["Lcom/google/gson/"]) == {}
+
+
+def test_dexscan_engine_runs_without_androguard(tmp_path, monkeypatch):
+    manifest = build_axml(("manifest", {"package": "com.example.app"}, [
+        ("uses-permission", {"android:name": "android.permission.INTERNET"}, []),
+    ]))
+    apk = build_apk(tmp_path / "app.apk", manifest, [("classes.dex", build_dex(APP_CLASSES))])
+    monkeypatch.setitem(sys.modules, "androguard", None)
+    monkeypatch.delitem(sys.modules, "feature_extractor", raising=False)
+    feature_extractor = importlib.import_module("feature_extractor")
+
+    permissions, _, sensitive_apis = feature_extractor.analyze_apk_dexscan(str(apk), str(tmp_path), "axml-only")
+
+    assert permissions["INTERNET"] == 1
+    assert {key for key, value in sensitive_apis.items() if value} == {"getDeviceId", "doFinal"}
+
+
+def test_invoking_classes():
+    classes = APP_CLASSES + [
+        ("Lcom/example/Util;", "Ljava/lang/Object;", [("help", "()V", [const_string("hello")])]),
+        ("Lcom/example/Caller;", "Ljava/lang/Object;", [
+            ("call", "()V", [invoke("Lcom/example/Util;", "help", "()V"), invoke(CIPHER, "getInstance", "()V")]),
+        ]),
+    ]
+    data = build_dex(classes)
+
+    assert dex_scan.invoking_classes(data, lambda descriptor: descriptor == TELEPHONY) == {"Lcom/example/Main;"}
+    assert dex_scan.invoking_classes(data, lambda descriptor: descriptor == CIPHER) == {
+        "Lcom/example/Main;", "Lcom/example/Caller;"}
+    assert dex_scan.invoking_classes(data, lambda descriptor: descriptor == "Lcom/example/Util;") == {
+        "Lcom/example/Caller;"}
+    assert dex_scan.invoking_classes(data, lambda descriptor: False) == set()
+
+
+def test_package_fingerprints_hash_the_method_bodies():
+    changed = [LIBRARY_CLASSES[0], ("Lcom/google/gson/Writer;", "Ljava/lang/Object;", [
+        ("write", "()V", [const_string("flush")]),
+    ])]
+
+    original = dex_scan.package_fingerprints(build_dex(LIBRARY_CLASSES), ["Lcom/google/gson/"])
+    patched = dex_scan.package_fingerprints(build_dex(changed), ["Lcom/google/gson/"])
+
+    assert original["Lcom/google/gson/"][1] == patched["Lcom/google/gson/"][1]
+    assert original["Lcom/google/gson/"][0] != patched["Lcom/google/gson/"][0]
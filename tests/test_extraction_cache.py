@@ -0,0 +1,52 @@
+import os
+
+import extraction_cache
+
+SHA256 = "ab" + "0" * 62
+OTHER = "cd" + "1" * 62
+
+
+def test_hit_and_miss(tmp_path):
+    cache = extraction_cache.ExtractionCache(str(tmp_path / "cache"), 1 << 20)
+    fingerprint = extraction_cache.vocabulary_fingerprint(["INTERNET"], ["getDeviceId"])
+
+    assert cache.get(SHA256, fingerprint) is None
+    cache.put(SHA256, fingerprint, {"permissions": [1]})
+
+    assert cache.get(SHA256, fingerprint) == {"permissions": [1]}
+    assert cache.get(OTHER, fingerprint) is None
+    # Entries written with another vocabulary never match
+    assert cache.get(SHA256, extraction_cache.vocabulary_fingerprint(["INTERNET", "CAMERA"], ["getDeviceId"])) is None
+
+
+def test_evict_removes_the_least_recently_used_entries(tmp_path):
+    cache = extraction_cache.ExtractionCache(str(tmp_path / "cache"), 1 << 20)
+    names = [f"{index:02x}" + "0" * 62 for index in range(4)]
+    for age, name in enumerate(names):
+        cache.put(name, "f", {"padding": "x" * 100})
+        os.utime(cache._path(name, "f"), (1000 + age, 1000 + age))
+    # A hit refreshes the oldest entry
+    assert cache.get(names[0], "f") is not None
+    size = os.path.getsize(cache._path(names[0], "f"))
+    cache.max_bytes = 2 * size
+
+    assert cache.evict() == 2
+    assert [name for name in names if cache.get(name, "f") is not None] == [names[0], names[3]]
+    assert cache.evict() == 0
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = extraction_cache.ExtractionCache(str(tmp_path / "cache"), 1 << 20)
+    cache.put(SHA256, "f", {"permissions": [1]})
+    with open(cache._path(SHA256, "f"), "w") as output_file:
+        output_file.write('{"permissions": [')
+
+    assert cache.get(SHA256, "f") is None
+
+
+def test_file_sha256(tmp_path):
+    path = tmp_path / "app.apk"
+    path.write_bytes(b"abc")
+
+    assert extraction_cache.file_sha256(str(path)) == \
+        "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad"
@@ -0,0 +1,62 @@
+import csv
+import subprocess
+
+import pytest
+
+import analysis_budget
+import worker_pool
+from builders import build_apk, build_axml
+
+feature_extractor = pytest.importorskip("feature_extractor")
+
+MANIFEST = ("manifest", {"package": "com.example.app"}, [
+    ("uses-permission", {"android:name": "android.permission.INTERNET"}, []),
+])
+
+
+def read_rows(path):
+    with open(path, "r", encoding="utf-8", newline="") as input_file:
+        return list(csv.reader(input_file))
+
+
+@pytest.mark.parametrize("missing", [False, True])
+def test_sensitive_api_csv_is_aligned(tmp_path, monkeypatch, missing):
+    monkeypatch.chdir(tmp_path)
+    sensitive_apis = None if missing else dict(feature_extractor.sentitive_apis_map, getDeviceId=1)
+
+    feature_extractor.write_sensitive_api_features("app", sensitive_apis)
+
+    header, values = read_rows(tmp_path / "sensitive_apis_data" / "app.csv")
+    row = dict(zip(header, values))
+    assert len(header) == len(values)
+    assert row["name"] == "app"
+    assert row["getDeviceId"] == ("0" if missing else "1")
+    assert row["sensitive_apis_missing"] == str(int(missing))
+
+
+@pytest.mark.parametrize("failure", [analysis_budget.BudgetExceeded("over budget"), worker_pool.WorkerLost("died")])
+def test_dex_part_over_budget_or_lost_degrades_the_apk(tmp_path, failure):
+    apk = str(build_apk(tmp_path / "app.apk", build_axml(MANIFEST)))
+    job = {"filepath": apk, "filename": "app.apk", "manifest": None, "dex_parts": {}, "dex_hashes": None,
+           "dex_features": None, "features": None, "degraded": None, "error": None, "workdir": None}
+
+    job = feature_extractor.merge_dex_jobs(job, {"classes.dex": {}, "classes2.dex": failure})
+
+    assert job["error"] is None
+    assert job["degraded"] == str(failure)
+    permissions, _, sensitive_apis = job["features"]
+    assert permissions["INTERNET"] == 1 and sensitive_apis is None
+
+
+def test_apktool_decode_is_killed_after_the_timeout(tmp_path, monkeypatch):
+    apk = str(build_apk(tmp_path / "app.apk", build_axml(MANIFEST)))
+    timeouts = []
+
+    def run(command, timeout=None, **kwargs):
+        timeouts.append(timeout)
+        raise subprocess.TimeoutExpired(command, timeout)
+
+    monkeypatch.setattr(feature_extractor.subprocess, "run", run)
+    with pytest.raises(OSError):
+        feature_extractor.decode_manifest(apk, str(tmp_path), "apktool", timeout=5)
+    assert timeouts == [5]
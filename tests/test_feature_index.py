@@ -0,0 +1,87 @@
+import feature_index
+
+SAMPLES = {
+    "a": {"permissions:INTERNET", "permissions:READ_SMS", "sensitive_apis:getDeviceId", "intents:BOOT=11"},
+    "b": {"permissions:INTERNET", "permissions:READ_SMS", "sensitive_apis:getDeviceId", "intents:BOOT=12"},
+    "c": {"permissions:CAMERA", "sensitive_apis:open"},
+}
+
+
+def test_add_query_and_reload(tmp_path):
+    index = feature_index.FeatureIndex(str(tmp_path / "index"), num_perm=32, bands=8)
+
+    assert index.add(SAMPLES, "malicious") == 3
+    assert index.add(SAMPLES, "malicious") == 0
+    similarity, name, label = index.query(SAMPLES["a"], k=1)[0]
+    assert (similarity, name, label) == (1.0, "a", "malicious")
+
+    reloaded = feature_index.FeatureIndex(str(tmp_path / "index"))
+    assert len(reloaded) == 3 and reloaded.num_perm == 32
+    assert reloaded.query(SAMPLES["b"]) == index.query(SAMPLES["b"])
+    assert reloaded.add({"d": {"permissions:CAMERA", "sensitive_apis:open", "permissions:NFC"}}, "benign") == 1
+    assert "d" in feature_index.FeatureIndex(str(tmp_path / "index"))
+    assert reloaded.verdict(SAMPLES["c"]) == "malicious"
+
+
+def test_samples_without_features_are_skipped(tmp_path):
+    index = feature_index.FeatureIndex(str(tmp_path / "index"))
+
+    assert index.add({"empty": set(), "a": SAMPLES["a"]}, "benign") == 1
+    assert "empty" not in index
+    assert index.query(set()) == []
+    assert index.verdict(set()) is None
+
+
+def write(path, lines):
+    path.write_text("\n".join(lines), encoding="utf-8")
+
+
+def test_merged_table_matches_the_per_apk_csvs(tmp_path):
+    # Written with and without a value for the name column
+    directory = tmp_path / "out" / "sensitive_apis_data"
+    directory.mkdir(parents=True)
+    write(directory / "old.csv", ["name,getDeviceId,open,send", "1,0,1"])
+    write(directory / "new.csv", ["name,getDeviceId,open,send,sensitive_apis_missing", "new,1,1,0,0"])
+    # The same CSVs as pandas merges them, the rows without a name value shifted by one
+    merged = tmp_path / "sensitive_apis_merged_benign.csv"
+    write(merged, [",name,getDeviceId,open,send,sensitive_apis_missing,filename",
+                   "0,1,0,1,,,old.csv",
+                   "1,new,1,1,0,0,new.csv"])
+
+    per_apk = feature_index.read_feature_dirs(str(tmp_path / "out"))
+
+    assert per_apk == feature_index.read_merged_table(str(merged))
+    assert per_apk["old"] == {"sensitive_apis:getDeviceId", "sensitive_apis:send"}
+    assert per_apk["new"] == {"sensitive_apis:getDeviceId", "sensitive_apis:open"}
+
+
+def test_torn_tail_is_only_repaired_on_add(tmp_path):
+    directory = tmp_path / "index"
+    feature_index.FeatureIndex(str(directory)).add(SAMPLES, "malicious")
+    samples, signatures = directory / "samples.jsonl", directory / "signatures.bin"
+    complete = samples.read_bytes(), signatures.read_bytes()
+    with open(samples, "ab") as output_file:
+        output_file.write(b'{"name": "d", "lab')
+    with open(signatures, "ab") as output_file:
+        output_file.write(b"\0" * 10)
+    torn = samples.read_bytes(), signatures.read_bytes()
+
+    index = feature_index.FeatureIndex(str(directory))
+    assert len(index) == 3
+    assert index.query(SAMPLES["a"], k=1)[0][1] == "a"
+    assert (samples.read_bytes(), signatures.read_bytes()) == torn
+
+    assert index.add({"d": {"permissions:NFC"}}, "benign") == 1
+    assert samples.read_bytes().startswith(complete[0]) and signatures.read_bytes().startswith(complete[1])
+    reloaded = feature_index.FeatureIndex(str(directory))
+    assert len(reloaded) == 4 and reloaded.query({"permissions:NFC"}, k=1)[0][1:] == ("d", "benign")
+
+
+def test_verdict_skips_unlabeled_matches(tmp_path):
+    index = feature_index.FeatureIndex(str(tmp_path / "index"))
+    index.add({"a": SAMPLES["a"]})
+    index.add({"b": SAMPLES["b"]}, "malicious")
+
+    assert index.query(SAMPLES["a"], k=1)[0][1:] == ("a", None)
+    assert index.verdict(SAMPLES["a"], threshold=0.5) == "malicious"
+    assert index.verdict(SAMPLES["a"], threshold=1.0) is None
@@ -0,0 +1,124 @@
+import argparse
+import csv
+import os
+import shutil
+
+import pytest
+
+import builders
+from builders import build_apk, build_axml
+
+feature_extractor = pytest.importorskip("feature_extractor")
+
+FEATURE_DIRS = ("intents_data", "permissions_data", "sensitive_apis_data")
+
+
+def manifest(*permissions):
+    return build_axml(("manifest", {"package": "com.example.app"}, [
+        ("uses-permission", {"android:name": f"android.permission.{permission}"}, []) for permission in permissions]))
+
+
+def read_rows(directory):
+    rows = {}
+    for filename in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, filename), "r", encoding="utf-8", newline="") as input_file:
+            rows[filename] = list(csv.reader(input_file))
+    return rows
+
+
+def run(output_dir, directory, monkeypatch, **overrides):
+    output_dir.mkdir(exist_ok=True)
+    monkeypatch.chdir(output_dir)
+    options = builders.pipeline_options(output_dir, engine="manifest", manifest_decoder="axml-only", **overrides)
+    feature_extractor.run_pipeline(str(directory), options)
+    return {feature_dir: read_rows(output_dir / feature_dir) for feature_dir in FEATURE_DIRS
+            if os.path.isdir(output_dir / feature_dir)}
+
+
+@pytest.fixture
+def apks(tmp_path):
+    directory = tmp_path / "apks"
+    directory.mkdir()
+    build_apk(directory / "small.apk", manifest("INTERNET"))
+    build_apk(directory / "big.apk", manifest("CAMERA"), [("assets/blob", os.urandom(4096))])
+    for index in range(6):
+        build_apk(directory / f"app{index}.apk", manifest("INTERNET", f"PERMISSION_{index}"))
+    (directory / "notes.txt").write_text("not an apk")
+    return directory
+
+
+def test_non_zip_files_are_never_hashed(tmp_path, apks, monkeypatch):
+    hashed = []
+    file_sha256 = feature_extractor.extraction_cache.file_sha256
+
+    def recording_file_sha256(filepath):
+        hashed.append(os.path.basename(filepath))
+        return file_sha256(filepath)
+
+    monkeypatch.setattr(feature_extractor.extraction_cache, "file_sha256", recording_file_sha256)
+    rows = run(tmp_path / "out", apks, monkeypatch, shard=(0, 1))["permissions_data"]
+
+    assert "notes.txt" not in hashed
+    assert sorted(hashed) == sorted(name for name in os.listdir(apks) if name.endswith(".apk"))
+    assert sorted(rows) == sorted(name[:-len(".apk")] + ".csv" for name in hashed)
+
+
+def test_longest_job_first():
+    directory = os.path.dirname(__file__)
+    filepaths = [os.path.join(directory, name) for name in ("conftest.py", "builders.py")]
+
+    assert feature_extractor.schedule_apks(filepaths) == filepaths[::-1]
+
+
+@pytest.mark.parametrize("value, shard", [("0/1", (0, 1)), ("2/3", (2, 3))])
+def test_parse_shard(value, shard):
+    assert feature_extractor.parse_shard(value) == shard
+
+
+@pytest.mark.parametrize("value", ["1", "a/2", "2/2", "-1/2", "0/0"])
+def test_parse_shard_rejects(value):
+    with pytest.raises(argparse.ArgumentTypeError):
+        feature_extractor.parse_shard(value)
+
+
+def test_shards_cover_every_apk_once(apks):
+    filepaths = sorted(str(apks / name) for name in os.listdir(apks) if name.endswith(".apk"))
+    hashes = {filepath: feature_extractor.extraction_cache.file_sha256(filepath) for filepath in filepaths}
+    selected = []
+    for index in range(3):
+        shard, shard_hashes = feature_extractor.select_shard(filepaths, (index, 3))
+        assert all(feature_extractor.shard_of(hashes[filepath], 3) == index for filepath in shard)
+        assert shard_hashes == {filepath: hashes[filepath] for filepath in shard}
+        selected += shard
+
+    assert sorted(selected) == filepaths
+
+
+def test_sharded_runs_reproduce_the_unsharded_run(tmp_path, apks, monkeypatch):
+    unsharded = run(tmp_path / "all", apks, monkeypatch)
+    shard_dirs = [tmp_path / f"shard{index}" for index in range(3)]
+    sharded = {feature_dir: {} for feature_dir in unsharded}
+    for index, shard_dir in enumerate(shard_dirs):
+        for feature_dir, rows in run(shard_dir, apks, monkeypatch, shard=(index, 3)).items():
+            assert not set(rows) & set(sharded[feature_dir])
+            sharded[feature_dir].update(rows)
+
+    assert sharded == unsharded
+
+    pytest.importorskip("pandas")
+    import merge_shards
+    for feature_dir in unsharded:
+        merge_shards.merge_feature_dir([str(shard_dir) for shard_dir in shard_dirs], feature_dir,
+                                       str(tmp_path / "sharded.csv"))
+        merge_shards.merge_feature_dir([str(tmp_path / "all")], feature_dir, str(tmp_path / "unsharded.csv"))
+        assert (tmp_path / "sharded.csv").read_bytes() == (tmp_path / "unsharded.csv").read_bytes()
+
+
+def test_alias_gets_identical_rows(tmp_path, apks, monkeypatch, capsys):
+    shutil.copyfile(apks / "app0.apk", apks / "copy.apk")
+    deduplicated = run(tmp_path / "dedup", apks, monkeypatch, cache=None)
+
+    assert "Deduplicated 1 APKs" in capsys.readouterr().out
+    for rows in deduplicated.values():
+        assert rows["copy.csv"] == rows["app0.csv"]
+    assert deduplicated == run(tmp_path / "no_dedup", apks, monkeypatch, cache=None, dedup=False)
@@ -0,0 +1,63 @@
+import pytest
+
+import progress_journal
+
+STAGES = ["manifest", "sensitive_apis"]
+
+
+def test_resume_skips_the_finished_apks(tmp_path):
+    path = str(tmp_path / "journal.log")
+    with progress_journal.ProgressJournal(path) as journal:
+        journal.record("manifest", "done.apk")
+        journal.record("sensitive_apis", "done.apk")
+        journal.record("manifest", "half.apk")
+
+    with progress_journal.ProgressJournal(path, resume=True) as journal:
+        assert journal.outstanding(STAGES, "done.apk") == []
+        assert journal.outstanding(STAGES, "half.apk") == ["sensitive_apis"]
+        assert journal.outstanding(STAGES, "new.apk") == STAGES
+        journal.record("sensitive_apis", "half.apk")
+
+    with progress_journal.ProgressJournal(path, resume=True) as journal:
+        assert journal.outstanding(STAGES, "half.apk") == []
+
+
+def test_without_resume_a_new_journal_starts(tmp_path):
+    path = str(tmp_path / "journal.log")
+    with progress_journal.ProgressJournal(path) as journal:
+        journal.record("manifest", "done.apk")
+
+    with progress_journal.ProgressJournal(path) as journal:
+        assert journal.outstanding(["manifest"], "done.apk") == ["manifest"]
+    with progress_journal.ProgressJournal(path, resume=True) as journal:
+        assert journal.outstanding(["manifest"], "done.apk") == ["manifest"]
+
+
+def test_a_torn_last_record_is_not_finished(tmp_path):
+    path = tmp_path / "journal.log"
+    path.write_text("manifest\tdone.apk\nmanifest\tto", encoding="utf-8")
+
+    with progress_journal.ProgressJournal(str(path), resume=True) as journal:
+        assert journal.is_done("manifest", "done.apk")
+        assert not journal.is_done("manifest", "to")
+        journal.record("manifest", "torn.apk")
+
+    with progress_journal.ProgressJournal(str(path), resume=True) as journal:
+        assert journal.is_done("manifest", "torn.apk")
+    assert path.read_text(encoding="utf-8") == "manifest\tdone.apk\nmanifest\ttorn.apk\n"
+
+
+def test_atomic_output_keeps_the_old_file_on_error(tmp_path):
+    path = tmp_path / "app.csv"
+    path.write_text("old")
+
+    with pytest.raises(RuntimeError):
+        with progress_journal.atomic_output(str(path)) as output_file:
+            output_file.write("new")
+            raise RuntimeError("crash")
+
+    assert path.read_text() == "old"
+    assert [entry.name for entry in tmp_path.iterdir()] == ["app.csv"]
+    with progress_journal.atomic_output(str(path)) as output_file:
+        output_file.write("new")
+    assert path.read_text() == "new"
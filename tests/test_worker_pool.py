@@ -0,0 +1,46 @@
+import os
+import threading
+import time
+
+import worker_pool
+
+
+def run_tasks(pool, tasks):
+    results = []
+    done = threading.Semaphore(0)
+
+    def finished(value):
+        results.append(value)
+        done.release()
+
+    for func, args in tasks:
+        pool.apply_async(func, args, callback=finished, error_callback=finished)
+    for _ in tasks:
+        done.acquire()
+    return results
+
+
+def test_workers_are_recycled_after_max_tasks():
+    with worker_pool.RecyclingPool(1, max_tasks=2) as pool:
+        pids = run_tasks(pool, [(os.getpid, ())] * 4)
+
+    assert pool.recycled == 2
+    assert len(set(pids)) == 2 and os.getpid() not in pids
+
+
+def test_lost_worker_fails_its_task_only():
+    with worker_pool.RecyclingPool(1) as pool:
+        lost, = run_tasks(pool, [(os._exit, (3,))])
+        result, = run_tasks(pool, [(abs, (-1,))])
+
+    assert isinstance(lost, worker_pool.WorkerLost)
+    assert result == 1
+
+
+def test_overrunning_worker_is_terminated():
+    with worker_pool.RecyclingPool(1, task_timeout=0.5) as pool:
+        stuck, = run_tasks(pool, [(time.sleep, (30,))])
+        result, = run_tasks(pool, [(abs, (-2,))])
+
+    assert isinstance(stuck, worker_pool.WorkerLost)
+    assert result == 2
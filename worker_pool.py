@@ -0,0 +1,187 @@
+"""Process pool that recycles its workers after a number of tasks or past a memory threshold."""
+
+import multiprocessing
+import os
+import queue
+import threading
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+class WorkerLost(Exception):
+    """Passed to the error callback of a task whose worker process died."""
+
+
+def current_rss():
+    """
+    Returns the resident set size of the calling process in bytes, or its
+    peak where the current one is not available, 0 if neither is.
+    """
+    try:
+        with open("/proc/self/statm", "r") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is None:
+        return 0
+    # Kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+def _worker_main(connection, initializer, initargs):
+    if initializer is not None:
+        initializer(*initargs)
+    while True:
+        try:
+            task = connection.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        func, args = task
+        try:
+            result = (True, func(*args))
+        except Exception as e:
+            result = (False, e)
+        try:
+            connection.send((result, current_rss()))
+        except Exception as e:
+            # The result or the exception could not be pickled
+            connection.send(((False, RuntimeError(f"Could not send the result of {func.__name__}: {e}")),
+                             current_rss()))
+
+
+class RecyclingPool:
+    """
+    Process pool with the apply_async interface of multiprocessing.Pool whose
+    workers are replaced by fresh processes after max_tasks tasks, or as soon
+    as a task leaves them with more than max_rss bytes resident. Long-lived
+    analysis processes only grow, a fresh one starts from the parent's heap.
+
+    A worker that dies during a task, e.g. killed for running out of memory,
+    fails that task with WorkerLost and is replaced, instead of hanging the
+    pool. So does a worker still busy with a task after task_timeout seconds,
+    which is terminated: a budget enforced inside the worker cannot interrupt
+    it while it is stuck in C code or a blocking system call. Like
+    multiprocessing.Pool, all callbacks run on one thread.
+
+    Workers are started from the slot threads, and forking a threaded process
+    can copy a lock another thread holds, so they come from a forkserver, or
+    are spawned where there is none. Tasks and initializers must be picklable.
+    """
+
+    def __init__(self, processes, initializer=None, initargs=(), max_tasks=None, max_rss=None, task_timeout=None):
+        self.initializer = initializer
+        self.initargs = initargs
+        self.max_tasks = max_tasks
+        self.max_rss = max_rss
+        self.task_timeout = task_timeout
+        self.recycled = 0
+        self._context = multiprocessing.get_context(
+            "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+        self._tasks = queue.Queue()
+        self._results = queue.Queue()
+        self._lock = threading.Lock()
+        self._slots = [threading.Thread(target=self._run_slot, daemon=True) for _ in range(max(1, processes))]
+        self._callbacks = threading.Thread(target=self._run_callbacks, daemon=True)
+        for thread in self._slots + [self._callbacks]:
+            thread.start()
+
+    def apply_async(self, func, args=(), callback=None, error_callback=None):
+        self._tasks.put((func, args, callback, error_callback))
+
+    def _start_worker(self):
+        connection, child_connection = self._context.Pipe()
+        process = self._context.Process(target=_worker_main, args=(child_connection, self.initializer, self.initargs),
+                                        daemon=True)
+        process.start()
+        child_connection.close()
+        return process, connection
+
+    @staticmethod
+    def _stop_worker(process, connection):
+        try:
+            connection.send(None)
+        except OSError:
+            pass
+        process.join(5)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+        connection.close()
+
+    def _run_slot(self):
+        """Runs the tasks of one worker process and replaces it when due."""
+        process = connection = None
+        tasks = 0
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                break
+            func, args, callback, error_callback = task
+            if process is None:
+                process, connection = self._start_worker()
+                tasks = 0
+            try:
+                connection.send((func, args))
+            except Exception as e:
+                self._results.put((error_callback, e))
+                continue
+            if self.task_timeout and not connection.poll(self.task_timeout):
+                process.terminate()
+                process.join()
+                connection.close()
+                self._results.put((error_callback, WorkerLost(f"worker still busy after {self.task_timeout}s, "
+                                                              f"terminated")))
+                process = None
+                continue
+            try:
+                (success, value), rss = connection.recv()
+            except (EOFError, OSError):
+                process.join()
+                connection.close()
+                self._results.put((error_callback, WorkerLost(f"worker exited with code {process.exitcode}")))
+                process = None
+                continue
+
+            self._results.put((callback if success else error_callback, value))
+            tasks += 1
+            if (self.max_tasks and tasks >= self.max_tasks) or (self.max_rss and rss >= self.max_rss):
+                self._stop_worker(process, connection)
+                process = None
+                with self._lock:
+                    self.recycled += 1
+        if process is not None:
+            self._stop_worker(process, connection)
+
+    def _run_callbacks(self):
+        while True:
+            item = self._results.get()
+            if item is None:
+                return
+            function, value = item
+            if function is None:
+                continue
+            try:
+                function(value)
+            except Exception as e:
+                print(f"Error in pool callback: {e}")
+
+    def close(self):
+        """Waits for the queued tasks and their callbacks, then stops the workers."""
+        for _ in self._slots:
+            self._tasks.put(None)
+        for thread in self._slots:
+            thread.join()
+        self._results.put(None)
+        self._callbacks.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()